@@ -78,7 +78,11 @@ CREATE INDEX IF NOT EXISTS idx_clarification_pending
 def ensure_clarification_table():
     """Ensure the clarification_queue table exists."""
     with get_db() as conn:
-        conn.executescript(CLARIFICATION_SCHEMA)
+        # One statement at a time: executescript() would COMMIT the caller's
+        # enclosing get_db() transaction
+        for statement in CLARIFICATION_SCHEMA.split(";"):
+            if statement.strip():
+                conn.execute(statement)
 
 
 class ClarificationQueue:
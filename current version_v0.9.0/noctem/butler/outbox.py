@@ -0,0 +1,196 @@
+"""
+Outbound message queue for butler/briefing Telegram sends.
+
+Scheduled jobs enqueue messages instead of calling bot.send_message directly.
+A single flusher task waits a short debounce window, merges messages for the
+same (chat_id, parse_mode) into as few sends as fit under Telegram's 4096-char
+limit, and paces sends to stay under the ~30 messages/second bot limit.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_LENGTH = 4096  # Telegram hard limit per message
+SEPARATOR = "\n\n---\n\n"
+DEBOUNCE_SECONDS = 0.2
+MAX_BATCH = 20
+MESSAGES_PER_SECOND = 30
+
+
+@dataclass
+class OutboundMessage:
+    """A queued message plus an optional callback run after a successful send."""
+    chat_id: str
+    text: str
+    parse_mode: Optional[str] = None
+    kind: str = ""  # 'briefing', 'update', 'clarification'
+    on_sent: Optional[Callable[[], None]] = None
+
+
+class RateLimiter:
+    """Simple token bucket: at most `rate` acquisitions per `period` seconds."""
+
+    def __init__(self, rate: int = MESSAGES_PER_SECOND, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.rate, self._tokens + (now - self._updated) * self.rate / self.period
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+
+def coalesce(messages: list[OutboundMessage]) -> list[list[OutboundMessage]]:
+    """
+    Group messages by (chat_id, parse_mode) and pack each group into chunks
+    whose joined text fits in a single Telegram message.
+
+    Order is preserved within a group. A message that is too long on its own
+    is still sent alone (Telegram will reject it, as it did before batching).
+    """
+    groups: dict[tuple, list[list[OutboundMessage]]] = {}
+    for msg in messages:
+        chunks = groups.setdefault((msg.chat_id, msg.parse_mode), [])
+        if chunks:
+            current = chunks[-1]
+            length = sum(len(m.text) for m in current) + len(SEPARATOR) * (len(current) - 1)
+            if length + len(SEPARATOR) + len(msg.text) <= MAX_MESSAGE_LENGTH:
+                current.append(msg)
+                continue
+        chunks.append([msg])
+    return [chunk for chunks in groups.values() for chunk in chunks]
+
+
+class Outbox:
+    """Queue + background flusher for outbound Telegram messages."""
+
+    def __init__(
+        self,
+        send: Callable[..., Awaitable],
+        debounce: float = DEBOUNCE_SECONDS,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Args:
+            send: Coroutine function called as send(chat_id=, text=, parse_mode=)
+            debounce: Seconds to wait for more messages before flushing
+            limiter: Rate limiter shared by all sends
+        """
+        self._send = send
+        self._debounce = debounce
+        self._limiter = limiter or RateLimiter()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the flusher task on the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(
+        self,
+        chat_id: str,
+        text: str,
+        parse_mode: Optional[str] = None,
+        kind: str = "",
+        on_sent: Optional[Callable[[], None]] = None,
+    ):
+        """Queue a message for sending. Starts the flusher on first use."""
+        self.start()
+        await self._queue.put(OutboundMessage(chat_id, text, parse_mode, kind, on_sent))
+
+    async def stop(self):
+        """Send anything still queued, then stop the flusher."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        pending = self._drain()
+        if pending:
+            await self._flush(pending)
+
+    def _drain(self, limit: Optional[int] = None) -> list[OutboundMessage]:
+        items = []
+        while not self._queue.empty() and (limit is None or len(items) < limit):
+            items.append(self._queue.get_nowait())
+        return items
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            try:
+                await asyncio.sleep(self._debounce)
+            except asyncio.CancelledError:
+                # Stopping mid-debounce: don't drop what we already dequeued
+                await self._flush([first] + self._drain())
+                raise
+            await self._flush([first] + self._drain(MAX_BATCH - 1))
+
+    async def _flush(self, batch: list[OutboundMessage]):
+        chunks = coalesce(batch)
+        done = 0
+        try:
+            for chunk in chunks:
+                await self._limiter.acquire()
+                # Shield the send and its bookkeeping so a shutdown mid-request
+                # can't leave a message sent but its contact unrecorded; if we
+                # are cancelled, wait for it to finish first.
+                delivery = asyncio.ensure_future(self._deliver(chunk))
+                try:
+                    await asyncio.shield(delivery)
+                except asyncio.CancelledError:
+                    await asyncio.wait({delivery})
+                    done += 1
+                    raise
+                done += 1
+        finally:
+            unsent = [msg for chunk in chunks[done:] for msg in chunk]
+            if unsent:
+                # Cancelled before these went out: put them back ahead of
+                # anything queued since, for stop() or the next flush
+                for msg in unsent + self._drain():
+                    self._queue.put_nowait(msg)
+
+    async def _deliver(self, chunk: list[OutboundMessage]):
+        """Send one coalesced chunk, then run its messages' callbacks."""
+        head = chunk[0]
+        kinds = ", ".join(m.kind or "message" for m in chunk)
+        try:
+            await self._send(
+                chat_id=head.chat_id,
+                text=SEPARATOR.join(m.text for m in chunk),
+                parse_mode=head.parse_mode,
+            )
+        except asyncio.CancelledError:
+            logger.error(f"Send of {kinds} was cancelled")
+            return
+        except Exception as e:
+            logger.error(f"Failed to send {kinds}: {e}")
+            return
+        for msg in chunk:
+            if msg.on_sent:
+                try:
+                    # Callbacks hit the DB (record_contact); keep them off the loop
+                    await asyncio.to_thread(msg.on_sent)
+                except Exception as e:
+                    logger.error(f"Post-send callback failed for {msg.kind}: {e}")
+        logger.info(f"Sent {len(chunk)} queued message(s) to {head.chat_id}")
@@ -13,6 +13,7 @@ import logging
 
 from ..db import get_db
 from ..config import Config
+from .clarifications import ensure_clarification_table
 
 logger = logging.getLogger(__name__)
 
@@ -93,15 +94,61 @@ class ButlerProtocol:
             return False
         
         # Check type-specific limits
-        if contact_type == "update":
-            updates_sent = ButlerProtocol.get_contacts_by_type("update")
-            return updates_sent < 3
-        elif contact_type == "clarification":
-            clarifications_sent = ButlerProtocol.get_contacts_by_type("clarification")
-            return clarifications_sent < 2
+        type_limit = ButlerProtocol.TYPE_LIMITS.get(contact_type)
+        if type_limit is not None:
+            return ButlerProtocol.get_contacts_by_type(contact_type) < type_limit
         
         return True
     
+    # Per-type weekly limits (the overall cap is butler_contacts_per_week)
+    TYPE_LIMITS = {"update": 3, "clarification": 2}
+    
+    @staticmethod
+    def gate(contact_type: str) -> Optional[str]:
+        """
+        Decide whether a scheduled contact should go out, in a single query.
+        
+        Combines the chat ID check, the weekly budget (total and per type) and,
+        for clarifications, whether any questions are pending.
+        
+        Returns:
+            The Telegram chat ID to send to, or None if the contact should be skipped
+        """
+        chat_id = Config.telegram_chat_id()  # served from Config's cache
+        if not chat_id:
+            logger.warning("Telegram chat ID not configured")
+            return None
+        
+        week, year = ButlerProtocol.get_current_week()
+        wants_pending = contact_type == "clarification"
+        if wants_pending:
+            ensure_clarification_table()
+        pending_sql = (
+            "(SELECT COUNT(*) FROM clarification_queue WHERE answered_at IS NULL)"
+            if wants_pending else "NULL"
+        )
+        
+        with get_db() as conn:
+            total, of_type, pending = conn.execute(f"""
+                SELECT COUNT(*),
+                       COALESCE(SUM(contact_type = ?), 0),
+                       {pending_sql}
+                FROM butler_contacts
+                WHERE week_number = ? AND year = ?
+            """, (contact_type, week, year)).fetchone()
+        
+        if wants_pending and not pending:
+            logger.info("No pending clarification questions")
+            return None
+        
+        max_contacts = Config.get("butler_contacts_per_week", 5)
+        type_limit = ButlerProtocol.TYPE_LIMITS.get(contact_type)
+        if total >= max_contacts or (type_limit is not None and of_type >= type_limit):
+            logger.info(f"Butler {contact_type} budget exhausted for this week")
+            return None
+        
+        return chat_id
+    
     @staticmethod
     def record_contact(contact_type: str, message: str) -> Optional[int]:
         """
@@ -157,7 +204,7 @@ class ButlerProtocol:
         update_days = Config.get("butler_update_days", ["monday", "wednesday", "friday"])
         update_time = Config.get("butler_update_time", "09:00")
         clarification_days = Config.get("butler_clarification_days", ["tuesday", "thursday"])
-        clarification_time = Config.get("butler_clarification_time", "09:00")
+        clarification_time = Config.get("butler_clarification_time", "09:15")
         
         today = datetime.now()
         today_name = today.strftime("%A").lower()
@@ -22,7 +22,7 @@ DEFAULTS = {
     "butler_update_days": ["monday", "wednesday", "friday"],
     "butler_update_time": "09:00",
     "butler_clarification_days": ["tuesday", "thursday"],
-    "butler_clarification_time": "09:00",
+    "butler_clarification_time": "09:15",  # staggered from updates
     
     # v0.6.0: Slow mode
     "slow_mode_enabled": True,
@@ -36,6 +36,9 @@ DEFAULTS = {
     "maintenance_model_benchmark_on_boot": False,  # Set True to benchmark models on startup
     "maintenance_report_threshold": 3,  # Min insights to generate report
     "summon_timeout_seconds": 30,
+    
+    # Write action_log rows inline instead of via the batched background writer
+    "action_log_sync": False,
 }
 
 
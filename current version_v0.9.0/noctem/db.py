@@ -9,8 +9,10 @@ This lets you keep runtime/personal data outside of git (e.g. in /personal-data/
 """
 import os
 import sqlite3
+import threading
 from pathlib import Path
 from contextlib import contextmanager
+from typing import Iterator, Optional
 
 
 def _resolve_data_dir() -> Path:
@@ -142,6 +144,14 @@ CREATE TABLE IF NOT EXISTS slow_work_queue (
     error_message TEXT
 );
 
+-- v0.9.x: Task suggestions by exact LLM input (hash of the rendered prompts),
+-- so re-analyzing an unchanged task skips the LLM
+CREATE TABLE IF NOT EXISTS task_suggestion_cache (
+    key TEXT PRIMARY KEY,
+    suggestion TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- v0.6.0: Voice journals (audio memos with transcription)
 CREATE TABLE IF NOT EXISTS voice_journals (
     id INTEGER PRIMARY KEY,
@@ -195,6 +205,15 @@ CREATE TABLE IF NOT EXISTS prompt_versions (
     created_by TEXT DEFAULT 'system'  -- 'system', 'user'
 );
 
+DROP INDEX IF EXISTS idx_prompt_templates_name_version;  -- get_prompt searches the UNIQUE(name) autoindex
+
+-- Deleting a template takes its versions with it. A trigger rather than
+-- ON DELETE CASCADE so existing databases get it without a table rebuild.
+CREATE TRIGGER IF NOT EXISTS prompt_templates_delete_versions
+BEFORE DELETE ON prompt_templates BEGIN
+    DELETE FROM prompt_versions WHERE template_id = old.id;
+END;
+
 -- v0.6.0 Polish: Universal thought capture (royal scribe pattern)
 CREATE TABLE IF NOT EXISTS thoughts (
     id INTEGER PRIMARY KEY,
@@ -229,7 +248,6 @@ CREATE INDEX IF NOT EXISTS idx_thoughts_kind ON thoughts(kind, status);
 CREATE INDEX IF NOT EXISTS idx_conversations_session ON conversations(session_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_conversations_source ON conversations(source, created_at);
 CREATE INDEX IF NOT EXISTS idx_conversations_level ON conversations(thinking_level, created_at);
-CREATE INDEX IF NOT EXISTS idx_prompt_versions_template ON prompt_versions(template_id, version);
 
 -- v0.6.1: Execution logging (full pipeline traces)
 CREATE TABLE IF NOT EXISTS execution_logs (
@@ -286,7 +304,10 @@ CREATE TABLE IF NOT EXISTS maintenance_insights (
 CREATE INDEX IF NOT EXISTS idx_execution_logs_trace ON execution_logs(trace_id);
 CREATE INDEX IF NOT EXISTS idx_execution_logs_timestamp ON execution_logs(timestamp);
 CREATE INDEX IF NOT EXISTS idx_execution_logs_component ON execution_logs(component, stage);
-CREATE INDEX IF NOT EXISTS idx_maintenance_insights_status ON maintenance_insights(status, priority);
+CREATE INDEX IF NOT EXISTS idx_insights_status_prio_created ON maintenance_insights(status, priority DESC, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_insights_source_created ON maintenance_insights(source, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_insights_prio_created ON maintenance_insights(priority DESC, created_at DESC);
+DROP INDEX IF EXISTS idx_maintenance_insights_status;  -- superseded by idx_insights_status_prio_created
 
 -- v0.7.0: Pattern detection (self-improvement engine)
 CREATE TABLE IF NOT EXISTS detected_patterns (
@@ -302,6 +323,11 @@ CREATE TABLE IF NOT EXISTS detected_patterns (
     UNIQUE(pattern_type, pattern_key)
 );
 
+-- Kept as a rowid table rather than WITHOUT ROWID keyed on (pattern_type,
+-- pattern_key): the UNIQUE autoindex already holds id (the rowid), so natural-key
+-- lookups are index-only, while id stays auto-assigned for learned_rules and
+-- the by-id status updates.
+
 -- v0.7.0: Learned rules (classifier improvements from patterns)
 CREATE TABLE IF NOT EXISTS learned_rules (
     id INTEGER PRIMARY KEY,
@@ -352,7 +378,6 @@ CREATE TABLE IF NOT EXISTS experiment_results (
 );
 
 -- v0.7.0 indexes
-CREATE INDEX IF NOT EXISTS idx_patterns_status ON detected_patterns(status, occurrence_count DESC);
 CREATE INDEX IF NOT EXISTS idx_patterns_type ON detected_patterns(pattern_type, status);
 CREATE INDEX IF NOT EXISTS idx_learned_rules_type ON learned_rules(rule_type, enabled);
 CREATE INDEX IF NOT EXISTS idx_learned_rules_priority ON learned_rules(priority DESC, enabled);
@@ -450,31 +475,260 @@ CREATE INDEX IF NOT EXISTS idx_chunks_chunk_id ON knowledge_chunks(chunk_id);
 """
 
 
-def get_connection() -> sqlite3.Connection:
-    """Get a database connection with row factory enabled."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+# Applied to every new connection. WAL lets the web server, bot and slow-mode
+# threads read while another thread writes; the rest trade a little durability
+# on power loss (never corruption) for much cheaper commits and scans.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -20000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Per-connection prepared-statement cache. Services keep their SQL in fixed
+# strings, so with pooled connections most executes skip re-preparing.
+STATEMENT_CACHE_SIZE = 256
+
+# INSERT/UPDATE ... RETURNING needs SQLite 3.35+; older builds fall back to a re-select.
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# One pooled read-write connection per thread (sqlite3 connections are
+# thread-bound), plus optional read-only ones for read_db() and iter_rows(). Bumping
+# _pool_generation makes every thread reopen on its next get_db()/read_db().
+_local = threading.local()
+_pool_generation = 0
+
+
+class _Connection(sqlite3.Connection):
+    """Connection that refuses executescript() inside a nested get_db() block."""
+
+    def executescript(self, script):
+        # executescript() COMMITs first: that would end the outer block's
+        # transaction early and leave the nested blocks' savepoints dangling
+        entry = getattr(_local, "entry", None)
+        if getattr(_local, "depth", 0) > 1 and entry is not None and entry[0] is self:
+            raise sqlite3.ProgrammingError(
+                "executescript() inside a nested get_db() block; use execute() per statement"
+            )
+        return super().executescript(script)
+
+
+def _open_connection(path: Path, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        # mode=ro never creates the file; the caller falls back to the writer
+        conn = sqlite3.connect(
+            f"{path.resolve().as_uri()}?mode=ro", uri=True,
+            cached_statements=STATEMENT_CACHE_SIZE, factory=_Connection,
+        )
+        pragmas = [p for p in CONNECTION_PRAGMAS if "journal_mode" not in p]
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(path), cached_statements=STATEMENT_CACHE_SIZE, factory=_Connection
+        )
+        pragmas = CONNECTION_PRAGMAS
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    for pragma in pragmas:
+        conn.execute(pragma)
+    return conn
+
+
+def _file_identity(path: Path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def get_connection(path: Optional[Path] = None) -> sqlite3.Connection:
+    """Get a new (unpooled) database connection with row factory enabled."""
+    return _open_connection(path or DB_PATH)
+
+
+def _pooled_connection(slot: str = "entry", readonly: bool = False) -> sqlite3.Connection:
+    """
+    Return this thread's pooled connection, reopening it if DB_PATH changed,
+    the pool was reset, or the database file was replaced on disk.
+    """
+    entry = getattr(_local, slot, None)
+    if entry is not None:
+        conn, path, generation, identity = entry
+        if (
+            path == DB_PATH
+            and generation == _pool_generation
+            and identity == _file_identity(path)
+        ):
+            return conn
+        setattr(_local, slot, None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    conn = _open_connection(DB_PATH, readonly=readonly)
+    setattr(_local, slot, (conn, DB_PATH, _pool_generation, _file_identity(DB_PATH)))
     return conn
 
 
+def close_pooled_connections():
+    """Close this thread's pooled connections and invalidate other threads'."""
+    global _pool_generation
+    _pool_generation += 1
+    for slot in ("entry", "reader", "iterator"):
+        entry = getattr(_local, slot, None)
+        setattr(_local, slot, None)
+        if entry is not None:
+            try:
+                entry[0].close()
+            except sqlite3.Error:
+                pass
+
+
+def get_pool_generation() -> int:
+    """
+    Counter bumped whenever the pooled connections are reset (init_db, reset_db).
+
+    Module-level caches of database content include it in their keys so they
+    never serve rows from a database that has since been replaced.
+    """
+    return _pool_generation
+
+
 @contextmanager
-def get_db():
-    """Context manager for database connections."""
-    conn = get_connection()
+def get_db(immediate: bool = False):
+    """
+    Context manager for database connections.
+
+    Yields this thread's pooled connection. The outermost block commits on
+    success and rolls back on error; nested blocks run inside a savepoint so
+    an inner failure only undoes the inner block's writes.
+
+    Args:
+        immediate: Take the write lock up front (BEGIN IMMEDIATE) for
+            read-then-write blocks, so another writer can't slip in between
+            the read and the write. Ignored for nested blocks.
+    """
+    depth = getattr(_local, "depth", 0)
+    if depth:
+        conn = _local.entry[0]
+        if not conn.in_transaction:
+            # Otherwise the SAVEPOINT opens a transaction of its own and its
+            # RELEASE commits, out from under the outer block's rollback
+            conn.execute("BEGIN")
+        savepoint = f"noctem_sp{depth}"
+        conn.execute(f"SAVEPOINT {savepoint}")
+    else:
+        conn = _pooled_connection()
+        if immediate and not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+    _local.depth = depth + 1
     try:
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
+        if depth:
+            conn.execute(f"RELEASE {savepoint}")
+        else:
+            conn.commit()
+    except BaseException:
+        if depth:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        else:
+            conn.rollback()
         raise
     finally:
-        conn.close()
+        _local.depth = depth
+
+
+def in_transaction() -> bool:
+    """
+    True while this thread is inside a get_db() block.
+
+    Work handed to other threads can't see that block's uncommitted writes.
+    """
+    return bool(getattr(_local, "depth", 0))
+
+
+@contextmanager
+def read_db():
+    """
+    Context manager for read-only lookups.
+
+    Yields this thread's pooled read-only connection (query_only, so a stray
+    write fails loudly) without opening a transaction; under WAL its reads
+    never wait on the writer. Inside a get_db() block it yields that block's
+    connection instead, so uncommitted writes stay visible.
+    """
+    yield _read_connection()
+
+
+def _read_connection() -> sqlite3.Connection:
+    """The open get_db() connection if any, else this thread's read-only one."""
+    if getattr(_local, "depth", 0):
+        return _local.entry[0]
+    try:
+        return _pooled_connection("reader", readonly=True)
+    except sqlite3.OperationalError:
+        # No database file yet: the writer creates it
+        return _pooled_connection()
+
+
+ITER_BATCH_SIZE = 64
+
+
+def iter_rows(query: str, params=(), batch_size: int = ITER_BATCH_SIZE) -> Iterator[sqlite3.Row]:
+    """
+    Lazily yield rows of a read-only query, fetching batch_size at a time.
+
+    Outside a get_db() block the query runs on this thread's pooled iterator
+    connection, a read-only one separate from read_db()'s: a half-consumed
+    iterator holds a read snapshot, and keeping it there means read_db() on
+    this thread still sees later commits. An iterator opened while another
+    is still running gets a connection of its own, closed when it finishes.
+    Inside a get_db() block it runs on that block's connection, so
+    uncommitted writes are visible.
+
+    Callers that want a list should fetchall() under read_db() instead.
+    """
+    own = None
+    claimed = False
+    if getattr(_local, "depth", 0):
+        conn = _local.entry[0]
+    else:
+        try:
+            if getattr(_local, "iterating", False):
+                conn = own = _open_connection(DB_PATH, readonly=True)
+            else:
+                conn = _pooled_connection("iterator", readonly=True)
+                claimed = _local.iterating = True
+        except sqlite3.OperationalError:
+            # No database file yet: the writer creates it
+            conn = _pooled_connection()
+    cursor = None
+    try:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if own is not None:
+            own.close()
+        if claimed:
+            _local.iterating = False
 
 
 def init_db():
     """Initialize the database schema."""
+    # The file may have been deleted/replaced since the pool last touched it
+    close_pooled_connections()
     with get_db() as conn:
         conn.executescript(SCHEMA)
     
@@ -484,6 +738,116 @@ def init_db():
     print(f"Database initialized at {DB_PATH}")
 
 
+POST_MIGRATION_INDEXES = [
+    # v0.9.x: get_projects_with_suggestions
+    """CREATE INDEX IF NOT EXISTS idx_projects_suggestion
+       ON projects(status, suggestion_generated_at DESC)
+       WHERE next_action_suggestion IS NOT NULL""",
+    # v0.9.x: get_tasks_needing_analysis (computer_help_suggestion is migrated)
+    """CREATE INDEX IF NOT EXISTS idx_tasks_needs_analysis
+       ON tasks(due_date, importance DESC)
+       WHERE status NOT IN ('done', 'canceled') AND computer_help_suggestion IS NULL""",
+    # v0.9.x: detect_user_corrections (summon_mode is a migrated column)
+    """CREATE INDEX IF NOT EXISTS idx_thoughts_summon_created
+       ON thoughts(created_at) WHERE summon_mode = 1""",
+]
+
+
+# Covering indexes for pattern detection's windowed aggregates (kind/time
+# range first, then every column the queries read, so they never touch the
+# table), plus other indexes widened since they first shipped. Built by
+# _ensure_covering_indexes rather than SCHEMA so an older, narrower index of
+# the same name gets rebuilt.
+COVERING_INDEXES = {
+    # detect_recurring_ambiguities / detect_clarification_patterns /
+    # get_clarification_outcomes
+    "idx_thoughts_kind_created": (
+        "thoughts", ("kind", "created_at", "ambiguity_reason", "status", "processed_at"),
+    ),
+    # detect_model_performance_patterns
+    "idx_execution_logs_model_perf": (
+        "execution_logs",
+        ("timestamp", "model_used", "component", "duration_ms", "confidence", "error"),
+    ),
+    # get_promotable_patterns: status=? then the full ORDER BY, so the
+    # occurrence_count DESC, confidence DESC LIMIT is a reverse scan with no sort
+    "idx_patterns_status": (
+        "detected_patterns", ("status", "occurrence_count", "confidence"),
+    ),
+}
+
+
+# Trigram full-text index over project names/summaries. Trigram tokens keep
+# get_project_by_name's case-insensitive substring semantics while letting
+# LIKE '%x%' use the index instead of scanning every row.
+PROJECTS_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+    name, summary, content='projects', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+    INSERT INTO projects_fts(rowid, name, summary) VALUES (new.id, new.name, new.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+    INSERT INTO projects_fts(projects_fts, rowid, name, summary)
+    VALUES ('delete', old.id, old.name, old.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE OF name, summary ON projects BEGIN
+    INSERT INTO projects_fts(projects_fts, rowid, name, summary)
+    VALUES ('delete', old.id, old.name, old.summary);
+    INSERT INTO projects_fts(rowid, name, summary) VALUES (new.id, new.name, new.summary);
+END;
+"""
+
+
+def _ensure_prompt_version_index(conn: sqlite3.Connection):
+    """
+    Make (template_id, version) unique. It backs every get_prompt lookup and
+    the history ORDER BY, and stops two writers recording the same version.
+    """
+    try:
+        conn.execute(
+            """CREATE UNIQUE INDEX IF NOT EXISTS idx_prompt_versions_tpl_ver
+               ON prompt_versions(template_id, version)"""
+        )
+    except sqlite3.IntegrityError as e:
+        # Duplicate versions from before the unique index: keep a plain one
+        print(f"  Skipped unique idx_prompt_versions_tpl_ver: {e}")
+        conn.execute(
+            """CREATE INDEX IF NOT EXISTS idx_prompt_versions_template
+               ON prompt_versions(template_id, version)"""
+        )
+        return
+    conn.execute("DROP INDEX IF EXISTS idx_prompt_versions_template")
+
+
+def _ensure_covering_indexes(conn: sqlite3.Connection):
+    """Create COVERING_INDEXES, rebuilding any whose columns have changed."""
+    for name, (table, columns) in COVERING_INDEXES.items():
+        existing = tuple(row[2] for row in conn.execute(f"PRAGMA index_info({name})"))
+        if existing == columns:
+            continue
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+        conn.execute(f"CREATE INDEX {name} ON {table}({', '.join(columns)})")
+
+
+def _ensure_projects_fts(conn: sqlite3.Connection):
+    """Create the projects FTS index, backfilling it on first creation."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+    ).fetchone()
+    try:
+        conn.executescript(PROJECTS_FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5 (or < 3.34 for trigram): callers fall back to LIKE
+        print(f"  Skipped projects_fts: {e}")
+        return
+    if not exists:
+        conn.execute("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')")
+
+
 def _migrate_db():
     """Add missing columns to existing tables (for upgrades)."""
     migrations = [
@@ -516,10 +880,19 @@ def _migrate_db():
                 except Exception as e:
                     # Column might already exist in some edge cases
                     pass
+        
+        # Indexes on migrated columns (can't live in SCHEMA, which runs first)
+        for statement in POST_MIGRATION_INDEXES:
+            conn.execute(statement)
+        
+        _ensure_prompt_version_index(conn)
+        _ensure_covering_indexes(conn)
+        _ensure_projects_fts(conn)
 
 
 def reset_db():
     """Drop all tables and reinitialize. USE WITH CAUTION."""
+    close_pooled_connections()
     if DB_PATH.exists():
         DB_PATH.unlink()
     init_db()
@@ -170,7 +170,8 @@ def run_cli():
 async def run_bot_async(with_slow_mode: bool = False):
     """Run the Telegram bot with scheduler and optionally slow mode."""
     from .telegram.bot import create_bot
-    from .scheduler.jobs import create_scheduler, set_bot_app
+    from .scheduler.jobs import create_scheduler, set_bot_app, stop_outbox
+    from .services.base import flush_action_log
     
     # Create bot
     app = create_bot()
@@ -200,9 +201,11 @@ async def run_bot_async(with_slow_mode: bool = False):
         except asyncio.CancelledError:
             pass
         finally:
+            await stop_outbox()
             await app.updater.stop()
             await app.stop()
             scheduler.shutdown()
+            flush_action_log()
             if with_slow_mode:
                 stop_slow_mode()
 
@@ -1,19 +1,63 @@
 """
 Data models for Noctem entities.
 """
+from __future__ import annotations
+
 from dataclasses import dataclass, field
 from datetime import date, time, datetime
-from typing import Optional
 import json
+import sys
+
+
+class _JsonCacheMixin:
+    """
+    Memoizes the JSON encoding of dict fields for the *_json() helpers.
+
+    The cached string is dropped when a tracked field is reassigned. In-place
+    edits to the dict are not tracked, so reassign the field after mutating it.
+    Slotted subclasses must declare a ``_json_cache`` field (init=False).
+    """
+    __slots__ = ()
+    _json_fields: frozenset = frozenset()
+
+    def __setattr__(self, name, value):
+        if name in self._json_fields:
+            object.__setattr__(self, "_json_cache", None)
+        object.__setattr__(self, name, value)
+
+    def _cached_json(self, name: str) -> str | None:
+        value = getattr(self, name)
+        if not value:
+            return None
+        cache = getattr(self, "_json_cache", None)
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, "_json_cache", cache)
+        encoded = cache.get(name)
+        if encoded is None:
+            encoded = cache[name] = json.dumps(value)
+        return encoded
+
+
+def _from_fields(cls, values: dict):
+    """
+    Build a dataclass instance from a complete field dict without __init__.
+
+    Used by the hot from_row paths: every field is supplied, so running
+    __init__ would only allocate default_factory containers to discard.
+    """
+    obj = cls.__new__(cls)
+    obj.__dict__.update(values)
+    return obj
 
 
 @dataclass
 class Goal:
-    id: Optional[int] = None
+    id: int | None = None
     name: str = ""
     type: str = "bigger_goal"  # bigger_goal | daily_goal
-    description: Optional[str] = None
-    created_at: Optional[datetime] = None
+    description: str | None = None
+    created_at: datetime | None = None
     archived: bool = False
 
     @classmethod
@@ -30,19 +74,19 @@ class Goal:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
-    id: Optional[int] = None
+    id: int | None = None
     name: str = ""
-    goal_id: Optional[int] = None
+    goal_id: int | None = None
     status: str = "in_progress"  # backburner | in_progress | done | canceled
-    summary: Optional[str] = None
-    start_date: Optional[date] = None
-    end_date: Optional[date] = None
-    created_at: Optional[datetime] = None
+    summary: str | None = None
+    start_date: date | None = None
+    end_date: date | None = None
+    created_at: datetime | None = None
     # v0.6.0: AI suggestions
-    next_action_suggestion: Optional[str] = None
-    suggestion_generated_at: Optional[datetime] = None
+    next_action_suggestion: str | None = None
+    suggestion_generated_at: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "Project":
@@ -67,22 +111,22 @@ class Project:
 
 @dataclass
 class Task:
-    id: Optional[int] = None
+    id: int | None = None
     name: str = ""
-    project_id: Optional[int] = None
+    project_id: int | None = None
     status: str = "not_started"  # not_started | in_progress | done | canceled
-    due_date: Optional[date] = None
-    due_time: Optional[time] = None
+    due_date: date | None = None
+    due_time: time | None = None
     importance: float = 0.5  # 0-1 scale: 1=important, 0.5=medium, 0=not important
     tags: list[str] = field(default_factory=list)
-    recurrence_rule: Optional[str] = None
-    created_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    recurrence_rule: str | None = None
+    created_at: datetime | None = None
+    completed_at: datetime | None = None
     # v0.6.0: AI suggestions
-    computer_help_suggestion: Optional[str] = None
-    suggestion_generated_at: Optional[datetime] = None
+    computer_help_suggestion: str | None = None
+    suggestion_generated_at: datetime | None = None
     # v0.6.0 Polish: Duration for context-aware suggestions
-    duration_minutes: Optional[int] = None
+    duration_minutes: int | None = None
 
     @property
     def title(self) -> str:
@@ -152,22 +196,22 @@ class Task:
         suggestion_at = row["suggestion_generated_at"] if "suggestion_generated_at" in row.keys() else None
         duration = row["duration_minutes"] if "duration_minutes" in row.keys() else None
         
-        return cls(
-            id=row["id"],
-            name=row["name"],
-            project_id=row["project_id"],
-            status=row["status"],
-            due_date=due_date_val,
-            due_time=due_time_val,
-            importance=importance_val,
-            tags=tags,
-            recurrence_rule=row["recurrence_rule"],
-            created_at=row["created_at"],
-            completed_at=row["completed_at"],
-            computer_help_suggestion=computer_help,
-            suggestion_generated_at=suggestion_at,
-            duration_minutes=duration,
-        )
+        return _from_fields(cls, {
+            "id": row["id"],
+            "name": row["name"],
+            "project_id": row["project_id"],
+            "status": row["status"],
+            "due_date": due_date_val,
+            "due_time": due_time_val,
+            "importance": importance_val,
+            "tags": tags,
+            "recurrence_rule": row["recurrence_rule"],
+            "created_at": row["created_at"],
+            "completed_at": row["completed_at"],
+            "computer_help_suggestion": computer_help,
+            "suggestion_generated_at": suggestion_at,
+            "duration_minutes": duration,
+        })
 
     def tags_json(self) -> str:
         """Return tags as JSON string for DB storage."""
@@ -176,14 +220,14 @@ class Task:
 
 @dataclass
 class TimeBlock:
-    id: Optional[int] = None
+    id: int | None = None
     title: str = ""
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
+    start_time: datetime | None = None
+    end_time: datetime | None = None
     source: str = "manual"  # manual | gcal | ics
-    gcal_event_id: Optional[str] = None
+    gcal_event_id: str | None = None
     block_type: str = "other"  # meeting | focus | personal | other
-    created_at: Optional[datetime] = None
+    created_at: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "TimeBlock":
@@ -219,12 +263,12 @@ class TimeBlock:
 
 @dataclass
 class ActionLog:
-    id: Optional[int] = None
+    id: int | None = None
     action_type: str = ""  # task_created, task_completed, etc.
-    entity_type: Optional[str] = None  # task, project, goal, etc.
-    entity_id: Optional[int] = None
+    entity_type: str | None = None  # task, project, goal, etc.
+    entity_id: int | None = None
     details: dict = field(default_factory=dict)
-    created_at: Optional[datetime] = None
+    created_at: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "ActionLog":
@@ -253,18 +297,18 @@ class ActionLog:
 @dataclass
 class Thought:
     """Universal capture for all inputs (royal scribe pattern)."""
-    id: Optional[int] = None
+    id: int | None = None
     source: str = "cli"  # 'telegram', 'cli', 'web', 'voice'
     raw_text: str = ""
-    kind: Optional[str] = None  # 'actionable', 'note', 'ambiguous'
-    ambiguity_reason: Optional[str] = None  # 'scope', 'timing', 'intent'
-    confidence: Optional[float] = None  # 0.0-1.0 classifier confidence
-    linked_task_id: Optional[int] = None
-    linked_project_id: Optional[int] = None
-    voice_journal_id: Optional[int] = None
+    kind: str | None = None  # 'actionable', 'note', 'ambiguous'
+    ambiguity_reason: str | None = None  # 'scope', 'timing', 'intent'
+    confidence: float | None = None  # 0.0-1.0 classifier confidence
+    linked_task_id: int | None = None
+    linked_project_id: int | None = None
+    voice_journal_id: int | None = None
     status: str = "pending"  # 'pending', 'processed', 'clarified'
-    created_at: Optional[datetime] = None
-    processed_at: Optional[datetime] = None
+    created_at: datetime | None = None
+    processed_at: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "Thought":
@@ -287,17 +331,19 @@ class Thought:
 
 
 @dataclass
-class Conversation:
+class Conversation(_JsonCacheMixin):
     """Unified conversation log across web/CLI/Telegram."""
-    id: Optional[int] = None
-    session_id: Optional[str] = None
+    _json_fields = frozenset({"metadata"})
+
+    id: int | None = None
+    session_id: str | None = None
     source: str = "cli"  # 'web', 'cli', 'telegram'
     role: str = "user"  # 'user', 'assistant', 'system'
     content: str = ""
-    thinking_summary: Optional[str] = None
-    thinking_level: Optional[str] = None  # 'decision', 'activity', 'debug'
+    thinking_summary: str | None = None
+    thinking_level: str | None = None  # 'decision', 'activity', 'debug'
     metadata: dict = field(default_factory=dict)
-    created_at: Optional[datetime] = None
+    created_at: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "Conversation":
@@ -317,31 +363,31 @@ class Conversation:
             except ValueError:
                 pass
         
-        return cls(
-            id=row["id"],
-            session_id=row["session_id"],
-            source=row["source"],
-            role=row["role"],
-            content=row["content"],
-            thinking_summary=row["thinking_summary"],
-            thinking_level=row["thinking_level"],
-            metadata=metadata,
-            created_at=created_at_val,
-        )
+        return _from_fields(cls, {
+            "id": row["id"],
+            "session_id": row["session_id"],
+            "source": row["source"],
+            "role": row["role"],
+            "content": row["content"],
+            "thinking_summary": row["thinking_summary"],
+            "thinking_level": row["thinking_level"],
+            "metadata": metadata,
+            "created_at": created_at_val,
+        })
 
     def metadata_json(self) -> str:
         """Return metadata as JSON string for DB storage."""
-        return json.dumps(self.metadata) if self.metadata else None
+        return self._cached_json("metadata")
 
 
 @dataclass
 class PromptTemplate:
     """LLM prompt template with versioning."""
-    id: Optional[int] = None
+    id: int | None = None
     name: str = ""
-    description: Optional[str] = None
+    description: str | None = None
     current_version: int = 1
-    created_at: Optional[datetime] = None
+    created_at: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "PromptTemplate":
@@ -359,39 +405,51 @@ class PromptTemplate:
 @dataclass
 class PromptVersion:
     """A specific version of a prompt template."""
-    id: Optional[int] = None
+    id: int | None = None
     template_id: int = 0
     version: int = 1
     prompt_text: str = ""
     variables: list[str] = field(default_factory=list)  # ['task_name', 'project_context']
-    created_at: Optional[datetime] = None
+    created_at: datetime | None = None
     created_by: str = "system"  # 'system', 'user'
 
     @classmethod
     def from_row(cls, row) -> "PromptVersion":
         if row is None:
             return None
+        return cls.from_tuple((
+            row["id"], row["template_id"], row["version"], row["prompt_text"],
+            row["variables"], row["created_at"], row["created_by"],
+        ))
+
+    @classmethod
+    def from_tuple(cls, values) -> "PromptVersion":
+        """
+        Build from a plain tuple in prompt_versions column order (id,
+        template_id, version, prompt_text, variables, created_at, created_by),
+        for hot paths that skip the sqlite3.Row factory.
+        """
+        id, template_id, version, prompt_text, variables_raw, created_at_val, created_by = values
         variables = []
-        if row["variables"]:
+        if variables_raw:
             try:
-                variables = json.loads(row["variables"])
+                variables = json.loads(variables_raw)
             except json.JSONDecodeError:
                 variables = []
         # Parse created_at if it's a string
-        created_at_val = row["created_at"]
         if isinstance(created_at_val, str):
             try:
                 created_at_val = datetime.fromisoformat(created_at_val)
             except ValueError:
                 pass
         return cls(
-            id=row["id"],
-            template_id=row["template_id"],
-            version=row["version"],
-            prompt_text=row["prompt_text"],
+            id=id,
+            template_id=template_id,
+            version=version,
+            prompt_text=prompt_text,
             variables=variables,
             created_at=created_at_val,
-            created_by=row["created_by"],
+            created_by=created_by,
         )
 
     def variables_json(self) -> str:
@@ -402,20 +460,20 @@ class PromptVersion:
 @dataclass
 class ExecutionLog:
     """Execution trace log entry for pipeline debugging and analysis."""
-    id: Optional[int] = None
+    id: int | None = None
     trace_id: str = ""
-    timestamp: Optional[datetime] = None
+    timestamp: datetime | None = None
     stage: str = ""  # 'input', 'classify', 'route', 'execute', 'complete'
     component: str = ""  # 'fast', 'slow', 'butler', 'summon'
     input_data: dict = field(default_factory=dict)
     output_data: dict = field(default_factory=dict)
-    confidence: Optional[float] = None
-    duration_ms: Optional[int] = None
-    model_used: Optional[str] = None
-    thought_id: Optional[int] = None
-    task_id: Optional[int] = None
-    project_id: Optional[int] = None  # v0.7.0: Link to project
-    error: Optional[str] = None
+    confidence: float | None = None
+    duration_ms: int | None = None
+    model_used: str | None = None
+    thought_id: int | None = None
+    task_id: int | None = None
+    project_id: int | None = None  # v0.7.0: Link to project
+    error: str | None = None
     metadata: dict = field(default_factory=dict)
 
     @classmethod
@@ -443,23 +501,23 @@ class ExecutionLog:
         # Get project_id safely (may not exist in older databases)
         project_id_val = row["project_id"] if "project_id" in row.keys() else None
         
-        return cls(
-            id=row["id"],
-            trace_id=row["trace_id"],
-            timestamp=row["timestamp"],
-            stage=row["stage"],
-            component=row["component"],
-            input_data=input_data,
-            output_data=output_data,
-            confidence=row["confidence"],
-            duration_ms=row["duration_ms"],
-            model_used=row["model_used"],
-            thought_id=row["thought_id"],
-            task_id=row["task_id"],
-            project_id=project_id_val,
-            error=row["error"],
-            metadata=metadata,
-        )
+        return _from_fields(cls, {
+            "id": row["id"],
+            "trace_id": row["trace_id"],
+            "timestamp": row["timestamp"],
+            "stage": row["stage"],
+            "component": row["component"],
+            "input_data": input_data,
+            "output_data": output_data,
+            "confidence": row["confidence"],
+            "duration_ms": row["duration_ms"],
+            "model_used": row["model_used"],
+            "thought_id": row["thought_id"],
+            "task_id": row["task_id"],
+            "project_id": project_id_val,
+            "error": row["error"],
+            "metadata": metadata,
+        })
 
 
 @dataclass
@@ -467,19 +525,19 @@ class ModelInfo:
     """Information about a local LLM model."""
     name: str = ""
     backend: str = "ollama"  # 'ollama', 'vllm', 'llamacpp'
-    family: Optional[str] = None  # 'qwen2.5', 'llama3', 'mistral'
-    parameter_size: Optional[str] = None  # '7b', '14b', '70b'
-    quantization: Optional[str] = None  # 'q4_K_M', 'q8_0', 'fp16'
-    context_length: Optional[int] = None
+    family: str | None = None  # 'qwen2.5', 'llama3', 'mistral'
+    parameter_size: str | None = None  # '7b', '14b', '70b'
+    quantization: str | None = None  # 'q4_K_M', 'q8_0', 'fp16'
+    context_length: int | None = None
     supports_function_calling: bool = False
     supports_json_schema: bool = False
-    tokens_per_sec: Optional[float] = None
-    memory_gb: Optional[float] = None
-    quality_score: Optional[float] = None
+    tokens_per_sec: float | None = None
+    memory_gb: float | None = None
+    quality_score: float | None = None
     health: str = "unknown"  # 'ok', 'slow', 'error', 'unknown'
-    last_benchmarked: Optional[datetime] = None
-    last_used_for: Optional[str] = None
-    notes: Optional[str] = None
+    last_benchmarked: datetime | None = None
+    last_used_for: str | None = None
+    notes: str | None = None
 
     @classmethod
     def from_row(cls, row) -> "ModelInfo":
@@ -504,19 +562,22 @@ class ModelInfo:
         )
 
 
-@dataclass
-class MaintenanceInsight:
+@dataclass(slots=True)
+class MaintenanceInsight(_JsonCacheMixin):
     """System maintenance insight for self-improvement."""
-    id: Optional[int] = None
+    _json_fields = frozenset({"details"})
+
+    id: int | None = None
     insight_type: str = ""  # 'pattern', 'blocker', 'recommendation', 'model_upgrade'
     source: str = ""  # 'model_scan', 'queue_health', 'project_agents'
     title: str = ""
     details: dict = field(default_factory=dict)
     priority: int = 3  # 1-5, higher = more important
     status: str = "pending"  # 'pending', 'reported', 'actioned', 'dismissed'
-    created_at: Optional[datetime] = None
-    reported_at: Optional[datetime] = None
-    resolved_at: Optional[datetime] = None
+    created_at: datetime | None = None
+    reported_at: datetime | None = None
+    resolved_at: datetime | None = None
+    _json_cache: dict | None = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
     def from_row(cls, row) -> "MaintenanceInsight":
@@ -543,20 +604,22 @@ class MaintenanceInsight:
 
     def details_json(self) -> str:
         """Return details as JSON string for DB storage."""
-        return json.dumps(self.details) if self.details else None
+        return self._cached_json("details")
 
 
 @dataclass
-class DetectedPattern:
+class DetectedPattern(_JsonCacheMixin):
     """Detected pattern for self-improvement engine."""
-    id: Optional[int] = None
+    _json_fields = frozenset({"context"})
+
+    id: int | None = None
     pattern_type: str = ""  # 'ambiguity', 'extraction_failure', 'correction', 'model_perf', 'clarification_outcome'
     pattern_key: str = ""  # Unique identifier (e.g., 'phrase:work on X')
     occurrence_count: int = 1
-    first_seen: Optional[datetime] = None
-    last_seen: Optional[datetime] = None
+    first_seen: datetime | None = None
+    last_seen: datetime | None = None
     context: dict = field(default_factory=dict)  # JSON: example traces, metadata
-    confidence: Optional[float] = None  # 0.0-1.0 how confident we are in this pattern
+    confidence: float | None = None  # 0.0-1.0 how confident we are in this pattern
     status: str = "pending"  # 'pending', 'promoted_to_insight', 'dismissed'
 
     @classmethod
@@ -584,7 +647,9 @@ class DetectedPattern:
                 pass
         return cls(
             id=row["id"],
-            pattern_type=row["pattern_type"],
+            # A handful of distinct values repeated on every row (and used as
+            # the insight dispatch key): share one string per value
+            pattern_type=sys.intern(row["pattern_type"]),
             pattern_key=row["pattern_key"],
             occurrence_count=row["occurrence_count"],
             first_seen=first_seen_val,
@@ -596,22 +661,22 @@ class DetectedPattern:
 
     def context_json(self) -> str:
         """Return context as JSON string for DB storage."""
-        return json.dumps(self.context) if self.context else None
+        return self._cached_json("context")
 
 
-@dataclass
+@dataclass(slots=True)
 class LearnedRule:
     """Learned rule for classifier improvements."""
-    id: Optional[int] = None
+    id: int | None = None
     rule_type: str = ""  # 'keyword_importance', 'ambiguity_flag', 'time_expression', 'confidence_threshold'
-    pattern_id: Optional[int] = None  # Link to detected_patterns
+    pattern_id: int | None = None  # Link to detected_patterns
     rule_key: str = ""  # e.g., 'keyword:dentist appointment'
     rule_value: dict = field(default_factory=dict)  # JSON: the actual rule data
     priority: int = 3  # Higher priority rules checked first
     enabled: bool = True  # Can be disabled without deleting
-    created_at: Optional[datetime] = None
+    created_at: datetime | None = None
     applied_count: int = 0  # How many times this rule has been used
-    last_applied: Optional[datetime] = None
+    last_applied: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "LearnedRule":
@@ -655,15 +720,17 @@ class LearnedRule:
 
 
 @dataclass
-class FeedbackEvent:
+class FeedbackEvent(_JsonCacheMixin):
     """User feedback on suggestions/insights."""
-    id: Optional[int] = None
+    _json_fields = frozenset({"context"})
+
+    id: int | None = None
     entity_type: str = ""  # 'task_suggestion', 'project_suggestion', 'insight', 'clarification'
     entity_id: int = 0  # ID of the task, project, insight, etc.
     feedback_type: str = ""  # 'thumbs_up', 'thumbs_down', 'accepted', 'dismissed', 'modified'
     source: str = "web"  # 'web', 'cli', 'telegram'
     context: dict = field(default_factory=dict)  # JSON: additional context
-    created_at: Optional[datetime] = None
+    created_at: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "FeedbackEvent":
@@ -694,19 +761,19 @@ class FeedbackEvent:
 
     def context_json(self) -> str:
         """Return context as JSON string for DB storage."""
-        return json.dumps(self.context) if self.context else None
+        return self._cached_json("context")
 
 
 @dataclass
 class Experiment:
     """A/B testing experiment."""
-    id: Optional[int] = None
+    id: int | None = None
     experiment_type: str = ""  # 'model_comparison', 'threshold_test', 'confidence_tuning'
     experiment_key: str = ""  # Unique identifier
     variant_a: dict = field(default_factory=dict)  # JSON: configuration A
     variant_b: dict = field(default_factory=dict)  # JSON: configuration B
-    started_at: Optional[datetime] = None
-    ended_at: Optional[datetime] = None
+    started_at: datetime | None = None
+    ended_at: datetime | None = None
     status: str = "active"  # 'active', 'completed', 'canceled'
 
     @classmethod
@@ -761,12 +828,12 @@ class Experiment:
 @dataclass
 class ExperimentResult:
     """Result from an A/B testing experiment."""
-    id: Optional[int] = None
+    id: int | None = None
     experiment_id: int = 0
     variant: str = ""  # 'a' or 'b'
     trace_id: str = ""  # Link to execution trace
     outcome_metric: dict = field(default_factory=dict)  # JSON: metrics (accuracy, speed, user_satisfaction)
-    created_at: Optional[datetime] = None
+    created_at: datetime | None = None
 
     @classmethod
     def from_row(cls, row) -> "ExperimentResult":
@@ -865,25 +932,25 @@ class SkillMetadata:
 @dataclass
 class Skill:
     """Skill registry entry (stored in DB)."""
-    id: Optional[int] = None
+    id: int | None = None
     name: str = ""
     version: str = "1.0.0"
     source: str = "bundled"  # 'bundled', 'user'
     skill_path: str = ""
-    description: Optional[str] = None
+    description: str | None = None
     triggers: list[SkillTrigger] = field(default_factory=list)
     dependencies: list[str] = field(default_factory=list)
     requires_approval: bool = False
     enabled: bool = True
-    last_used: Optional[datetime] = None
+    last_used: datetime | None = None
     use_count: int = 0
     success_count: int = 0
     failure_count: int = 0
-    created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
 
     @property
-    def success_rate(self) -> Optional[float]:
+    def success_rate(self) -> float | None:
         """Calculate success rate as percentage (0-100)."""
         if self.use_count == 0:
             return None
@@ -958,26 +1025,26 @@ class Skill:
 @dataclass
 class SkillExecution:
     """Skill execution record."""
-    id: Optional[int] = None
-    skill_id: Optional[int] = None
-    skill_name: Optional[str] = None  # Denormalized for convenience
-    trace_id: Optional[str] = None
+    id: int | None = None
+    skill_id: int | None = None
+    skill_name: str | None = None  # Denormalized for convenience
+    trace_id: str | None = None
     trigger_type: str = "explicit"  # 'explicit', 'pattern_match'
-    trigger_input: Optional[str] = None
-    trigger_confidence: Optional[float] = None  # 0.0-1.0
-    skill_version: Optional[str] = None
+    trigger_input: str | None = None
+    trigger_confidence: float | None = None  # 0.0-1.0
+    skill_version: str | None = None
     status: str = "pending"  # 'pending', 'approved', 'running', 'completed', 'failure', 'rejected'
     approval_required: bool = False
-    approved_by: Optional[str] = None  # 'user', 'auto'
-    approved_at: Optional[datetime] = None
-    output_summary: Optional[str] = None
-    error_message: Optional[str] = None
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    created_at: Optional[datetime] = None
+    approved_by: str | None = None  # 'user', 'auto'
+    approved_at: datetime | None = None
+    output_summary: str | None = None
+    error_message: str | None = None
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    created_at: datetime | None = None
 
     @property
-    def approved(self) -> Optional[bool]:
+    def approved(self) -> bool | None:
         """Whether this execution was approved (True), rejected (False), or pending (None)."""
         if self.status == "rejected":
             return False
@@ -986,7 +1053,7 @@ class SkillExecution:
         return None
 
     @property
-    def duration_ms(self) -> Optional[int]:
+    def duration_ms(self) -> int | None:
         """Calculate execution duration in milliseconds."""
         if self.started_at and self.completed_at:
             delta = self.completed_at - self.started_at
@@ -1037,21 +1104,21 @@ class SkillExecution:
 @dataclass
 class Source:
     """A document source for the wiki knowledge base."""
-    id: Optional[int] = None
+    id: int | None = None
     file_path: str = ""
-    file_type: Optional[str] = None  # 'pdf', 'txt', 'md'
-    file_name: Optional[str] = None
-    title: Optional[str] = None
-    author: Optional[str] = None
-    file_hash: Optional[str] = None  # SHA-256
-    file_size_bytes: Optional[int] = None
+    file_type: str | None = None  # 'pdf', 'txt', 'md'
+    file_name: str | None = None
+    title: str | None = None
+    author: str | None = None
+    file_hash: str | None = None  # SHA-256
+    file_size_bytes: int | None = None
     trust_level: int = 1  # 1=personal, 2=curated, 3=web
     status: str = "pending"  # 'pending', 'processing', 'indexed', 'failed', 'changed'
     chunk_count: int = 0
-    ingested_at: Optional[datetime] = None
-    last_verified: Optional[datetime] = None
-    error_message: Optional[str] = None
-    created_at: Optional[datetime] = None
+    ingested_at: datetime | None = None
+    last_verified: datetime | None = None
+    error_message: str | None = None
+    created_at: datetime | None = None
 
     @property
     def trust_label(self) -> str:
@@ -1104,19 +1171,19 @@ class Source:
 @dataclass
 class KnowledgeChunk:
     """A chunk of text from a source document, with embedding reference."""
-    id: Optional[int] = None
+    id: int | None = None
     source_id: int = 0
     chunk_id: str = ""  # UUID for ChromaDB linking
     content: str = ""
-    page_or_section: Optional[str] = None  # "p.47" or "## Section Name"
+    page_or_section: str | None = None  # "p.47" or "## Section Name"
     chunk_index: int = 0  # Order within document
-    token_count: Optional[int] = None
-    start_char: Optional[int] = None
-    end_char: Optional[int] = None
-    created_at: Optional[datetime] = None
+    token_count: int | None = None
+    start_char: int | None = None
+    end_char: int | None = None
+    created_at: datetime | None = None
     # Transient fields (not stored in DB, populated at runtime)
-    source: Optional[Source] = None  # Parent source (for citations)
-    similarity_score: Optional[float] = None  # Populated during retrieval
+    source: Source | None = None  # Parent source (for citations)
+    similarity_score: float | None = None  # Populated during retrieval
 
     @property
     def citation_ref(self) -> str:
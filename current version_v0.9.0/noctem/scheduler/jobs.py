@@ -2,17 +2,18 @@
 Scheduled jobs using APScheduler.
 Handles morning briefing, Google Calendar sync, and butler contacts (v0.6.0).
 """
+import asyncio
+import concurrent.futures
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from telegram.error import NetworkError, RetryAfter
 
 from ..config import Config
-from ..services.briefing import generate_morning_briefing
-from ..services.calendar_sync import sync_calendar, is_gcal_configured
-from ..butler.protocol import ButlerProtocol
-from ..butler.updates import generate_update_message
-from ..butler.clarifications import ClarificationQueue, generate_clarification_message
+from ..butler.outbox import Outbox
+from ..services.base import flush_action_log
 
 logger = logging.getLogger(__name__)
 
@@ -22,16 +23,114 @@ scheduler = None
 # Telegram bot application (set from main.py)
 _bot_app = None
 
+# Outbound message queue (created alongside the bot app)
+_outbox = None
+
+# Event loop the bot/scheduler run on (captured in set_bot_app)
+_loop = None
+
+# Map day names to cron day-of-week
+_DAY_MAP = {
+    "monday": "mon", "tuesday": "tue", "wednesday": "wed",
+    "thursday": "thu", "friday": "fri", "saturday": "sat", "sunday": "sun"
+}
+_DAY_ORDER = {abbr: i for i, abbr in enumerate(_DAY_MAP.values())}
+
+_DEFAULT_UPDATE_DAYS = ["monday", "wednesday", "friday"]
+_DEFAULT_CLARIFICATION_DAYS = ["tuesday", "thursday"]
+
+
+@lru_cache(maxsize=64)
+def _parse_hhmm(value: str, default: tuple = (9, 0)) -> tuple:
+    """Parse an "HH:MM" config string into (hour, minute), falling back to default."""
+    try:
+        hour, minute = map(int, value.split(":"))
+    except (ValueError, AttributeError):
+        return default
+    return hour, minute
+
+
+@lru_cache(maxsize=64)
+def _dow_csv(days: tuple) -> str:
+    """
+    Turn lowercase day names into a cron day_of_week string, e.g. "mon,wed,fri".
+
+    Days are de-duplicated and put in week order, so equivalent configs map to
+    the same string (and therefore the same cached CronTrigger).
+    """
+    abbrs = {_DAY_MAP.get(d, d[:3]) for d in days}
+    return ",".join(sorted(abbrs, key=lambda a: _DAY_ORDER.get(a, len(_DAY_ORDER))))
+
+
+def _day_key(days) -> tuple:
+    """Normalize a configured day list into a hashable, order-independent cache key."""
+    return tuple(sorted(map(str.lower, days)))
+
+
+# Random delay (seconds) added to each cron fire so jobs sharing a minute
+# don't all hit the DB and the Telegram API in the same tick
+CRON_JITTER_SECONDS = 30
+
+
+@lru_cache(maxsize=64)
+def _cron(hour: int, minute: int, dow: str = None) -> CronTrigger:
+    """Build (and reuse) a jittered CronTrigger for the given time and day-of-week."""
+    if dow is None:
+        return CronTrigger(hour=hour, minute=minute, jitter=CRON_JITTER_SECONDS)
+    return CronTrigger(day_of_week=dow, hour=hour, minute=minute, jitter=CRON_JITTER_SECONDS)
+
+
+SEND_RETRIES = 3
+
+
+async def _send(chat_id: str, text: str, **kwargs):
+    """
+    Send a Telegram message, retrying transient failures.
+
+    Flood control (429 RetryAfter) waits the interval Telegram asks for;
+    timeouts and other network errors back off exponentially (1s, 2s, 4s).
+    Raises the last error once retries are exhausted, so the outbox skips
+    the post-send callback (and the contact isn't counted against the budget).
+    """
+    for attempt in range(SEND_RETRIES + 1):
+        try:
+            return await _bot_app.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+        except RetryAfter as e:
+            if attempt == SEND_RETRIES:
+                raise
+            delay = e.retry_after
+            if isinstance(delay, timedelta):
+                delay = delay.total_seconds()
+            logger.warning(f"Telegram flood control, retrying in {delay}s")
+            await asyncio.sleep(delay + 0.25)
+        except NetworkError as e:  # includes TimedOut
+            if attempt == SEND_RETRIES:
+                raise
+            logger.warning(f"Telegram send failed ({e}), retrying in {2 ** attempt}s")
+            await asyncio.sleep(2 ** attempt)
+
 
 def set_bot_app(app):
     """Set the Telegram bot application for sending messages."""
-    global _bot_app
+    global _bot_app, _outbox, _loop
     _bot_app = app
+    _outbox = Outbox(_send) if app is not None else None
+    try:
+        _loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _loop = None
+
+
+async def stop_outbox():
+    """Flush any queued messages and stop the outbox flusher."""
+    if _outbox is not None:
+        await _outbox.stop()
 
 
 async def send_morning_briefing():
     """Send the morning briefing via Telegram."""
     logger.info("Running morning briefing job")
+    from ..services.briefing import generate_morning_briefing
     
     if _bot_app is None:
         logger.warning("Bot app not configured, skipping morning briefing")
@@ -43,9 +142,9 @@ async def send_morning_briefing():
         return
     
     try:
-        briefing = generate_morning_briefing()
-        await _bot_app.bot.send_message(chat_id=chat_id, text=briefing)
-        logger.info("Morning briefing sent")
+        briefing = await asyncio.to_thread(generate_morning_briefing)
+        await _outbox.put(chat_id, briefing, kind="briefing")
+        logger.info("Morning briefing queued")
     except Exception as e:
         logger.error(f"Failed to send morning briefing: {e}")
 
@@ -53,6 +152,7 @@ async def send_morning_briefing():
 async def run_calendar_sync():
     """Sync Google Calendar events."""
     logger.info("Running calendar sync job")
+    from ..services.calendar_sync import sync_calendar, is_gcal_configured
     
     if not is_gcal_configured():
         logger.debug("Google Calendar not configured, skipping sync")
@@ -73,28 +173,34 @@ async def send_butler_update():
     Respects the 5 contacts/week budget.
     """
     logger.info("Running butler update job")
+    from ..butler.protocol import ButlerProtocol
+    from ..butler.updates import generate_update_message
     
     if _bot_app is None:
         logger.warning("Bot app not configured, skipping butler update")
         return
     
-    chat_id = Config.telegram_chat_id()
-    if not chat_id:
-        logger.warning("Telegram chat ID not configured")
+    # Chat ID + weekly budget check (logs the reason when skipping) overlaps
+    # with building the message; both are blocking DB work, so run them off
+    # the event loop. Generating is side-effect free, so it's safe to discard.
+    try:
+        chat_id, message = await asyncio.gather(
+            asyncio.to_thread(ButlerProtocol.gate, "update"),
+            asyncio.to_thread(generate_update_message),
+        )
+    except Exception as e:
+        logger.error(f"Failed to prepare butler update: {e}")
         return
-    
-    # Check budget before sending
-    if not ButlerProtocol.can_contact("update"):
-        logger.info("Butler update budget exhausted for this week")
+    if chat_id is None:
         return
     
     try:
-        message = generate_update_message()
-        await _bot_app.bot.send_message(chat_id=chat_id, text=message, parse_mode="Markdown")
-        
-        # Record the contact
-        ButlerProtocol.record_contact("update", message[:500])  # Truncate for storage
-        logger.info("Butler update sent")
+        # Record the contact only once the message has actually gone out
+        await _outbox.put(
+            chat_id, message, parse_mode="Markdown", kind="update",
+            on_sent=lambda: ButlerProtocol.record_contact("update", message[:500]),  # Truncate for storage
+        )
+        logger.info("Butler update queued")
     except Exception as e:
         logger.error(f"Failed to send butler update: {e}")
 
@@ -105,34 +211,28 @@ async def send_butler_clarification():
     Only sends if there are pending questions and budget allows.
     """
     logger.info("Running butler clarification job")
+    from ..butler.protocol import ButlerProtocol
+    from ..butler.clarifications import generate_clarification_message
     
     if _bot_app is None:
         logger.warning("Bot app not configured, skipping clarification")
         return
     
-    chat_id = Config.telegram_chat_id()
-    if not chat_id:
-        logger.warning("Telegram chat ID not configured")
-        return
-    
-    # Check if there are pending questions
-    if not ClarificationQueue.has_pending_questions():
-        logger.info("No pending clarification questions")
-        return
-    
-    # Check budget before sending
-    if not ButlerProtocol.can_contact("clarification"):
-        logger.info("Butler clarification budget exhausted for this week")
+    # Chat ID, pending questions and weekly budget in one check. Generating
+    # marks questions as asked, so it must wait for the gate.
+    chat_id = await asyncio.to_thread(ButlerProtocol.gate, "clarification")
+    if chat_id is None:
         return
     
     try:
-        message = generate_clarification_message()
+        message = await asyncio.to_thread(generate_clarification_message)
         if message:
-            await _bot_app.bot.send_message(chat_id=chat_id, text=message, parse_mode="Markdown")
-            
-            # Record the contact
-            ButlerProtocol.record_contact("clarification", message[:500])
-            logger.info("Butler clarification sent")
+            # Record the contact only once the message has actually gone out
+            await _outbox.put(
+                chat_id, message, parse_mode="Markdown", kind="clarification",
+                on_sent=lambda: ButlerProtocol.record_contact("clarification", message[:500]),
+            )
+            logger.info("Butler clarification queued")
     except Exception as e:
         logger.error(f"Failed to send butler clarification: {e}")
 
@@ -145,19 +245,16 @@ def create_scheduler() -> AsyncIOScheduler:
     
     # Morning briefing job
     morning_time = Config.morning_time()  # e.g., "07:00"
-    try:
-        hour, minute = map(int, morning_time.split(":"))
-    except (ValueError, AttributeError):
-        hour, minute = 7, 0
+    hour, minute = _parse_hhmm(morning_time, (7, 0))
     
     scheduler.add_job(
         send_morning_briefing,
-        CronTrigger(hour=hour, minute=minute),
+        _cron(hour, minute),
         id="morning_briefing",
         name="Morning Briefing",
         replace_existing=True,
     )
-    logger.info(f"Morning briefing scheduled for {hour:02d}:{minute:02d}")
+    logger.info(f"Morning briefing scheduled for {hour:02d}:{minute:02d} (+{CRON_JITTER_SECONDS}s jitter)")
     
     # Calendar sync job
     sync_interval = Config.get("gcal_sync_interval_minutes", 15)
@@ -181,49 +278,36 @@ def _schedule_butler_contacts(scheduler: AsyncIOScheduler):
     """Schedule butler update and clarification jobs based on config."""
     
     # Get configured days and times
-    update_days = Config.get("butler_update_days", ["monday", "wednesday", "friday"])
+    update_days = Config.get("butler_update_days", _DEFAULT_UPDATE_DAYS)
     update_time = Config.get("butler_update_time", "09:00")
-    clarification_days = Config.get("butler_clarification_days", ["tuesday", "thursday"])
-    clarification_time = Config.get("butler_clarification_time", "09:00")
+    clarification_days = Config.get("butler_clarification_days", _DEFAULT_CLARIFICATION_DAYS)
+    clarification_time = Config.get("butler_clarification_time", "09:15")
     
     # Parse times
-    try:
-        update_hour, update_minute = map(int, update_time.split(":"))
-    except (ValueError, AttributeError):
-        update_hour, update_minute = 9, 0
-    
-    try:
-        clarification_hour, clarification_minute = map(int, clarification_time.split(":"))
-    except (ValueError, AttributeError):
-        clarification_hour, clarification_minute = 9, 0
-    
-    # Map day names to cron day-of-week
-    day_map = {
-        "monday": "mon", "tuesday": "tue", "wednesday": "wed",
-        "thursday": "thu", "friday": "fri", "saturday": "sat", "sunday": "sun"
-    }
+    update_hour, update_minute = _parse_hhmm(update_time)
+    clarification_hour, clarification_minute = _parse_hhmm(clarification_time)
     
     # Schedule update jobs
-    update_dow = ",".join([day_map.get(d.lower(), d[:3]) for d in update_days])
+    update_dow = _dow_csv(_day_key(update_days))
     scheduler.add_job(
         send_butler_update,
-        CronTrigger(day_of_week=update_dow, hour=update_hour, minute=update_minute),
+        _cron(update_hour, update_minute, update_dow),
         id="butler_update",
         name="Butler Update",
         replace_existing=True,
     )
-    logger.info(f"Butler updates scheduled for {update_days} at {update_time}")
+    logger.info(f"Butler updates scheduled for {update_days} at {update_time} (+{CRON_JITTER_SECONDS}s jitter)")
     
     # Schedule clarification jobs
-    clarification_dow = ",".join([day_map.get(d.lower(), d[:3]) for d in clarification_days])
+    clarification_dow = _dow_csv(_day_key(clarification_days))
     scheduler.add_job(
         send_butler_clarification,
-        CronTrigger(day_of_week=clarification_dow, hour=clarification_hour, minute=clarification_minute),
+        _cron(clarification_hour, clarification_minute, clarification_dow),
         id="butler_clarification",
         name="Butler Clarification",
         replace_existing=True,
     )
-    logger.info(f"Butler clarifications scheduled for {clarification_days} at {clarification_time}")
+    logger.info(f"Butler clarifications scheduled for {clarification_days} at {clarification_time} (+{CRON_JITTER_SECONDS}s jitter)")
 
 
 def start_scheduler():
@@ -241,6 +325,7 @@ def stop_scheduler():
     if scheduler:
         scheduler.shutdown()
         logger.info("Scheduler stopped")
+    flush_action_log()
 
 
 def update_morning_time(new_time: str):
@@ -248,36 +333,66 @@ def update_morning_time(new_time: str):
     Config.set("morning_message_time", new_time)
     
     if scheduler:
+        parsed = _parse_hhmm(new_time, None)
+        if parsed is None:
+            logger.error(f"Failed to reschedule morning briefing: invalid time {new_time!r}")
+            return
+        hour, minute = parsed
         try:
-            hour, minute = map(int, new_time.split(":"))
             scheduler.reschedule_job(
                 "morning_briefing",
-                trigger=CronTrigger(hour=hour, minute=minute),
+                trigger=_cron(hour, minute),
             )
             logger.info(f"Morning briefing rescheduled to {hour:02d}:{minute:02d}")
         except Exception as e:
             logger.error(f"Failed to reschedule morning briefing: {e}")
 
 
+# Jobs that can be run on demand via trigger_now()
+_TRIGGERABLE_JOBS = {
+    "briefing": send_morning_briefing,
+    "sync": run_calendar_sync,
+    "butler_update": send_butler_update,
+    "butler_clarification": send_butler_clarification,
+}
+
+
+def trigger_now(kind: str) -> concurrent.futures.Future:
+    """
+    Run a scheduled job immediately on the bot's event loop.
+    
+    Safe to call from any thread (web handlers, CLI, tests); don't block on
+    the returned future from the event loop thread itself.
+    
+    Args:
+        kind: One of 'briefing', 'sync', 'butler_update', 'butler_clarification'
+        
+    Returns:
+        Future that resolves when the job finishes
+    """
+    job = _TRIGGERABLE_JOBS.get(kind)
+    if job is None:
+        raise ValueError(f"Unknown job: {kind}")
+    if _loop is None or _loop.is_closed():
+        raise RuntimeError("Bot event loop not available (set_bot_app not called from the loop)")
+    return asyncio.run_coroutine_threadsafe(job(), _loop)
+
+
 def trigger_briefing_now():
     """Manually trigger the morning briefing (for testing)."""
-    import asyncio
-    asyncio.create_task(send_morning_briefing())
+    return trigger_now("briefing")
 
 
 def trigger_sync_now():
     """Manually trigger calendar sync (for testing)."""
-    import asyncio
-    asyncio.create_task(run_calendar_sync())
+    return trigger_now("sync")
 
 
 def trigger_butler_update_now():
     """Manually trigger butler update (for testing)."""
-    import asyncio
-    asyncio.create_task(send_butler_update())
+    return trigger_now("butler_update")
 
 
 def trigger_butler_clarification_now():
     """Manually trigger butler clarification (for testing)."""
-    import asyncio
-    asyncio.create_task(send_butler_clarification())
+    return trigger_now("butler_clarification")
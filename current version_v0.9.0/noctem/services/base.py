@@ -1,9 +1,128 @@
 """
 Base service utilities including action logging.
+
+Action log writes are queued and written by a background thread in batches
+(up to ACTION_LOG_BATCH rows, or whatever arrived within ACTION_LOG_WAIT
+seconds) so service calls don't pay for an extra write transaction each.
+Each entry is written to the database that was current when it was logged,
+even if DB_PATH has changed since; entries for a database that no longer
+exists are dropped. Inside a get_db() block the entry is written on the
+caller's connection instead, so it commits or rolls back with the caller's
+work. Set config ``action_log_sync`` to always write inline and get the row
+ID back.
 """
+import atexit
 import json
-from typing import Any, Optional
-from ..db import get_db
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator, Optional
+from .. import db
+from ..config import Config
+from ..db import get_db, get_connection, in_transaction, iter_rows, read_db
+
+logger = logging.getLogger(__name__)
+
+ACTION_LOG_BATCH = 100
+ACTION_LOG_WAIT = 0.25  # seconds
+
+_INSERT_ACTION_SQL = """
+    INSERT INTO action_log (action_type, entity_type, entity_id, details)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _action_row(action_type, entity_type, entity_id, details) -> tuple:
+    # Empty/None details are stored as NULL without serializing
+    return (action_type, entity_type, entity_id, json.dumps(details) if details else None)
+
+
+class _ActionLogWriter:
+    """Daemon thread that drains queued actions into batched INSERTs."""
+
+    _FLUSH = object()  # sentinel: write what's collected now
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def put(self, item: tuple):
+        self._ensure_started()
+        self._queue.put_nowait(item)
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        if self._thread is None:
+            return
+        # Restart a writer that died, or join() would wait on it forever
+        self._ensure_started()
+        self._queue.put_nowait(self._FLUSH)
+        self._queue.join()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="action-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + ACTION_LOG_WAIT
+        while batch[-1] is not self._FLUSH and len(batch) < ACTION_LOG_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                # Entries go to the database that was current when they were logged
+                by_path: dict = {}
+                for item in batch:
+                    if item is not self._FLUSH:
+                        by_path.setdefault(item[0], []).append(item[1])
+                for path, rows in by_path.items():
+                    self._write(path, rows)
+            except Exception as e:
+                # Keep the thread alive: flush() callers are waiting on it
+                logger.error(f"Action log writer failed on a batch of {len(batch)}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _write(path, rows: list):
+        """Insert rows into the database at path, if it still exists."""
+        try:
+            if path == db.DB_PATH:
+                with get_db() as conn:
+                    conn.executemany(_INSERT_ACTION_SQL, rows)
+            elif path.exists():
+                conn = get_connection(path)
+                try:
+                    with conn:
+                        conn.executemany(_INSERT_ACTION_SQL, rows)
+                finally:
+                    conn.close()
+            else:
+                logger.debug(f"Dropping {len(rows)} action log entries for removed database {path}")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {len(rows)} action log entries: {e}")
+
+
+_writer = _ActionLogWriter()
+atexit.register(lambda: _writer.flush())
 
 
 def log_action(
@@ -11,34 +130,37 @@ def log_action(
     entity_type: Optional[str] = None,
     entity_id: Optional[int] = None,
     details: Optional[dict] = None,
-) -> int:
+) -> Optional[int]:
     """
     Log an action to the action_log table.
-    Returns the log entry ID.
+
+    Queued for the background writer by default and returns None. Inside a
+    get_db() block, or with config ``action_log_sync`` set, writes
+    immediately on this thread's connection and returns the log entry ID;
+    a rolled-back block then takes its log entries with it.
     """
-    with get_db() as conn:
-        cursor = conn.execute(
-            """
-            INSERT INTO action_log (action_type, entity_type, entity_id, details)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                action_type,
-                entity_type,
-                entity_id,
-                json.dumps(details) if details else None,
-            ),
-        )
-        return cursor.lastrowid
+    # Serialize here so a bad payload raises in the caller, not the writer
+    row = _action_row(action_type, entity_type, entity_id, details)
+    if in_transaction() or Config.get("action_log_sync", False):
+        with get_db() as conn:
+            return conn.execute(_INSERT_ACTION_SQL, row).lastrowid
 
+    _writer.put((db.DB_PATH, row))
+    return None
 
-def get_action_logs(
-    action_type: Optional[str] = None,
-    entity_type: Optional[str] = None,
-    entity_id: Optional[int] = None,
-    limit: int = 100,
-) -> list[dict]:
-    """Retrieve action logs with optional filtering."""
+
+def flush_action_log() -> None:
+    """Wait for queued action log entries to be written."""
+    _writer.flush()
+
+
+def _action_log_query(
+    action_type: Optional[str],
+    entity_type: Optional[str],
+    entity_id: Optional[int],
+    limit: int,
+) -> tuple[str, list]:
+    """SQL and parameters for an action log listing, newest first."""
     query = "SELECT * FROM action_log WHERE 1=1"
     params = []
 
@@ -54,7 +176,28 @@ def get_action_logs(
 
     query += " ORDER BY created_at DESC LIMIT ?"
     params.append(limit)
+    return query, params
+
+
+def iter_action_logs(
+    action_type: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    limit: int = 100,
+) -> Iterator[dict]:
+    """Lazily yield action logs (newest first) with optional filtering."""
+    flush_action_log()
+    return map(dict, iter_rows(*_action_log_query(action_type, entity_type, entity_id, limit)))
 
-    with get_db() as conn:
-        rows = conn.execute(query, params).fetchall()
-        return [dict(row) for row in rows]
+
+def get_action_logs(
+    action_type: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    limit: int = 100,
+) -> list[dict]:
+    """Retrieve action logs with optional filtering."""
+    flush_action_log()
+    query, params = _action_log_query(action_type, entity_type, entity_id, limit)
+    with read_db() as conn:
+        return [dict(row) for row in conn.execute(query, params).fetchall()]
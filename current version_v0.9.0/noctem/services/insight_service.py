@@ -4,15 +4,56 @@ Insight Service for Noctem v0.7.0.
 CRUD operations for maintenance insights and learned rules.
 """
 import logging
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import json
 
-from ..db import get_db
+from ..db import get_db, iter_rows, read_db
 from ..models import MaintenanceInsight, LearnedRule
 from ..slow.improvement_engine import apply_insight, dismiss_insight, get_learned_rules
 
 logger = logging.getLogger(__name__)
 
+# Exactly the columns MaintenanceInsight.from_row reads. Listings are ordered
+# and limited straight off idx_insights_status_prio_created / _prio_created /
+# _source_created, so only the returned rows are fetched from the table.
+_INSIGHT_COLUMNS = (
+    "id, insight_type, source, title, details, priority, status, "
+    "created_at, reported_at, resolved_at"
+)
+
+_GET_INSIGHT_SQL = f"SELECT {_INSIGHT_COLUMNS} FROM maintenance_insights WHERE id = ?"
+
+_PENDING_INSIGHTS_SQL = f"""
+    SELECT {_INSIGHT_COLUMNS} FROM maintenance_insights
+    WHERE status = 'pending'
+    ORDER BY priority DESC, created_at DESC
+    LIMIT ?
+"""
+
+_INSIGHTS_BY_SOURCE_SQL = f"""
+    SELECT {_INSIGHT_COLUMNS} FROM maintenance_insights
+    WHERE source = ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+# Fixed SQL per filter combination so listings reuse the cached prepared statement
+_ALL_INSIGHTS_SQL = {
+    False: (
+        f"SELECT {_INSIGHT_COLUMNS} FROM maintenance_insights "
+        "ORDER BY priority DESC, created_at DESC LIMIT ?"
+    ),
+    True: (
+        f"SELECT {_INSIGHT_COLUMNS} FROM maintenance_insights WHERE status = ? "
+        "ORDER BY priority DESC, created_at DESC LIMIT ?"
+    ),
+}
+
+
+def iter_pending_insights(limit: int = 10) -> Iterator[MaintenanceInsight]:
+    """Lazily yield pending insights ordered by priority (see get_pending_insights)."""
+    return map(MaintenanceInsight.from_row, iter_rows(_PENDING_INSIGHTS_SQL, (limit,)))
+
 
 def get_pending_insights(limit: int = 10) -> List[MaintenanceInsight]:
     """
@@ -24,14 +65,9 @@ def get_pending_insights(limit: int = 10) -> List[MaintenanceInsight]:
     Returns:
         List of MaintenanceInsight objects
     """
-    with get_db() as conn:
-        rows = conn.execute("""
-            SELECT * FROM maintenance_insights
-            WHERE status = 'pending'
-            ORDER BY priority DESC, created_at DESC
-            LIMIT ?
-        """, (limit,)).fetchall()
-        return [MaintenanceInsight.from_row(row) for row in rows]
+    with read_db() as conn:
+        rows = conn.execute(_PENDING_INSIGHTS_SQL, (limit,)).fetchall()
+    return [MaintenanceInsight.from_row(row) for row in rows]
 
 
 def get_insight(insight_id: int) -> Optional[MaintenanceInsight]:
@@ -45,12 +81,15 @@ def get_insight(insight_id: int) -> Optional[MaintenanceInsight]:
         MaintenanceInsight object or None if not found
     """
     with get_db() as conn:
-        row = conn.execute("""
-            SELECT * FROM maintenance_insights WHERE id = ?
-        """, (insight_id,)).fetchone()
+        row = conn.execute(_GET_INSIGHT_SQL, (insight_id,)).fetchone()
         return MaintenanceInsight.from_row(row) if row else None
 
 
+def iter_insights_by_source(source: str, limit: int = 20) -> Iterator[MaintenanceInsight]:
+    """Lazily yield insights from a specific source, newest first."""
+    return map(MaintenanceInsight.from_row, iter_rows(_INSIGHTS_BY_SOURCE_SQL, (source, limit)))
+
+
 def get_insights_by_source(source: str, limit: int = 20) -> List[MaintenanceInsight]:
     """
     Get insights from a specific source.
@@ -62,14 +101,16 @@ def get_insights_by_source(source: str, limit: int = 20) -> List[MaintenanceInsi
     Returns:
         List of MaintenanceInsight objects
     """
-    with get_db() as conn:
-        rows = conn.execute("""
-            SELECT * FROM maintenance_insights
-            WHERE source = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (source, limit)).fetchall()
-        return [MaintenanceInsight.from_row(row) for row in rows]
+    with read_db() as conn:
+        rows = conn.execute(_INSIGHTS_BY_SOURCE_SQL, (source, limit)).fetchall()
+    return [MaintenanceInsight.from_row(row) for row in rows]
+
+
+def iter_all_insights(status: Optional[str] = None, limit: int = 50) -> Iterator[MaintenanceInsight]:
+    """Lazily yield insights, optionally filtered by status (see get_all_insights)."""
+    query = _ALL_INSIGHTS_SQL[bool(status)]
+    params = [status, limit] if status else [limit]
+    return map(MaintenanceInsight.from_row, iter_rows(query, params))
 
 
 def get_all_insights(status: Optional[str] = None, limit: int = 50) -> List[MaintenanceInsight]:
@@ -83,19 +124,10 @@ def get_all_insights(status: Optional[str] = None, limit: int = 50) -> List[Main
     Returns:
         List of MaintenanceInsight objects
     """
-    query = "SELECT * FROM maintenance_insights"
-    params = []
-    
-    if status:
-        query += " WHERE status = ?"
-        params.append(status)
-    
-    query += " ORDER BY priority DESC, created_at DESC LIMIT ?"
-    params.append(limit)
-    
-    with get_db() as conn:
-        rows = conn.execute(query, params).fetchall()
-        return [MaintenanceInsight.from_row(row) for row in rows]
+    params = [status, limit] if status else [limit]
+    with read_db() as conn:
+        rows = conn.execute(_ALL_INSIGHTS_SQL[bool(status)], params).fetchall()
+    return [MaintenanceInsight.from_row(row) for row in rows]
 
 
 def accept_insight(insight_id: int) -> bool:
@@ -131,45 +163,35 @@ def get_insight_summary() -> dict:
     Returns:
         Dict with counts by status and priority
     """
+    # One round-trip: each grouped count is tagged with the bucket it belongs to
     with get_db() as conn:
-        # Count by status
-        status_counts = {}
         rows = conn.execute("""
-            SELECT status, COUNT(*) as count
+            SELECT 'status' AS kind, status AS bucket, COUNT(*) AS count
             FROM maintenance_insights
             GROUP BY status
-        """).fetchall()
-        for row in rows:
-            status_counts[row["status"]] = row["count"]
-        
-        # Count by priority (pending only)
-        priority_counts = {}
-        rows = conn.execute("""
-            SELECT priority, COUNT(*) as count
+            UNION ALL
+            SELECT 'priority', priority, COUNT(*)
             FROM maintenance_insights
             WHERE status = 'pending'
             GROUP BY priority
-        """).fetchall()
-        for row in rows:
-            priority_counts[row["priority"]] = row["count"]
-        
-        # Count by source
-        source_counts = {}
-        rows = conn.execute("""
-            SELECT source, COUNT(*) as count
+            UNION ALL
+            SELECT 'source', source, COUNT(*)
             FROM maintenance_insights
             GROUP BY source
         """).fetchall()
-        for row in rows:
-            source_counts[row["source"]] = row["count"]
-        
-        return {
-            "by_status": status_counts,
-            "by_priority": priority_counts,
-            "by_source": source_counts,
-            "total": sum(status_counts.values()),
-            "pending": status_counts.get("pending", 0),
-        }
+    
+    counts = {"status": {}, "priority": {}, "source": {}}
+    for row in rows:
+        counts[row["kind"]][row["bucket"]] = row["count"]
+    status_counts = counts["status"]
+    
+    return {
+        "by_status": status_counts,
+        "by_priority": counts["priority"],
+        "by_source": counts["source"],
+        "total": sum(status_counts.values()),
+        "pending": status_counts.get("pending", 0),
+    }
 
 
 # Learned Rules Functions (wrap improvement_engine for convenience)
@@ -197,80 +219,100 @@ def get_rule(rule_id: int) -> Optional[LearnedRule]:
         return LearnedRule.from_row(row) if row else None
 
 
-def enable_rule(rule_id: int) -> bool:
-    """Enable a learned rule."""
+def _set_rule_flag(rule_id: int, enabled: int) -> bool:
+    """
+    Set a rule's enabled flag, skipping the write if it's already set.
+    
+    Returns:
+        True if the rule exists (and is now in the requested state)
+    """
     with get_db() as conn:
-        conn.execute("""
+        cursor = conn.execute("""
             UPDATE learned_rules
-            SET enabled = 1
-            WHERE id = ?
-        """, (rule_id,))
+            SET enabled = ?
+            WHERE id = ? AND enabled <> ?
+        """, (enabled, rule_id, enabled))
+        if cursor.rowcount > 0:
+            return True
+        # Nothing changed: either already in that state or no such rule
+        return conn.execute(
+            "SELECT 1 FROM learned_rules WHERE id = ?", (rule_id,)
+        ).fetchone() is not None
+
+
+def enable_rule(rule_id: int) -> bool:
+    """Enable a learned rule. Returns False if the rule doesn't exist."""
+    found = _set_rule_flag(rule_id, 1)
+    if found:
         logger.info(f"Enabled rule {rule_id}")
-        return True
+    return found
 
 
 def disable_rule(rule_id: int) -> bool:
-    """Disable a learned rule."""
-    with get_db() as conn:
-        conn.execute("""
-            UPDATE learned_rules
-            SET enabled = 0
-            WHERE id = ?
-        """, (rule_id,))
+    """Disable a learned rule. Returns False if the rule doesn't exist."""
+    found = _set_rule_flag(rule_id, 0)
+    if found:
         logger.info(f"Disabled rule {rule_id}")
-        return True
+    return found
 
 
 def delete_rule(rule_id: int) -> bool:
-    """Delete a learned rule."""
+    """Delete a learned rule. Returns False if the rule doesn't exist."""
     with get_db() as conn:
-        conn.execute("""
+        deleted = conn.execute("""
             DELETE FROM learned_rules
             WHERE id = ?
-        """, (rule_id,))
+        """, (rule_id,)).rowcount > 0
+    if deleted:
         logger.info(f"Deleted rule {rule_id}")
-        return True
+    return deleted
 
 
 def get_rule_stats() -> dict:
     """Get statistics about learned rules."""
+    # One round-trip: totals, per-type counts and the most-applied rules,
+    # tagged by kind
     with get_db() as conn:
-        # Count by type
-        type_counts = {}
         rows = conn.execute("""
-            SELECT rule_type, COUNT(*) as count
+            SELECT 'total' AS kind, NULL AS id, NULL AS rule_key, NULL AS rule_type,
+                   COUNT(*) AS count, COALESCE(SUM(enabled = 1), 0) AS enabled
+            FROM learned_rules
+            UNION ALL
+            SELECT 'type', NULL, NULL, rule_type, COUNT(*), NULL
             FROM learned_rules
             WHERE enabled = 1
             GROUP BY rule_type
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'applied', id, rule_key, rule_type, applied_count, NULL
+                FROM learned_rules
+                WHERE enabled = 1 AND applied_count > 0
+                ORDER BY applied_count DESC
+                LIMIT 10
+            )
         """).fetchall()
-        for row in rows:
+    
+    total = enabled = 0
+    type_counts = {}
+    most_applied = []
+    for row in rows:
+        if row["kind"] == "total":
+            total, enabled = row["count"], row["enabled"]
+        elif row["kind"] == "type":
             type_counts[row["rule_type"]] = row["count"]
-        
-        # Most applied rules
-        most_applied = []
-        rows = conn.execute("""
-            SELECT id, rule_key, rule_type, applied_count
-            FROM learned_rules
-            WHERE enabled = 1 AND applied_count > 0
-            ORDER BY applied_count DESC
-            LIMIT 10
-        """).fetchall()
-        for row in rows:
+        else:
             most_applied.append({
                 "id": row["id"],
                 "rule_key": row["rule_key"],
                 "rule_type": row["rule_type"],
-                "applied_count": row["applied_count"],
+                "applied_count": row["count"],
             })
-        
-        # Total counts
-        total = conn.execute("SELECT COUNT(*) FROM learned_rules").fetchone()[0]
-        enabled = conn.execute("SELECT COUNT(*) FROM learned_rules WHERE enabled = 1").fetchone()[0]
-        
-        return {
-            "total": total,
-            "enabled": enabled,
-            "disabled": total - enabled,
-            "by_type": type_counts,
-            "most_applied": most_applied,
-        }
+    most_applied.sort(key=lambda r: r["applied_count"], reverse=True)
+    
+    return {
+        "total": total,
+        "enabled": enabled,
+        "disabled": total - enabled,
+        "by_type": type_counts,
+        "most_applied": most_applied,
+    }
@@ -1,12 +1,38 @@
 """
 Project service - CRUD operations for projects.
 """
+import sqlite3
 from typing import Optional
 from datetime import date
-from ..db import get_db
+from ..db import get_db, SUPPORTS_RETURNING
 from ..models import Project
 from .base import log_action
 
+_INSERT_PROJECT_SQL = """
+    INSERT INTO projects (name, goal_id, status, summary, start_date, end_date)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_GET_PROJECT_SQL = "SELECT * FROM projects WHERE id = ?"
+
+_PROJECT_BY_NAME_FTS_SQL = """
+    SELECT p.* FROM projects_fts f JOIN projects p ON p.id = f.rowid
+    WHERE f.name LIKE ?
+    ORDER BY p.created_at DESC LIMIT 1
+"""
+_PROJECT_BY_NAME_SQL = (
+    "SELECT * FROM projects WHERE name LIKE ? COLLATE NOCASE ORDER BY created_at DESC LIMIT 1"
+)
+
+# One fixed SQL string per filter combination, keyed by (status, goal_id) presence,
+# so repeated listings hit the connection's prepared-statement cache.
+_ALL_PROJECTS_SQL = {
+    (False, False): "SELECT * FROM projects ORDER BY created_at DESC",
+    (True, False): "SELECT * FROM projects WHERE status = ? ORDER BY created_at DESC",
+    (False, True): "SELECT * FROM projects WHERE goal_id = ? ORDER BY created_at DESC",
+    (True, True): "SELECT * FROM projects WHERE status = ? AND goal_id = ? ORDER BY created_at DESC",
+}
+
 
 def create_project(
     name: str,
@@ -17,36 +43,35 @@ def create_project(
     end_date: Optional[date] = None,
 ) -> Project:
     """Create a new project."""
+    params = (name, goal_id, status, summary, start_date, end_date)
     with get_db() as conn:
-        cursor = conn.execute(
-            """
-            INSERT INTO projects (name, goal_id, status, summary, start_date, end_date)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (name, goal_id, status, summary, start_date, end_date),
-        )
-        project_id = cursor.lastrowid
+        if SUPPORTS_RETURNING:
+            row = conn.execute(_INSERT_PROJECT_SQL + " RETURNING *", params).fetchone()
+        else:
+            project_id = conn.execute(_INSERT_PROJECT_SQL, params).lastrowid
+            row = conn.execute(_GET_PROJECT_SQL, (project_id,)).fetchone()
+    project = Project.from_row(row)
 
-    log_action("project_created", "project", project_id, {"name": name, "goal_id": goal_id})
-    return get_project(project_id)
+    log_action("project_created", "project", project.id, {"name": name, "goal_id": goal_id})
+    return project
 
 
 def get_project(project_id: int) -> Optional[Project]:
     """Get a project by ID."""
     with get_db() as conn:
-        row = conn.execute(
-            "SELECT * FROM projects WHERE id = ?", (project_id,)
-        ).fetchone()
+        row = conn.execute(_GET_PROJECT_SQL, (project_id,)).fetchone()
         return Project.from_row(row)
 
 
 def get_project_by_name(name: str) -> Optional[Project]:
     """Get a project by name (case-insensitive partial match)."""
+    pattern = f"%{name}%"
     with get_db() as conn:
-        row = conn.execute(
-            "SELECT * FROM projects WHERE LOWER(name) LIKE LOWER(?) ORDER BY created_at DESC LIMIT 1",
-            (f"%{name}%",),
-        ).fetchone()
+        try:
+            row = conn.execute(_PROJECT_BY_NAME_FTS_SQL, (pattern,)).fetchone()
+        except sqlite3.OperationalError:
+            # No projects_fts (SQLite without FTS5 trigram support)
+            row = conn.execute(_PROJECT_BY_NAME_SQL, (pattern,)).fetchone()
         return Project.from_row(row)
 
 
@@ -55,17 +80,8 @@ def get_all_projects(
     goal_id: Optional[int] = None,
 ) -> list[Project]:
     """Get all projects with optional filtering."""
-    query = "SELECT * FROM projects WHERE 1=1"
-    params = []
-
-    if status:
-        query += " AND status = ?"
-        params.append(status)
-    if goal_id:
-        query += " AND goal_id = ?"
-        params.append(goal_id)
-
-    query += " ORDER BY created_at DESC"
+    query = _ALL_PROJECTS_SQL[bool(status), bool(goal_id)]
+    params = [p for p in (status, goal_id) if p]
 
     with get_db() as conn:
         rows = conn.execute(query, params).fetchall()
@@ -116,10 +132,14 @@ def update_project(
     query = f"UPDATE projects SET {', '.join(updates)} WHERE id = ?"
 
     with get_db() as conn:
-        conn.execute(query, params)
+        if SUPPORTS_RETURNING:
+            row = conn.execute(query + " RETURNING *", params).fetchone()
+        else:
+            conn.execute(query, params)
+            row = conn.execute(_GET_PROJECT_SQL, (project_id,)).fetchone()
 
     log_action("project_updated", "project", project_id, {"updates": updates})
-    return get_project(project_id)
+    return Project.from_row(row)
 
 
 def complete_project(project_id: int) -> Optional[Project]:
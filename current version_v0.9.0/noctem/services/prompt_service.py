@@ -9,15 +9,22 @@ Manages LLM prompt templates with versioning:
 - Seed default prompts
 """
 import re
+import json
+import time
 import logging
-from typing import Optional
+from dataclasses import replace
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Optional
 from datetime import datetime
 
-from ..db import get_db
+from ..db import get_db, get_pool_generation, iter_rows, read_db, SUPPORTS_RETURNING
 from ..models import PromptTemplate, PromptVersion
 
 logger = logging.getLogger(__name__)
 
+# {{variable_name}} placeholders
+_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
+
 
 # ============================================================================
 # Default Prompts (seeded on first use)
@@ -30,7 +37,6 @@ DEFAULT_PROMPTS = {
 Your job is to suggest practical ways a computer or automation could help with each task.
 Be specific, concise, and practical. Focus on things that are actually achievable with current technology.
 Keep your response to 2-3 sentences maximum.""",
-        "variables": [],
     },
     "task_analyzer_user": {
         "description": "User prompt template for task analysis",
@@ -41,7 +47,15 @@ Tags: {{tags}}
 
 What could a computer or automation help with for this task?
 Be specific and practical. Consider: reminders, research, templates, scheduling, notifications, data gathering, etc.""",
-        "variables": ["name", "project", "due_date", "tags"],
+    },
+    "task_analyzer_batch_user": {
+        "description": "User prompt template for analyzing several tasks in one request",
+        "prompt_text": """Tasks:
+{{task_list}}
+
+For each numbered task above, what could a computer or automation help with?
+Answer with one numbered item per task, using the same numbers (e.g. "1. ...").
+Be specific and practical. Consider: reminders, research, templates, scheduling, notifications, data gathering, etc.""",
     },
     "project_analyzer_system": {
         "description": "System prompt for project analysis - suggests next actions",
@@ -49,7 +63,6 @@ Be specific and practical. Consider: reminders, research, templates, scheduling,
 Your job is to suggest the most important next action the person should take.
 Be specific, concrete, and actionable. Focus on one clear next step.
 Keep your response to 2-3 sentences maximum.""",
-        "variables": [],
     },
     "project_analyzer_user": {
         "description": "User prompt template for project analysis",
@@ -62,15 +75,192 @@ Current Tasks:
 
 What should the person do next to make progress on this project?
 Suggest one specific, concrete action. Consider task priorities, dependencies, and what might be blocking progress.""",
-        "variables": ["name", "summary", "status", "task_list"],
     },
 }
 
 
+_MISSING = object()
+
+
+class _CompiledTemplate(NamedTuple):
+    """A template split into literal text around its {{variable}} placeholders."""
+    literals: tuple[str, ...]      # len(names) + 1 chunks of literal text
+    names: tuple[str, ...]         # variable name for each placeholder
+    placeholders: tuple[str, ...]  # original "{{name}}" text, kept for unknowns
+
+
+@lru_cache(maxsize=128)
+def _compile_template(text: str) -> _CompiledTemplate:
+    """
+    Split a template once so rendering is a join over the pieces, with no
+    regex or placeholder string building per call.
+    """
+    pieces = _VAR_RE.split(text)
+    names = tuple(pieces[1::2])
+    return _CompiledTemplate(
+        tuple(pieces[0::2]), names, tuple(f"{{{{{name}}}}}" for name in names)
+    )
+
+
+def _render_pieces(compiled: _CompiledTemplate, variables: dict) -> str:
+    """
+    Render a compiled template in one pass; unknown variables are left as-is.
+    
+    Not str.format_map: it would need prompt text brace-escaped, can't keep
+    unknown placeholders or blank out None without a Python-level mapping,
+    and benchmarks no faster than this join.
+    """
+    if not compiled.names:
+        # System prompts have no placeholders: the cached text is the render
+        return compiled.literals[0]
+    out = [compiled.literals[0]]
+    for name, placeholder, literal in zip(compiled.names, compiled.placeholders, compiled.literals[1:]):
+        value = variables.get(name, _MISSING)
+        if value is _MISSING:
+            out.append(placeholder)
+        elif value is not None:
+            out.append(str(value))
+        out.append(literal)
+    return "".join(out)
+
+
+# ============================================================================
+# Render Caches
+# ============================================================================
+
+# How long cached template metadata (current_version, description) is
+# trusted. Writes made through this module invalidate immediately; the TTL only
+# bounds staleness for edits made by another process (e.g. the CLI while the
+# bot is running).
+TEMPLATE_CACHE_TTL = 30.0
+
+# name -> (pool generation, template, expires at)
+_templates: dict[str, tuple[int, PromptTemplate, float]] = {}
+
+
+@lru_cache(maxsize=256)
+def _compiled_prompt(generation: int, name: str, version: int) -> _CompiledTemplate:
+    """
+    Compiled text of one prompt version. Versions are append-only, so entries
+    only go stale when a template is deleted (which clears the cache) or the
+    database is replaced (which changes the generation).
+    
+    Raises:
+        LookupError: If the version doesn't exist (not cached)
+    """
+    prompt_version = get_prompt(name, version)
+    if not prompt_version:
+        raise LookupError(f"{name} v{version}")
+    return _compile_template(prompt_version.prompt_text)
+
+
+def _cached_template(name: str) -> Optional[PromptTemplate]:
+    """Template metadata by name, cached for TEMPLATE_CACHE_TTL (misses aren't cached)."""
+    generation = get_pool_generation()
+    cached = _templates.get(name)
+    if cached and cached[0] == generation and cached[2] > time.monotonic():
+        return cached[1]
+    
+    with read_db() as conn:
+        row = conn.execute(_TEMPLATE_BY_NAME_SQL, (name,)).fetchone()
+    if not row:
+        return None
+    template = PromptTemplate.from_row(row)
+    _templates[name] = (generation, template, time.monotonic() + TEMPLATE_CACHE_TTL)
+    return template
+
+
+def _current_version(name: str) -> Optional[int]:
+    """Current version number for a template, seeding defaults if needed."""
+    template = _cached_template(name)
+    if not template and name in DEFAULT_PROMPTS:
+        seed_default_prompts()
+        template = _cached_template(name)
+    return template.current_version if template else None
+
+
+def _invalidate_prompt(name: str, deleted: bool = False):
+    _templates.pop(name, None)
+    if deleted:
+        # A re-created template reuses version numbers
+        _compiled_prompt.cache_clear()
+
+
 # ============================================================================
 # Core Functions
 # ============================================================================
 
+# One string per statement so the per-connection statement cache reuses it
+_TEMPLATE_BY_NAME_SQL = "SELECT * FROM prompt_templates WHERE name = ?"
+
+_TEMPLATE_BY_ID_SQL = "SELECT * FROM prompt_templates WHERE id = ?"
+
+# A NULL description keeps the current one
+_SET_CURRENT_VERSION_SQL = """
+    UPDATE prompt_templates
+    SET current_version = ?, description = COALESCE(?, description)
+    WHERE id = ?
+"""
+
+_INSERT_TEMPLATE_SQL = """
+    INSERT INTO prompt_templates (name, description, current_version)
+    VALUES (?, ?, 1)
+"""
+
+_INSERT_VERSION_SQL = """
+    INSERT INTO prompt_versions (template_id, version, prompt_text, variables, created_by)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_GET_VERSION_SQL = "SELECT * FROM prompt_versions WHERE id = ?"
+
+# Template (PromptTemplate field order), its current version (from_tuple
+# order, NULLs if missing) and the number of versions, in one row
+_PROMPT_CONTEXT_SQL = """
+    SELECT t.id, t.name, t.description, t.current_version, t.created_at,
+           v.id, v.template_id, v.version, v.prompt_text, v.variables,
+           v.created_at, v.created_by,
+           (SELECT COUNT(*) FROM prompt_versions h WHERE h.template_id = t.id)
+    FROM prompt_templates t
+    LEFT JOIN prompt_versions v
+      ON v.template_id = t.id AND v.version = t.current_version
+    WHERE t.name = ?
+"""
+
+# New version = copy of an old one (params: created_by, old version, name)
+_ROLLBACK_VERSION_SQL = """
+    INSERT INTO prompt_versions (template_id, version, prompt_text, variables, created_by)
+    SELECT v.template_id, t.current_version + 1, v.prompt_text, v.variables, ?
+    FROM prompt_templates t
+    JOIN prompt_versions v ON v.template_id = t.id AND v.version = ?
+    WHERE t.name = ?
+"""
+
+_PROMPT_HISTORY_SQL = """
+    SELECT v.* FROM prompt_templates t
+    JOIN prompt_versions v ON v.template_id = t.id
+    WHERE t.name = ?
+    ORDER BY v.version DESC
+"""
+
+# Version 1 of a just-inserted template, looked up by name (for executemany)
+_SEED_VERSION_SQL = """
+    INSERT INTO prompt_versions (template_id, version, prompt_text, variables, created_by)
+    SELECT id, 1, ?, ?, 'system' FROM prompt_templates WHERE name = ?
+"""
+
+# Template lookup and version fetch in one statement; version NULL = current.
+# Columns are listed in PromptVersion.from_tuple order.
+_GET_PROMPT_SQL = """
+    SELECT v.id, v.template_id, v.version, v.prompt_text, v.variables,
+           v.created_at, v.created_by
+    FROM prompt_templates t
+    JOIN prompt_versions v
+      ON v.template_id = t.id AND v.version = COALESCE(?, t.current_version)
+    WHERE t.name = ?
+"""
+
+
 def get_prompt(name: str, version: Optional[int] = None) -> Optional[PromptVersion]:
     """
     Get a prompt template by name.
@@ -82,40 +272,17 @@ def get_prompt(name: str, version: Optional[int] = None) -> Optional[PromptVersi
     Returns:
         PromptVersion or None if not found
     """
-    with get_db() as conn:
-        # Get the template
-        template_row = conn.execute(
-            "SELECT * FROM prompt_templates WHERE name = ?",
-            (name,)
-        ).fetchone()
-        
-        if not template_row:
-            # Try to seed defaults if this is a known prompt
-            if name in DEFAULT_PROMPTS:
-                seed_default_prompts()
-                template_row = conn.execute(
-                    "SELECT * FROM prompt_templates WHERE name = ?",
-                    (name,)
-                ).fetchone()
-            
-            if not template_row:
-                return None
-        
-        template = PromptTemplate.from_row(template_row)
+    with read_db() as conn:
+        # Plain tuples: skip building a sqlite3.Row on this hot path
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        row = cursor.execute(_GET_PROMPT_SQL, (version, name)).fetchone()
+        if not row and name in DEFAULT_PROMPTS:
+            # Known prompt that hasn't been seeded yet (or a missing version)
+            seed_default_prompts()
+            row = cursor.execute(_GET_PROMPT_SQL, (version, name)).fetchone()
         
-        # Get the requested version
-        target_version = version if version is not None else template.current_version
-        
-        version_row = conn.execute(
-            """SELECT * FROM prompt_versions 
-               WHERE template_id = ? AND version = ?""",
-            (template.id, target_version)
-        ).fetchone()
-        
-        if version_row:
-            return PromptVersion.from_row(version_row)
-        
-        return None
+        return PromptVersion.from_tuple(row) if row else None
 
 
 def render_prompt(name: str, variables: dict = None, version: Optional[int] = None) -> Optional[str]:
@@ -132,18 +299,17 @@ def render_prompt(name: str, variables: dict = None, version: Optional[int] = No
     Returns:
         Rendered prompt string or None if not found
     """
-    prompt_version = get_prompt(name, version)
-    if not prompt_version:
-        return None
-    
-    text = prompt_version.prompt_text
+    if version is None:
+        version = _current_version(name)
+        if version is None:
+            return None
     
-    if variables:
-        for key, value in variables.items():
-            placeholder = "{{" + key + "}}"
-            text = text.replace(placeholder, str(value) if value is not None else "")
+    try:
+        compiled = _compiled_prompt(get_pool_generation(), name, version)
+    except LookupError:
+        return None
     
-    return text
+    return _render_pieces(compiled, variables or {})
 
 
 def update_prompt(
@@ -164,12 +330,11 @@ def update_prompt(
     Returns:
         The new PromptVersion or None if template not found
     """
-    with get_db() as conn:
+    # Reads current_version then writes current_version + 1: lock first so
+    # concurrent updates can't both claim the same version number
+    with get_db(immediate=True) as conn:
         # Get existing template
-        template_row = conn.execute(
-            "SELECT * FROM prompt_templates WHERE name = ?",
-            (name,)
-        ).fetchone()
+        template_row = conn.execute(_TEMPLATE_BY_NAME_SQL, (name,)).fetchone()
         
         if not template_row:
             logger.warning(f"Prompt template not found: {name}")
@@ -181,35 +346,26 @@ def update_prompt(
         # Extract variables from new text
         variables = extract_variables(new_text)
         
-        # Create new version
-        import json
-        conn.execute(
-            """INSERT INTO prompt_versions 
-               (template_id, version, prompt_text, variables, created_by)
-               VALUES (?, ?, ?, ?, ?)""",
-            (template.id, new_version, new_text, json.dumps(variables), created_by)
-        )
-        
-        # Update template's current version
-        if description:
-            conn.execute(
-                """UPDATE prompt_templates 
-                   SET current_version = ?, description = ?
-                   WHERE id = ?""",
-                (new_version, description, template.id)
-            )
+        # Create new version, keeping the stored row to return
+        params = (template.id, new_version, new_text, _variables_json(variables), created_by)
+        if SUPPORTS_RETURNING:
+            version_row = conn.execute(_INSERT_VERSION_SQL + " RETURNING *", params).fetchone()
         else:
-            conn.execute(
-                """UPDATE prompt_templates 
-                   SET current_version = ?
-                   WHERE id = ?""",
-                (new_version, template.id)
-            )
+            version_id = conn.execute(_INSERT_VERSION_SQL, params).lastrowid
+            version_row = conn.execute(_GET_VERSION_SQL, (version_id,)).fetchone()
+        
+        # Update template's current version (and description, if given)
+        conn.execute(_SET_CURRENT_VERSION_SQL, (new_version, description or None, template.id))
         
         logger.info(f"Updated prompt '{name}' to version {new_version}")
     
-    # Return the new version (after transaction committed)
-    return get_prompt(name, new_version)
+    _invalidate_prompt(name)
+    return PromptVersion.from_row(version_row)
+
+
+def iter_prompt_history(name: str) -> Iterator[PromptVersion]:
+    """Lazily yield versions of a prompt template, newest first (see get_prompt_history)."""
+    return map(PromptVersion.from_row, iter_rows(_PROMPT_HISTORY_SQL, (name,)))
 
 
 def get_prompt_history(name: str) -> list[PromptVersion]:
@@ -222,23 +378,9 @@ def get_prompt_history(name: str) -> list[PromptVersion]:
     Returns:
         List of PromptVersion objects, newest first
     """
-    with get_db() as conn:
-        template_row = conn.execute(
-            "SELECT id FROM prompt_templates WHERE name = ?",
-            (name,)
-        ).fetchone()
-        
-        if not template_row:
-            return []
-        
-        version_rows = conn.execute(
-            """SELECT * FROM prompt_versions 
-               WHERE template_id = ?
-               ORDER BY version DESC""",
-            (template_row["id"],)
-        ).fetchall()
-        
-        return [PromptVersion.from_row(row) for row in version_rows]
+    with read_db() as conn:
+        rows = conn.execute(_PROMPT_HISTORY_SQL, (name,)).fetchall()
+    return [PromptVersion.from_row(row) for row in rows]
 
 
 def rollback_prompt(name: str, to_version: int) -> Optional[PromptVersion]:
@@ -254,17 +396,29 @@ def rollback_prompt(name: str, to_version: int) -> Optional[PromptVersion]:
     Returns:
         The new PromptVersion (copy of old version) or None if failed
     """
-    old_version = get_prompt(name, to_version)
-    if not old_version:
-        logger.warning(f"Version {to_version} not found for prompt '{name}'")
-        return None
+    params = (f"rollback_from_v{to_version}", to_version, name)
     
-    # Create new version with old text
-    return update_prompt(
-        name,
-        old_version.prompt_text,
-        created_by=f"rollback_from_v{to_version}",
-    )
+    # Copy the old version forward and bump current_version in one transaction
+    with get_db(immediate=True) as conn:
+        if SUPPORTS_RETURNING:
+            version_row = conn.execute(_ROLLBACK_VERSION_SQL + " RETURNING *", params).fetchone()
+        else:
+            cursor = conn.execute(_ROLLBACK_VERSION_SQL, params)
+            version_row = None
+            if cursor.rowcount:
+                version_row = conn.execute(_GET_VERSION_SQL, (cursor.lastrowid,)).fetchone()
+        
+        if not version_row:
+            logger.warning(f"Version {to_version} not found for prompt '{name}'")
+            return None
+        
+        conn.execute(
+            _SET_CURRENT_VERSION_SQL, (version_row["version"], None, version_row["template_id"])
+        )
+        logger.info(f"Rolled back prompt '{name}' to v{to_version} as version {version_row['version']}")
+    
+    _invalidate_prompt(name)
+    return PromptVersion.from_row(version_row)
 
 
 def extract_variables(prompt_text: str) -> list[str]:
@@ -279,16 +433,40 @@ def extract_variables(prompt_text: str) -> list[str]:
     Returns:
         List of variable names found
     """
-    pattern = r'\{\{(\w+)\}\}'
-    matches = re.findall(pattern, prompt_text)
-    # Return unique variables in order of first appearance
-    seen = set()
-    result = []
-    for var in matches:
-        if var not in seen:
-            seen.add(var)
-            result.append(var)
-    return result
+    # Unique variables in order of first appearance
+    return list(dict.fromkeys(_compile_template(prompt_text).names))
+
+
+_EMPTY_VARIABLES_JSON = "[]"
+
+
+def _variables_json(variables: list[str]) -> str:
+    """Compact JSON for the prompt_versions.variables column."""
+    if not variables:
+        return _EMPTY_VARIABLES_JSON
+    return json.dumps(variables, separators=(",", ":"))
+
+
+# Variable lists are derived from the text so they can't drift out of sync
+for _config in DEFAULT_PROMPTS.values():
+    _config["variables"] = extract_variables(_config["prompt_text"])
+del _config
+
+
+# Everything seed_default_prompts binds, built once at import:
+# name -> (_INSERT_TEMPLATE_SQL params, _SEED_VERSION_SQL params)
+_DEFAULT_PROMPT_NAMES = tuple(DEFAULT_PROMPTS)
+_DEFAULT_PROMPT_ROWS = {
+    name: (
+        (name, config["description"]),
+        (config["prompt_text"], _variables_json(config["variables"]), name),
+    )
+    for name, config in DEFAULT_PROMPTS.items()
+}
+
+_DEFAULT_NAMES_IN = "name IN (%s)" % ", ".join("?" * len(_DEFAULT_PROMPT_NAMES))
+_COUNT_DEFAULTS_SQL = f"SELECT COUNT(*) FROM prompt_templates WHERE {_DEFAULT_NAMES_IN}"
+_EXISTING_DEFAULTS_SQL = f"SELECT name FROM prompt_templates WHERE {_DEFAULT_NAMES_IN}"
 
 
 # ============================================================================
@@ -302,11 +480,11 @@ def list_prompts() -> list[PromptTemplate]:
     Returns:
         List of PromptTemplate objects
     """
-    with get_db() as conn:
-        rows = conn.execute(
-            "SELECT * FROM prompt_templates ORDER BY name"
-        ).fetchall()
-        return [PromptTemplate.from_row(row) for row in rows]
+    with read_db() as conn:
+        return [
+            PromptTemplate.from_row(row)
+            for row in conn.execute("SELECT * FROM prompt_templates ORDER BY name")
+        ]
 
 
 def get_prompt_template(name: str) -> Optional[PromptTemplate]:
@@ -319,12 +497,9 @@ def get_prompt_template(name: str) -> Optional[PromptTemplate]:
     Returns:
         PromptTemplate or None
     """
-    with get_db() as conn:
-        row = conn.execute(
-            "SELECT * FROM prompt_templates WHERE name = ?",
-            (name,)
-        ).fetchone()
-        return PromptTemplate.from_row(row) if row else None
+    template = _cached_template(name)
+    # Callers get their own copy so they can't alter the cached entry
+    return replace(template) if template else None
 
 
 def create_prompt_template(
@@ -348,36 +523,32 @@ def create_prompt_template(
     if variables is None:
         variables = extract_variables(prompt_text)
     
-    with get_db() as conn:
+    # Existence check + inserts under one write lock
+    with get_db(immediate=True) as conn:
         # Check if exists
-        existing = conn.execute(
-            "SELECT id FROM prompt_templates WHERE name = ?",
-            (name,)
-        ).fetchone()
+        existing = conn.execute(_TEMPLATE_BY_NAME_SQL, (name,)).fetchone()
         
         if existing:
             logger.warning(f"Prompt template already exists: {name}")
             return None
         
         # Create template
-        conn.execute(
-            """INSERT INTO prompt_templates (name, description, current_version)
-               VALUES (?, ?, 1)""",
-            (name, description)
-        )
-        template_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        if SUPPORTS_RETURNING:
+            template_row = conn.execute(
+                _INSERT_TEMPLATE_SQL + " RETURNING *", (name, description)
+            ).fetchone()
+        else:
+            template_id = conn.execute(_INSERT_TEMPLATE_SQL, (name, description)).lastrowid
+            template_row = conn.execute(_TEMPLATE_BY_ID_SQL, (template_id,)).fetchone()
         
         # Create initial version
-        import json
         conn.execute(
-            """INSERT INTO prompt_versions 
-               (template_id, version, prompt_text, variables, created_by)
-               VALUES (?, 1, ?, ?, 'system')""",
-            (template_id, prompt_text, json.dumps(variables))
+            _INSERT_VERSION_SQL,
+            (template_row["id"], 1, prompt_text, _variables_json(variables), "system")
         )
         
         logger.info(f"Created prompt template: {name}")
-        return get_prompt_template(name)
+        return PromptTemplate.from_row(template_row)
 
 
 def delete_prompt_template(name: str) -> bool:
@@ -390,31 +561,18 @@ def delete_prompt_template(name: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
+    # Versions go with it via the prompt_templates_delete_versions trigger
     with get_db() as conn:
-        template_row = conn.execute(
-            "SELECT id FROM prompt_templates WHERE name = ?",
-            (name,)
-        ).fetchone()
-        
-        if not template_row:
-            return False
-        
-        template_id = template_row["id"]
-        
-        # Delete versions first
-        conn.execute(
-            "DELETE FROM prompt_versions WHERE template_id = ?",
-            (template_id,)
-        )
-        
-        # Delete template
-        conn.execute(
-            "DELETE FROM prompt_templates WHERE id = ?",
-            (template_id,)
-        )
-        
-        logger.info(f"Deleted prompt template: {name}")
-        return True
+        deleted = conn.execute(
+            "DELETE FROM prompt_templates WHERE name = ?", (name,)
+        ).rowcount
+    
+    if not deleted:
+        return False
+    
+    logger.info(f"Deleted prompt template: {name}")
+    _invalidate_prompt(name, deleted=True)
+    return True
 
 
 # ============================================================================
@@ -428,21 +586,21 @@ def seed_default_prompts() -> dict:
     Returns:
         Dict with counts of created/skipped prompts
     """
-    result = {"created": 0, "skipped": 0}
-    
-    for name, config in DEFAULT_PROMPTS.items():
-        template = get_prompt_template(name)
-        if template:
-            result["skipped"] += 1
-        else:
-            create_prompt_template(
-                name=name,
-                prompt_text=config["prompt_text"],
-                description=config["description"],
-                variables=config["variables"],
-            )
-            result["created"] += 1
-    
+    # get_prompt calls this on every miss for a default name (including
+    # missing versions); when nothing needs seeding, don't take the write lock
+    with read_db() as conn:
+        seeded = conn.execute(_COUNT_DEFAULTS_SQL, _DEFAULT_PROMPT_NAMES).fetchone()[0]
+    if seeded == len(_DEFAULT_PROMPT_NAMES):
+        return {"created": 0, "skipped": seeded}
+    
+    # One write transaction for the whole seed instead of one per prompt
+    with get_db(immediate=True) as conn:
+        existing = {row[0] for row in conn.execute(_EXISTING_DEFAULTS_SQL, _DEFAULT_PROMPT_NAMES)}
+        rows = [_DEFAULT_PROMPT_ROWS[name] for name in _DEFAULT_PROMPT_NAMES if name not in existing]
+        conn.executemany(_INSERT_TEMPLATE_SQL, [template for template, _ in rows])
+        conn.executemany(_SEED_VERSION_SQL, [version for _, version in rows])
+    
+    result = {"created": len(rows), "skipped": len(existing)}
     if result["created"] > 0:
         logger.info(f"Seeded {result['created']} default prompts")
     
@@ -459,16 +617,19 @@ def get_prompt_with_context(name: str) -> Optional[dict]:
     - history_count: int
     - variables: list[str]
     """
-    template = get_prompt_template(name)
-    if not template:
+    with read_db() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        row = cursor.execute(_PROMPT_CONTEXT_SQL, (name,)).fetchone()
+    if not row:
         return None
     
-    current = get_prompt(name)
-    history = get_prompt_history(name)
+    template = PromptTemplate(*row[:5])
+    current = PromptVersion.from_tuple(row[5:12]) if row[5] is not None else None
     
     return {
         "template": template,
         "current_version": current,
-        "history_count": len(history),
+        "history_count": row[12],
         "variables": current.variables if current else [],
     }
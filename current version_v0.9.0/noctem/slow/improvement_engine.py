@@ -3,15 +3,28 @@ Improvement Engine for Noctem v0.7.0.
 
 Generates actionable insights and recommendations from detected patterns.
 """
-import logging
 import json
-from typing import Optional, Dict, List
+import logging
+from types import MappingProxyType
+from typing import Callable, Optional, Dict, List
 
-from ..db import get_db
+from ..db import get_db, SUPPORTS_RETURNING
 from ..models import DetectedPattern, MaintenanceInsight, LearnedRule
 
 logger = logging.getLogger(__name__)
 
+# Default mappings suggested for time words that fail date extraction
+# (read-only: shared by every extraction insight)
+_SUGGESTED_TIME_MAPPINGS = MappingProxyType({
+    "soon": "tomorrow 9am",
+    "later": "today +4 hours",
+    "weekend": "Saturday 9am",
+    "tonight": "today 8pm",
+    "morning": "tomorrow 9am",
+    "afternoon": "tomorrow 2pm",
+    "evening": "tomorrow 6pm",
+})
+
 
 def generate_insight_from_pattern(pattern: DetectedPattern) -> Optional[MaintenanceInsight]:
     """
@@ -27,18 +40,8 @@ def generate_insight_from_pattern(pattern: DetectedPattern) -> Optional[Maintena
     context = pattern.context if isinstance(pattern.context, dict) else {}
     
     # Generate insight based on pattern type
-    insight = None
-    
-    if pattern.pattern_type == "ambiguities":
-        insight = _generate_ambiguity_insight(pattern, context)
-    elif pattern.pattern_type == "extraction_failures":
-        insight = _generate_extraction_insight(pattern, context)
-    elif pattern.pattern_type == "user_corrections":
-        insight = _generate_correction_insight(pattern, context)
-    elif pattern.pattern_type == "clarifications":
-        insight = _generate_clarification_insight(pattern, context)
-    elif pattern.pattern_type == "model_performance":
-        insight = _generate_model_insight(pattern, context)
+    generate = _INSIGHT_GENERATORS.get(pattern.pattern_type)
+    insight = generate(pattern, context) if generate else None
     
     if insight:
         # Save to database
@@ -88,23 +91,12 @@ def _generate_extraction_insight(pattern: DetectedPattern, context: Dict) -> Mai
     
     title = f"Time word \"{time_word}\" often fails date extraction"
     
-    # Suggest default mappings based on common patterns
-    suggested_mappings = {
-        "soon": "tomorrow 9am",
-        "later": "today +4 hours",
-        "weekend": "Saturday 9am",
-        "tonight": "today 8pm",
-        "morning": "tomorrow 9am",
-        "afternoon": "tomorrow 2pm",
-        "evening": "tomorrow 6pm",
-    }
-    
     details = {
         "pattern_id": pattern.id,
         "time_word": time_word,
         "occurrence_count": pattern.occurrence_count,
         "examples": examples[:2],
-        "suggested_mapping": suggested_mappings.get(time_word, "clarify with user"),
+        "suggested_mapping": _SUGGESTED_TIME_MAPPINGS.get(time_word, "clarify with user"),
         "proposed_action": f"time_mapping:{time_word}",
         "recommendation": f"Add default time mapping for \"{time_word}\" or ask user for preference",
     }
@@ -208,22 +200,64 @@ def _generate_model_insight(pattern: DetectedPattern, context: Dict) -> Maintena
     )
 
 
+# Insight generator for each pattern type (keys match run_all_pattern_detection)
+_INSIGHT_GENERATORS: Dict[str, Callable[[DetectedPattern, Dict], MaintenanceInsight]] = {
+    "ambiguities": _generate_ambiguity_insight,
+    "extraction_failures": _generate_extraction_insight,
+    "user_corrections": _generate_correction_insight,
+    "clarifications": _generate_clarification_insight,
+    "model_performance": _generate_model_insight,
+}
+
+
+_INSERT_INSIGHT_SQL = """
+    INSERT INTO maintenance_insights 
+    (insight_type, source, title, details, priority, status, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+_SAVE_RULE_SQL = """
+    INSERT OR REPLACE INTO learned_rules 
+    (rule_type, pattern_id, rule_key, rule_value, priority, enabled, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+# Shared by apply_insight and dismiss_insight (one statement-cache entry)
+_RESOLVE_INSIGHT_SQL = """
+    UPDATE maintenance_insights
+    SET status = ?, resolved_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+_INSIGHT_DETAILS_SQL = "SELECT details FROM maintenance_insights WHERE id = ?"
+
+_RECORD_RULE_APPLICATION_SQL = """
+    UPDATE learned_rules
+    SET applied_count = applied_count + 1,
+        last_applied = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+
+def _insert_returning_id(conn, sql: str, params: tuple) -> int:
+    """Run an INSERT and return the new row's id."""
+    if SUPPORTS_RETURNING:
+        return conn.execute(sql + " RETURNING id", params).fetchone()[0]
+    return conn.execute(sql, params).lastrowid
+
+
 def _save_insight(insight: MaintenanceInsight) -> int:
     """Save an insight to the database."""
     with get_db() as conn:
-        cursor = conn.execute("""
-            INSERT INTO maintenance_insights 
-            (insight_type, source, title, details, priority, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (
+        return _insert_returning_id(conn, _INSERT_INSIGHT_SQL, (
             insight.insight_type,
             insight.source,
             insight.title,
-            json.dumps(insight.details),
+            insight.details_json(),
             insight.priority,
             insight.status,
         ))
-        return cursor.lastrowid
 
 
 def apply_insight(insight_id: int) -> bool:
@@ -236,17 +270,26 @@ def apply_insight(insight_id: int) -> bool:
         True if successfully applied
     """
     with get_db() as conn:
-        # Get the insight
-        row = conn.execute("""
-            SELECT * FROM maintenance_insights WHERE id = ?
-        """, (insight_id,)).fetchone()
+        # Mark the insight as actioned and read back its details in one
+        # statement; any rule below is written in the same transaction
+        params = ("actioned", insight_id)
+        if SUPPORTS_RETURNING:
+            row = conn.execute(_RESOLVE_INSIGHT_SQL + " RETURNING details", params).fetchone()
+        else:
+            row = conn.execute(_INSIGHT_DETAILS_SQL, (insight_id,)).fetchone()
+            if row:
+                conn.execute(_RESOLVE_INSIGHT_SQL, params)
         
         if not row:
             logger.error(f"Insight {insight_id} not found")
             return False
         
-        insight = MaintenanceInsight.from_row(row)
-        details = insight.details
+        details = {}
+        if row["details"]:
+            try:
+                details = json.loads(row["details"])
+            except json.JSONDecodeError:
+                details = {}
         proposed_action = details.get("proposed_action", "")
         
         # Create learned rule based on action type
@@ -276,13 +319,6 @@ def apply_insight(insight_id: int) -> bool:
             )
             rule_created = _save_learned_rule(rule)
         
-        # Mark insight as actioned
-        conn.execute("""
-            UPDATE maintenance_insights
-            SET status = 'actioned', resolved_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (insight_id,))
-        
         logger.info(f"Applied insight #{insight_id}, rule_created={rule_created}")
         return True
 
@@ -295,11 +331,7 @@ def dismiss_insight(insight_id: int) -> bool:
         True if successfully dismissed
     """
     with get_db() as conn:
-        conn.execute("""
-            UPDATE maintenance_insights
-            SET status = 'dismissed', resolved_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (insight_id,))
+        conn.execute(_RESOLVE_INSIGHT_SQL, ("dismissed", insight_id))
         
         logger.info(f"Dismissed insight #{insight_id}")
         return True
@@ -308,11 +340,7 @@ def dismiss_insight(insight_id: int) -> bool:
 def _save_learned_rule(rule: LearnedRule) -> int:
     """Save a learned rule to the database."""
     with get_db() as conn:
-        cursor = conn.execute("""
-            INSERT OR REPLACE INTO learned_rules 
-            (rule_type, pattern_id, rule_key, rule_value, priority, enabled, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (
+        rule_id = _insert_returning_id(conn, _SAVE_RULE_SQL, (
             rule.rule_type,
             rule.pattern_id,
             rule.rule_key,
@@ -321,7 +349,7 @@ def _save_learned_rule(rule: LearnedRule) -> int:
             int(rule.enabled),
         ))
         logger.info(f"Created learned rule: {rule.rule_key}")
-        return cursor.lastrowid
+        return rule_id
 
 
 def get_learned_rules(rule_type: Optional[str] = None, enabled_only: bool = True) -> List[LearnedRule]:
@@ -355,9 +383,4 @@ def get_learned_rules(rule_type: Optional[str] = None, enabled_only: bool = True
 def record_rule_application(rule_id: int):
     """Record that a learned rule was applied."""
     with get_db() as conn:
-        conn.execute("""
-            UPDATE learned_rules
-            SET applied_count = applied_count + 1,
-                last_applied = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (rule_id,))
+        conn.execute(_RECORD_RULE_APPLICATION_SQL, (rule_id,))
@@ -4,10 +4,11 @@ Log Review Skill for Noctem v0.7.0.
 Periodically analyzes execution logs, identifies patterns, and promotes them to insights.
 """
 import logging
-from typing import List, Dict, Optional
+import time
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 
-from ..db import get_db
+from ..db import get_db, get_pool_generation
 from ..logging import trace_analyzer
 from .pattern_detection import (
     run_all_pattern_detection,
@@ -18,6 +19,29 @@ from .improvement_engine import generate_insight_from_pattern
 
 logger = logging.getLogger(__name__)
 
+# should_run_log_review / get_log_review_status are polled by the slow loop and
+# the UI; their aggregate queries only need to be this fresh. run_log_review
+# clears the cache so a finished review shows up immediately.
+STATUS_CACHE_TTL = 60.0
+
+# key -> (pool generation, value, expires at)
+_status_cache: Dict[str, tuple] = {}
+
+
+def _cached_status(key: str, compute: Callable):
+    generation = get_pool_generation()
+    cached = _status_cache.get(key)
+    if cached and cached[0] == generation and cached[2] > time.monotonic():
+        return cached[1]
+    value = compute()
+    _status_cache[key] = (generation, value, time.monotonic() + STATUS_CACHE_TTL)
+    return value
+
+
+def _promotable_count() -> int:
+    """Promotable patterns (up to 100), shared by the status/recommendation checks."""
+    return _cached_status("promotable_count", lambda: len(get_promotable_patterns(limit=100)))
+
 
 def run_log_review(days: int = 30) -> Dict:
     """
@@ -46,17 +70,22 @@ def run_log_review(days: int = 30) -> Dict:
     promotable = get_promotable_patterns(limit=10)
     logger.info(f"{len(promotable)} patterns meet promotion criteria")
     
-    # Promote top patterns to insights
+    # Promote top patterns to insights. One outer transaction commits them all
+    # at once; each pattern's insert + status update nests in a savepoint, so a
+    # failure undoes only that pattern.
     insights_created = []
-    for pattern in promotable[:3]:  # Max 3 insights per review to avoid overwhelming user
-        try:
-            insight = generate_insight_from_pattern(pattern)
-            if insight:
-                insights_created.append(insight)
-                mark_pattern_promoted(pattern.id)
-                logger.info(f"Created insight from pattern: {pattern.pattern_key}")
-        except Exception as e:
-            logger.error(f"Failed to generate insight from pattern {pattern.id}: {e}")
+    with get_db():
+        for pattern in promotable[:3]:  # Max 3 insights per review to avoid overwhelming user
+            try:
+                with get_db():
+                    insight = generate_insight_from_pattern(pattern)
+                    if insight:
+                        mark_pattern_promoted(pattern.id)
+                if insight:
+                    insights_created.append(insight)
+                    logger.info(f"Created insight from pattern: {pattern.pattern_key}")
+            except Exception as e:
+                logger.error(f"Failed to generate insight from pattern {pattern.id}: {e}")
     
     # Get clarification outcomes
     clarification_stats = trace_analyzer.get_clarification_outcomes(days=min(days, 7))
@@ -78,6 +107,7 @@ def run_log_review(days: int = 30) -> Dict:
         "confidence_distribution": confidence_dist,
     }
     
+    _status_cache.clear()
     logger.info(f"Log review complete: {len(insights_created)} insights created")
     return summary
 
@@ -113,7 +143,7 @@ def get_log_review_recommendations() -> List[str]:
         )
     
     # Check for promotable patterns
-    promotable_count = len(get_promotable_patterns(limit=100))
+    promotable_count = _promotable_count()
     if promotable_count > 5:
         recommendations.append(
             f"💡 {promotable_count} patterns ready for promotion. Run log review to generate insights."
@@ -134,47 +164,51 @@ def should_run_log_review() -> bool:
     - OR at least 50 new thoughts since last review
     - OR at least 10 promotable patterns exist
     
+    The answer is cached for STATUS_CACHE_TTL seconds.
+    
     Returns:
         True if log review should run
     """
+    return _cached_status("should_run", _should_run_log_review)
+
+
+# Last review date, days since it, and thoughts captured since it, in one row
+_REVIEW_CHECK_SQL = """
+    WITH last AS (
+        SELECT MAX(created_at) AS last_review_date
+        FROM maintenance_insights
+        WHERE source = 'log_review'
+    )
+    SELECT last_review_date,
+           julianday('now') - julianday(last_review_date) AS days_since,
+           (SELECT COUNT(*) FROM thoughts
+            WHERE created_at > COALESCE(last_review_date, '1970-01-01')) AS new_thoughts
+    FROM last
+"""
+
+
+def _should_run_log_review() -> bool:
     with get_db() as conn:
-        # Check when last review ran (look for insights from log_review source)
-        last_review = conn.execute("""
-            SELECT MAX(created_at) as last_review_date
-            FROM maintenance_insights
-            WHERE source = 'log_review'
-        """).fetchone()
-        
-        if last_review and last_review["last_review_date"]:
-            # Check if 7+ days since last review
-            days_since = conn.execute("""
-                SELECT (julianday('now') - julianday(?)) as days_diff
-            """, (last_review["last_review_date"],)).fetchone()["days_diff"]
-            
-            if days_since >= 7:
-                logger.info(f"Log review needed: {days_since:.1f} days since last review")
-                return True
-        else:
-            # Never run before - should run
-            logger.info("Log review needed: never run before")
-            return True
-        
-        # Check thought count since last review
-        thought_count = conn.execute("""
-            SELECT COUNT(*) as count
-            FROM thoughts
-            WHERE created_at > COALESCE(?, '1970-01-01')
-        """, (last_review["last_review_date"] if last_review else None,)).fetchone()["count"]
-        
-        if thought_count >= 50:
-            logger.info(f"Log review needed: {thought_count} new thoughts since last review")
-            return True
-        
-        # Check promotable patterns
-        promotable_count = len(get_promotable_patterns(limit=100))
-        if promotable_count >= 10:
-            logger.info(f"Log review needed: {promotable_count} patterns ready for promotion")
-            return True
+        check = conn.execute(_REVIEW_CHECK_SQL).fetchone()
+    
+    if not check["last_review_date"]:
+        # Never run before - should run
+        logger.info("Log review needed: never run before")
+        return True
+    
+    if check["days_since"] >= 7:
+        logger.info(f"Log review needed: {check['days_since']:.1f} days since last review")
+        return True
+    
+    if check["new_thoughts"] >= 50:
+        logger.info(f"Log review needed: {check['new_thoughts']} new thoughts since last review")
+        return True
+    
+    # Only when the cheap checks pass: load promotable patterns
+    promotable_count = _promotable_count()
+    if promotable_count >= 10:
+        logger.info(f"Log review needed: {promotable_count} patterns ready for promotion")
+        return True
     
     logger.debug("Log review not needed yet")
     return False
@@ -182,11 +216,16 @@ def should_run_log_review() -> bool:
 
 def get_log_review_status() -> Dict:
     """
-    Get current status of log review system.
+    Get current status of log review system (cached for STATUS_CACHE_TTL seconds).
     
     Returns:
         Dict with status information
     """
+    # Copy so callers can't alter the cached dict
+    return dict(_cached_status("status", _log_review_status))
+
+
+def _log_review_status() -> Dict:
     with get_db() as conn:
         # Last review date
         last_review = conn.execute("""
@@ -205,7 +244,7 @@ def get_log_review_status() -> Dict:
         """).fetchone()["count"]
         
         # Promotable patterns count
-        promotable_count = len(get_promotable_patterns(limit=100))
+        promotable_count = _promotable_count()
         
         # Total patterns detected
         total_patterns = conn.execute("""
@@ -12,8 +12,8 @@ from typing import Optional
 from ..config import Config
 from ..db import get_db
 from .ollama import GracefulDegradation
-from .queue import SlowWorkQueue, WorkType
-from .task_analyzer import analyze_and_save as analyze_task, get_tasks_needing_analysis
+from .queue import SlowWorkQueue, WorkItem, WorkType
+from .task_analyzer import analyze_and_save_batch as analyze_tasks, get_tasks_needing_analysis
 from .project_analyzer import analyze_and_save as analyze_project, get_projects_needing_analysis
 from ..services import task_service, project_service
 from ..voice.journals import (
@@ -23,6 +23,9 @@ from ..fast.capture import process_voice_transcription
 
 logger = logging.getLogger(__name__)
 
+# Queued task analyses sent to the LLM together (one request per batch)
+TASK_BATCH_SIZE = 8
+
 # Global state for tracking user activity
 _last_user_activity = datetime.now()
 _loop_instance: Optional['SlowModeLoop'] = None
@@ -150,15 +153,7 @@ class SlowModeLoop:
         
         try:
             if item.work_type == WorkType.TASK_COMPUTER_HELP.value:
-                task = task_service.get_task(item.target_id)
-                if task:
-                    success = analyze_task(task)
-                    if success:
-                        SlowWorkQueue.mark_completed(item.id, "Task analyzed")
-                    else:
-                        SlowWorkQueue.mark_failed(item.id, "Analysis failed")
-                else:
-                    SlowWorkQueue.mark_failed(item.id, "Task not found")
+                self._process_task_batch(item)
             
             elif item.work_type == WorkType.PROJECT_NEXT_ACTION.value:
                 project = project_service.get_project(item.target_id)
@@ -195,6 +190,45 @@ class SlowModeLoop:
         
         return True
     
+    def _process_task_batch(self, item: WorkItem):
+        """
+        Analyze the item's task together with other ready task analyses,
+        so one LLM request covers up to TASK_BATCH_SIZE tasks.
+        """
+        items = [item] + [
+            other for other in SlowWorkQueue.get_next_items(
+                WorkType.TASK_COMPUTER_HELP.value, TASK_BATCH_SIZE
+            )
+            if other.id != item.id
+        ][:TASK_BATCH_SIZE - 1]
+        for other in items[1:]:
+            SlowWorkQueue.mark_processing(other.id)
+        
+        batch = []
+        for queued in items:
+            task = task_service.get_task(queued.target_id)
+            if task:
+                batch.append((queued, task))
+            else:
+                SlowWorkQueue.mark_failed(queued.id, "Task not found")
+        if not batch:
+            return
+        
+        try:
+            results = analyze_tasks([task for _, task in batch], batch_size=TASK_BATCH_SIZE)
+        except Exception as e:
+            logger.error(f"Error analyzing {len(batch)} tasks: {e}")
+            results = [False] * len(batch)
+            error = str(e)
+        else:
+            error = "Analysis failed"
+        
+        for (queued, _), success in zip(batch, results):
+            if success:
+                SlowWorkQueue.mark_completed(queued.id, "Task analyzed")
+            else:
+                SlowWorkQueue.mark_failed(queued.id, error)
+    
     def _process_voice_transcriptions(self, max_items: int = 1) -> int:
         """
         Process pending voice journal transcriptions.
@@ -4,12 +4,14 @@ Pattern Detection for Noctem v0.7.0 Self-Improvement Engine.
 Analyzes execution logs and user behavior to detect recurring patterns.
 """
 import logging
-from typing import List, Dict, Tuple, Optional
-from datetime import datetime, timedelta
+import re
+from typing import Iterable, List, Dict, Tuple, Optional
+from datetime import datetime, timedelta, timezone
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import json
 
-from ..db import get_db
+from ..db import get_db, in_transaction, iter_rows, read_db, SUPPORTS_RETURNING
 from ..models import DetectedPattern
 
 logger = logging.getLogger(__name__)
@@ -18,6 +20,50 @@ logger = logging.getLogger(__name__)
 MIN_OCCURRENCES = 5  # Minimum times a pattern must occur to be detected
 MIN_CONFIDENCE = 0.7  # Minimum confidence to promote pattern to insight
 
+# Time words the date parser often misses (whole words only, so "soonest" or
+# "mornings" don't count)
+_TIME_WORD_RE = re.compile(r"\b(soon|later|weekend|tonight|morning|afternoon|evening)\b")
+
+
+# Phrase counting stays in Python: a recursive-CTE tokenizer + window-function
+# n-grams measured ~3x slower than the Counter passes in
+# detect_recurring_ambiguities and can't match str.split() / str.lower() on
+# non-ASCII text or mixed whitespace.
+_AMBIGUOUS_THOUGHTS_SQL = """
+    SELECT LOWER(raw_text), ambiguity_reason
+    FROM thoughts
+    WHERE kind = 'ambiguous'
+      AND created_at >= ?
+"""
+
+
+def _cutoff(days: int) -> str:
+    """
+    Start of a detection window, in the UTC "YYYY-MM-DD HH:MM:SS" form
+    CURRENT_TIMESTAMP stores, for sargable `created_at >= ?` comparisons.
+    """
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _lowered(text: str) -> str:
+    """
+    Finish lowercasing a LOWER()ed column value.
+    
+    SQLite's LOWER only folds ASCII letters, which already gives str.lower()'s
+    result for ASCII text (str.isascii() is O(1)); anything else still needs
+    the Unicode-aware str.lower().
+    """
+    return text if text.isascii() else text.lower()
+
+
+def _phrases(text: str) -> List[str]:
+    """All 2-word then all 3-word phrases of a (lowercased) text."""
+    words = text.split()
+    return (
+        [f"{a} {b}" for a, b in zip(words, words[1:])]
+        + [f"{a} {b} {c}" for a, b, c in zip(words, words[1:], words[2:])]
+    )
+
 
 def detect_recurring_ambiguities(days: int = 30) -> List[Dict]:
     """
@@ -26,59 +72,73 @@ def detect_recurring_ambiguities(days: int = 30) -> List[Dict]:
     Returns:
         List of dicts with pattern_key, occurrence_count, example_texts, confidence
     """
-    with get_db() as conn:
-        # Get ambiguous thoughts from the period
-        rows = conn.execute("""
-            SELECT raw_text, ambiguity_reason, confidence
-            FROM thoughts
-            WHERE kind = 'ambiguous'
-              AND created_at >= datetime('now', ? || ' days')
-        """, (-days,)).fetchall()
-        
-        # Extract common phrases (2-3 words)
-        phrase_examples = defaultdict(list)
-        phrase_reasons = defaultdict(lambda: Counter())
-        
-        for row in rows:
-            text = row["raw_text"].lower()
-            words = text.split()
-            
-            # Extract 2-word and 3-word phrases
-            for i in range(len(words) - 1):
-                phrase = " ".join(words[i:i+2])
-                phrase_examples[phrase].append(text)
-                phrase_reasons[phrase][row["ambiguity_reason"]] += 1
-                
-                if i < len(words) - 2:
-                    phrase3 = " ".join(words[i:i+3])
-                    phrase_examples[phrase3].append(text)
-                    phrase_reasons[phrase3][row["ambiguity_reason"]] += 1
+    # Ambiguous thoughts from the period, streamed (see _AMBIGUOUS_THOUGHTS_SQL);
+    # both passes share one cutoff so they see the same window
+    params = (_cutoff(days),)
+    
+    # Count 2-3 word phrases with Counter.update (a C loop), overall and
+    # per ambiguity reason
+    phrase_counts = Counter()
+    reason_counts = defaultdict(Counter)
+    for text, reason in iter_rows(_AMBIGUOUS_THOUGHTS_SQL, params):
+        phrases = _phrases(_lowered(text))
+        phrase_counts.update(phrases)
+        reason_counts[reason].update(phrases)
+    
+    frequent = {phrase: count for phrase, count in phrase_counts.items() if count >= MIN_OCCURRENCES}
+    
+    # Second pass for examples, touching only frequent phrases: the first
+    # three occurrences of each, in row order. Usually stops after a few rows.
+    phrase_examples = {phrase: [] for phrase in frequent}
+    unfilled = len(frequent)
+    if unfilled:
+        for text, _ in iter_rows(_AMBIGUOUS_THOUGHTS_SQL, params):
+            text = _lowered(text)
+            for phrase in _phrases(text):
+                examples = phrase_examples.get(phrase)
+                if examples is not None and len(examples) < 3:
+                    examples.append(text)
+                    unfilled -= len(examples) == 3
+            if not unfilled:
+                break
+    
+    # Filter to phrases that occur >= MIN_OCCURRENCES
+    patterns = []
+    for phrase, count in frequent.items():
+        # Get most common ambiguity reason
+        most_common_reason, reason_count = max(
+            ((reason, counts[phrase]) for reason, counts in reason_counts.items()),
+            key=lambda item: item[1],
+        )
         
-        # Filter to phrases that occur >= MIN_OCCURRENCES
-        patterns = []
-        for phrase, examples in phrase_examples.items():
-            count = len(examples)
-            if count >= MIN_OCCURRENCES:
-                # Get most common ambiguity reason
-                most_common_reason = phrase_reasons[phrase].most_common(1)[0][0]
-                reason_count = phrase_reasons[phrase][most_common_reason]
-                
-                # Confidence = how often this phrase leads to same ambiguity reason
-                confidence = reason_count / count
-                
-                if confidence >= MIN_CONFIDENCE:
-                    patterns.append({
-                        "pattern_key": f"phrase:{phrase}",
-                        "occurrence_count": count,
-                        "ambiguity_reason": most_common_reason,
-                        "confidence": round(confidence, 3),
-                        "example_texts": examples[:3],  # First 3 examples
-                    })
+        # Confidence = how often this phrase leads to same ambiguity reason
+        confidence = reason_count / count
         
-        # Sort by occurrence count descending
-        patterns.sort(key=lambda x: x["occurrence_count"], reverse=True)
-        logger.info(f"Detected {len(patterns)} recurring ambiguity patterns")
-        return patterns
+        if confidence >= MIN_CONFIDENCE:
+            patterns.append({
+                "pattern_key": f"phrase:{phrase}",
+                "occurrence_count": count,
+                "ambiguity_reason": most_common_reason,
+                "confidence": round(confidence, 3),
+                "example_texts": phrase_examples[phrase],  # First 3 examples
+            })
+    
+    # Sort by occurrence count descending
+    patterns.sort(key=lambda x: x["occurrence_count"], reverse=True)
+    logger.info(f"Detected {len(patterns)} recurring ambiguity patterns")
+    return patterns
+
+
+# raw_text is kept for the examples, so it's lowercased in Python rather than
+# fetched a second time as LOWER(raw_text)
+_LOW_CONFIDENCE_ACTIONABLE_SQL = """
+    SELECT t.raw_text, tk.due_date
+    FROM thoughts t
+    LEFT JOIN tasks tk ON t.linked_task_id = tk.id
+    WHERE t.created_at >= ?
+      AND t.kind = 'actionable'
+      AND t.confidence < 0.8
+"""
 
 
 def detect_extraction_failures(days: int = 30) -> List[Dict]:
@@ -90,30 +150,25 @@ def detect_extraction_failures(days: int = 30) -> List[Dict]:
     """
     patterns = []
     
-    with get_db() as conn:
+    with read_db() as conn:
         # Get thoughts with low confidence in time extraction
         # (These might have time words but failed to parse)
-        rows = conn.execute("""
-            SELECT t.raw_text, t.confidence, tk.due_date
-            FROM thoughts t
-            LEFT JOIN tasks tk ON t.linked_task_id = tk.id
-            WHERE t.created_at >= datetime('now', ? || ' days')
-              AND t.kind = 'actionable'
-              AND t.confidence < 0.8
-        """, (-days,)).fetchall()
+        rows = conn.execute(_LOW_CONFIDENCE_ACTIONABLE_SQL, (_cutoff(days),))
         
         # Look for time-related words that might have failed parsing
-        time_words = ["soon", "later", "weekend", "tonight", "morning", "afternoon", "evening"]
         time_word_failures = Counter()
         time_word_examples = defaultdict(list)
         
-        for row in rows:
-            text = row["raw_text"].lower()
-            for word in time_words:
-                if word in text and not row["due_date"]:
-                    # Time word present but no due date extracted = failure
-                    time_word_failures[word] += 1
-                    time_word_examples[word].append(row["raw_text"])
+        for raw_text, due_date in rows:
+            if due_date:
+                continue
+            # Time word present but no due date extracted = failure
+            # (each word counts once per thought)
+            for word in set(_TIME_WORD_RE.findall(raw_text.lower())):
+                time_word_failures[word] += 1
+                examples = time_word_examples[word]
+                if len(examples) < 3:
+                    examples.append(raw_text)
         
         # Create patterns for words with >= MIN_OCCURRENCES failures
         for word, count in time_word_failures.items():
@@ -123,13 +178,21 @@ def detect_extraction_failures(days: int = 30) -> List[Dict]:
                     "occurrence_count": count,
                     "failure_type": "date_extraction",
                     "confidence": 0.9,  # High confidence that this is a pattern
-                    "example_texts": time_word_examples[word][:3],
+                    "example_texts": time_word_examples[word],
                 })
         
         logger.info(f"Detected {len(patterns)} extraction failure patterns")
         return patterns
 
 
+_SUMMON_CORRECTIONS_SQL = """
+    SELECT confidence, kind
+    FROM thoughts
+    WHERE summon_mode = 1
+      AND created_at >= ?
+"""
+
+
 def detect_user_corrections(days: int = 30) -> List[Dict]:
     """
     Detect patterns in user corrections via /summon or task amendments.
@@ -139,28 +202,23 @@ def detect_user_corrections(days: int = 30) -> List[Dict]:
     """
     patterns = []
     
-    with get_db() as conn:
+    with read_db() as conn:
         # Get thoughts corrected via summon
-        summon_corrections = conn.execute("""
-            SELECT raw_text, confidence, kind
-            FROM thoughts
-            WHERE summon_mode = 1
-              AND created_at >= datetime('now', ? || ' days')
-        """, (-days,)).fetchall()
+        summon_corrections = conn.execute(_SUMMON_CORRECTIONS_SQL, (_cutoff(days),))
         
         # Analyze what gets corrected
         low_confidence_corrected = 0
         high_confidence_corrected = 0
         kind_corrections = Counter()
         
-        for row in summon_corrections:
-            if row["confidence"] and row["confidence"] < 0.5:
+        for confidence, kind in summon_corrections:
+            if confidence and confidence < 0.5:
                 low_confidence_corrected += 1
-            elif row["confidence"] and row["confidence"] >= 0.8:
+            elif confidence and confidence >= 0.8:
                 high_confidence_corrected += 1
             
-            if row["kind"]:
-                kind_corrections[row["kind"]] += 1
+            if kind:
+                kind_corrections[kind] += 1
         
         # Pattern: High confidence items getting corrected = classifier overconfident
         if high_confidence_corrected >= MIN_OCCURRENCES:
@@ -193,6 +251,42 @@ def detect_user_corrections(days: int = 30) -> List[Dict]:
         return patterns
 
 
+# Per-reason clarification outcomes, bucketed in SQL so only reasons that
+# form a pattern come back: 'low' (< 30% resolved) or 'effective' (> 70%
+# resolved, answered within 2 hours on average)
+_CLARIFICATION_PATTERNS_SQL = """
+    SELECT
+        ambiguity_reason,
+        total,
+        resolved,
+        resolved * 1.0 / total AS resolution_rate,
+        avg_resolution_hours,
+        CASE
+            WHEN resolved * 1.0 / total < 0.3 THEN 'low'
+            WHEN resolved * 1.0 / total > 0.7
+                 AND avg_resolution_hours != 0 AND avg_resolution_hours < 2 THEN 'effective'
+        END AS bucket
+    FROM (
+        SELECT 
+            ambiguity_reason,
+            COUNT(*) as total,
+            COUNT(CASE WHEN status = 'clarified' THEN 1 END) as resolved,
+            AVG(
+                CASE 
+                    WHEN status = 'clarified' AND processed_at IS NOT NULL 
+                    THEN (julianday(processed_at) - julianday(created_at)) * 24 
+                END
+            ) as avg_resolution_hours
+        FROM thoughts
+        WHERE kind = 'ambiguous'
+          AND created_at >= ?
+        GROUP BY ambiguity_reason
+        HAVING total >= ?
+    )
+    WHERE bucket IS NOT NULL
+"""
+
+
 def detect_clarification_patterns(days: int = 30) -> List[Dict]:
     """
     Analyze which Butler clarification questions are effective vs. ignored.
@@ -202,62 +296,87 @@ def detect_clarification_patterns(days: int = 30) -> List[Dict]:
     """
     patterns = []
     
-    with get_db() as conn:
-        # Get clarification outcomes by ambiguity reason
-        rows = conn.execute("""
-            SELECT 
-                ambiguity_reason,
-                COUNT(*) as total,
-                COUNT(CASE WHEN status = 'clarified' THEN 1 END) as resolved,
-                AVG(
-                    CASE 
-                        WHEN status = 'clarified' AND processed_at IS NOT NULL 
-                        THEN (julianday(processed_at) - julianday(created_at)) * 24 
-                    END
-                ) as avg_resolution_hours
-            FROM thoughts
-            WHERE kind = 'ambiguous'
-              AND created_at >= datetime('now', ? || ' days')
-            GROUP BY ambiguity_reason
-        """, (-days,)).fetchall()
+    with read_db() as conn:
+        rows = conn.execute(_CLARIFICATION_PATTERNS_SQL, (_cutoff(days), MIN_OCCURRENCES))
         
-        for row in rows:
-            total = row["total"]
-            resolved = row["resolved"] or 0
-            resolution_rate = (resolved / total) if total > 0 else 0
+        for reason, total, resolved, resolution_rate, avg_hours, bucket in rows:
+            # Pattern: Low resolution rate = ineffective clarification type
+            if bucket == "low":
+                patterns.append({
+                    "pattern_key": f"clarification:low_response_{reason}",
+                    "occurrence_count": total,
+                    "resolution_rate": round(resolution_rate, 3),
+                    "confidence": 0.9,
+                    "details": {
+                        "message": f"Clarifications for '{reason}' are often ignored",
+                        "recommendation": "Rephrase clarification questions or provide better defaults",
+                    },
+                })
             
-            if total >= MIN_OCCURRENCES:
-                # Pattern: Low resolution rate = ineffective clarification type
-                if resolution_rate < 0.3:
-                    patterns.append({
-                        "pattern_key": f"clarification:low_response_{row['ambiguity_reason']}",
-                        "occurrence_count": total,
-                        "resolution_rate": round(resolution_rate, 3),
-                        "confidence": 0.9,
-                        "details": {
-                            "message": f"Clarifications for '{row['ambiguity_reason']}' are often ignored",
-                            "recommendation": "Rephrase clarification questions or provide better defaults",
-                        },
-                    })
-                
-                # Pattern: High resolution rate + fast response = good clarification
-                elif resolution_rate > 0.7 and row["avg_resolution_hours"] and row["avg_resolution_hours"] < 2:
-                    patterns.append({
-                        "pattern_key": f"clarification:effective_{row['ambiguity_reason']}",
-                        "occurrence_count": total,
-                        "resolution_rate": round(resolution_rate, 3),
-                        "avg_response_hours": round(row["avg_resolution_hours"], 2),
-                        "confidence": 0.95,
-                        "details": {
-                            "message": f"Clarifications for '{row['ambiguity_reason']}' work well",
-                            "recommendation": "Use this clarification style as template for other types",
-                        },
-                    })
+            # Pattern: High resolution rate + fast response = good clarification
+            else:
+                patterns.append({
+                    "pattern_key": f"clarification:effective_{reason}",
+                    "occurrence_count": total,
+                    "resolution_rate": round(resolution_rate, 3),
+                    "avg_response_hours": round(avg_hours, 2),
+                    "confidence": 0.95,
+                    "details": {
+                        "message": f"Clarifications for '{reason}' work well",
+                        "recommendation": "Use this clarification style as template for other types",
+                    },
+                })
         
         logger.info(f"Detected {len(patterns)} clarification effectiveness patterns")
         return patterns
 
 
+# Per component, the best and worst model (by error rate, then average
+# confidence) among those used >= 10 times, returned only when their error
+# rates are more than 10 points apart. Ties go to the alphabetically first
+# model for best and the last for worst.
+_MODEL_PERFORMANCE_SQL = """
+    WITH models AS (
+        SELECT 
+            model_used,
+            component,
+            COUNT(*) as usage_count,
+            SUM(CASE WHEN error IS NOT NULL THEN 1 ELSE 0 END) * 1.0 / COUNT(*) as error_rate,
+            AVG(confidence) as avg_confidence
+        FROM execution_logs
+        WHERE timestamp >= ?
+          AND model_used IS NOT NULL
+        GROUP BY model_used, component
+        HAVING usage_count >= 10
+    ),
+    ranked AS (
+        SELECT
+            *,
+            ROW_NUMBER() OVER (
+                PARTITION BY component
+                ORDER BY error_rate, avg_confidence DESC, model_used
+            ) AS best_rank,
+            ROW_NUMBER() OVER (
+                PARTITION BY component
+                ORDER BY error_rate DESC, avg_confidence, model_used DESC
+            ) AS worst_rank
+        FROM models
+    )
+    SELECT
+        best.component,
+        best.model_used,
+        worst.model_used,
+        best.usage_count + worst.usage_count,
+        worst.error_rate - best.error_rate
+    FROM ranked AS best
+    JOIN ranked AS worst
+      ON worst.component = best.component AND worst.worst_rank = 1
+    WHERE best.best_rank = 1
+      AND worst.error_rate - best.error_rate > 0.1
+    ORDER BY best.component
+"""
+
+
 def detect_model_performance_patterns(days: int = 7) -> List[Dict]:
     """
     Compare model performance on same task types.
@@ -267,62 +386,59 @@ def detect_model_performance_patterns(days: int = 7) -> List[Dict]:
     """
     patterns = []
     
-    with get_db() as conn:
-        # Get model performance by component/stage
-        rows = conn.execute("""
-            SELECT 
-                model_used,
-                component,
-                COUNT(*) as usage_count,
-                AVG(duration_ms) as avg_duration_ms,
-                AVG(confidence) as avg_confidence,
-                SUM(CASE WHEN error IS NOT NULL THEN 1 ELSE 0 END) as error_count
-            FROM execution_logs
-            WHERE timestamp >= datetime('now', ? || ' days')
-              AND model_used IS NOT NULL
-            GROUP BY model_used, component
-            HAVING usage_count >= 10
-        """, (-days,)).fetchall()
-        
-        # Group by component to compare models
-        by_component = defaultdict(list)
-        for row in rows:
-            by_component[row["component"]].append(dict(row))
+    with read_db() as conn:
+        rows = conn.execute(_MODEL_PERFORMANCE_SQL, (_cutoff(days),))
         
-        # Compare models within same component
-        for component, models in by_component.items():
-            if len(models) >= 2:
-                # Sort by error rate then avg_confidence
-                models.sort(key=lambda m: (
-                    m["error_count"] / m["usage_count"],
-                    -m["avg_confidence"]
-                ))
-                
-                best = models[0]
-                worst = models[-1]
-                
-                # Pattern: Clear performance difference
-                best_error_rate = best["error_count"] / best["usage_count"]
-                worst_error_rate = worst["error_count"] / worst["usage_count"]
-                
-                if worst_error_rate - best_error_rate > 0.1:  # 10%+ difference
-                    patterns.append({
-                        "pattern_key": f"model_perf:{component}:{best['model_used']}_better",
-                        "occurrence_count": best["usage_count"] + worst["usage_count"],
-                        "confidence": 0.85,
-                        "details": {
-                            "component": component,
-                            "better_model": best["model_used"],
-                            "worse_model": worst["model_used"],
-                            "error_rate_diff": round(worst_error_rate - best_error_rate, 3),
-                            "recommendation": f"Prefer {best['model_used']} for {component} tasks",
-                        },
-                    })
+        # Pattern: Clear performance difference (10%+) within a component
+        for component, best_model, worst_model, usage_count, error_rate_diff in rows:
+            patterns.append({
+                "pattern_key": f"model_perf:{component}:{best_model}_better",
+                "occurrence_count": usage_count,
+                "confidence": 0.85,
+                "details": {
+                    "component": component,
+                    "better_model": best_model,
+                    "worse_model": worst_model,
+                    "error_rate_diff": round(error_rate_diff, 3),
+                    "recommendation": f"Prefer {best_model} for {component} tasks",
+                },
+            })
         
         logger.info(f"Detected {len(patterns)} model performance patterns")
         return patterns
 
 
+# A re-detected pattern adds to its running count and refreshes
+# last_seen/context/confidence
+_UPSERT_PATTERN_SQL = """
+    INSERT INTO detected_patterns
+    (pattern_type, pattern_key, occurrence_count, confidence, context)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(pattern_type, pattern_key) DO UPDATE SET
+        occurrence_count = occurrence_count + excluded.occurrence_count,
+        last_seen = CURRENT_TIMESTAMP,
+        context = excluded.context,
+        confidence = excluded.confidence
+"""
+
+_PATTERN_ID_SQL = """
+    SELECT id FROM detected_patterns WHERE pattern_type = ? AND pattern_key = ?
+"""
+
+_SET_PATTERN_STATUS_SQL = "UPDATE detected_patterns SET status = ? WHERE id = ?"
+
+# Walks idx_patterns_status backwards from the top of the pending range
+_PROMOTABLE_PATTERNS_SQL = """
+    SELECT *
+    FROM detected_patterns
+    WHERE occurrence_count >= ?
+      AND confidence >= ?
+      AND status = 'pending'
+    ORDER BY occurrence_count DESC, confidence DESC
+    LIMIT ?
+"""
+
+
 def save_detected_pattern(
     pattern_type: str,
     pattern_key: str,
@@ -336,37 +452,45 @@ def save_detected_pattern(
     Returns:
         Pattern ID
     """
+    params = (pattern_type, pattern_key, occurrence_count, confidence, json.dumps(context))
     with get_db() as conn:
-        # Check if pattern already exists
-        existing = conn.execute("""
-            SELECT id, occurrence_count, first_seen
-            FROM detected_patterns
-            WHERE pattern_type = ? AND pattern_key = ?
-        """, (pattern_type, pattern_key)).fetchone()
-        
-        if existing:
-            # Update existing pattern
-            new_count = existing["occurrence_count"] + occurrence_count
-            conn.execute("""
-                UPDATE detected_patterns
-                SET occurrence_count = ?,
-                    last_seen = CURRENT_TIMESTAMP,
-                    context = ?,
-                    confidence = ?
-                WHERE id = ?
-            """, (new_count, json.dumps(context), confidence, existing["id"]))
-            logger.debug(f"Updated pattern {pattern_key}: {new_count} occurrences")
-            return existing["id"]
+        if SUPPORTS_RETURNING:
+            pattern_id = conn.execute(_UPSERT_PATTERN_SQL + " RETURNING id", params).fetchone()[0]
         else:
-            # Insert new pattern
-            cursor = conn.execute("""
-                INSERT INTO detected_patterns 
-                (pattern_type, pattern_key, occurrence_count, confidence, context)
-                VALUES (?, ?, ?, ?, ?)
-            """, (pattern_type, pattern_key, occurrence_count, confidence, json.dumps(context)))
-            pattern_id = cursor.lastrowid
-            logger.info(f"Created new pattern {pattern_key}: {occurrence_count} occurrences")
-            return pattern_id
+            # lastrowid isn't set when the upsert updates an existing row
+            conn.execute(_UPSERT_PATTERN_SQL, params)
+            pattern_id = conn.execute(_PATTERN_ID_SQL, (pattern_type, pattern_key)).fetchone()[0]
+    logger.debug(f"Saved pattern {pattern_key}: +{occurrence_count} occurrences")
+    return pattern_id
+
+
+def save_detected_patterns(patterns_by_type: Dict[str, List[Dict]]) -> int:
+    """
+    Save or update every detected pattern with one executemany, in one
+    transaction.
+    
+    Args:
+        patterns_by_type: pattern_type -> detector output (as returned by
+            run_all_pattern_detection)
+    
+    Returns:
+        Number of patterns written
+    """
+    rows = [
+        (
+            pattern_type,
+            pattern["pattern_key"],
+            pattern["occurrence_count"],
+            pattern.get("confidence", 0.8),
+            json.dumps(pattern),
+        )
+        for pattern_type, patterns in patterns_by_type.items()
+        for pattern in patterns
+    ]
+    if rows:
+        with get_db(immediate=True) as conn:
+            conn.executemany(_UPSERT_PATTERN_SQL, rows)
+    return len(rows)
 
 
 def get_promotable_patterns(limit: int = 10) -> List[DetectedPattern]:
@@ -381,40 +505,39 @@ def get_promotable_patterns(limit: int = 10) -> List[DetectedPattern]:
     Returns:
         List of DetectedPattern objects
     """
-    with get_db() as conn:
-        rows = conn.execute("""
-            SELECT *
-            FROM detected_patterns
-            WHERE occurrence_count >= ?
-              AND confidence >= ?
-              AND status = 'pending'
-            ORDER BY occurrence_count DESC, confidence DESC
-            LIMIT ?
-        """, (MIN_OCCURRENCES, MIN_CONFIDENCE, limit)).fetchall()
+    with read_db() as conn:
+        rows = conn.execute(
+            _PROMOTABLE_PATTERNS_SQL, (MIN_OCCURRENCES, MIN_CONFIDENCE, limit)
+        ).fetchall()
         
         return [DetectedPattern.from_row(row) for row in rows]
 
 
+def update_pattern_statuses(updates: Iterable[Tuple[int, str]]):
+    """
+    Set the status of many patterns in one transaction.
+    
+    Args:
+        updates: (pattern_id, status) pairs, status being 'pending',
+            'promoted_to_insight' or 'dismissed'
+    """
+    with get_db() as conn:
+        conn.executemany(
+            _SET_PATTERN_STATUS_SQL,
+            ((status, pattern_id) for pattern_id, status in updates),
+        )
+
+
 def mark_pattern_promoted(pattern_id: int):
     """Mark a pattern as promoted to insight."""
-    with get_db() as conn:
-        conn.execute("""
-            UPDATE detected_patterns
-            SET status = 'promoted_to_insight'
-            WHERE id = ?
-        """, (pattern_id,))
-        logger.debug(f"Marked pattern {pattern_id} as promoted")
+    update_pattern_statuses([(pattern_id, "promoted_to_insight")])
+    logger.debug(f"Marked pattern {pattern_id} as promoted")
 
 
 def dismiss_pattern(pattern_id: int):
     """Dismiss a pattern (user decided it's not useful)."""
-    with get_db() as conn:
-        conn.execute("""
-            UPDATE detected_patterns
-            SET status = 'dismissed'
-            WHERE id = ?
-        """, (pattern_id,))
-        logger.debug(f"Dismissed pattern {pattern_id}")
+    update_pattern_statuses([(pattern_id, "dismissed")])
+    logger.debug(f"Dismissed pattern {pattern_id}")
 
 
 def run_all_pattern_detection(days: int = 30) -> Dict[str, List[Dict]]:
@@ -426,26 +549,35 @@ def run_all_pattern_detection(days: int = 30) -> Dict[str, List[Dict]]:
     """
     logger.info(f"Running pattern detection for last {days} days...")
     
-    results = {
-        "ambiguities": detect_recurring_ambiguities(days),
-        "extraction_failures": detect_extraction_failures(days),
-        "user_corrections": detect_user_corrections(days),
-        "clarifications": detect_clarification_patterns(days),
-        "model_performance": detect_model_performance_patterns(min(days, 7)),  # Only 7 days for model perf
+    # No shared snapshot: each detector reads a different slice (ambiguous
+    # text, actionable thoughts + tasks, summon thoughts, per-reason
+    # aggregates from a covering index, execution_logs), and run_log_review
+    # runs detection once per review, so there is nothing to reuse.
+    detectors = {
+        "ambiguities": (detect_recurring_ambiguities, days),
+        "extraction_failures": (detect_extraction_failures, days),
+        "user_corrections": (detect_user_corrections, days),
+        "clarifications": (detect_clarification_patterns, days),
+        "model_performance": (detect_model_performance_patterns, min(days, 7)),  # Only 7 days for model perf
     }
     
-    # Save all detected patterns
-    total_saved = 0
-    for pattern_type, patterns in results.items():
-        for pattern in patterns:
-            save_detected_pattern(
-                pattern_type=pattern_type,
-                pattern_key=pattern["pattern_key"],
-                occurrence_count=pattern["occurrence_count"],
-                confidence=pattern.get("confidence", 0.8),
-                context=pattern
-            )
-            total_saved += 1
+    if in_transaction():
+        # Worker threads use their own connections and couldn't see this
+        # thread's uncommitted writes
+        results = {key: detect(period) for key, (detect, period) in detectors.items()}
+    else:
+        # The detectors are independent reads; under WAL each worker's pooled
+        # connection reads concurrently and sqlite3 releases the GIL while a
+        # query runs, so their waits overlap
+        with ThreadPoolExecutor(max_workers=len(detectors)) as executor:
+            futures = {
+                key: executor.submit(detect, period)
+                for key, (detect, period) in detectors.items()
+            }
+            results = {key: future.result() for key, future in futures.items()}
+    
+    # Save all detected patterns in one transaction
+    total_saved = save_detected_patterns(results)
     
     logger.info(f"Pattern detection complete: saved {total_saved} patterns")
     return results
@@ -6,7 +6,7 @@ Uses prompt_service for editable/versioned prompts.
 import logging
 from typing import Optional, List
 
-from ..db import get_db
+from ..db import get_db, read_db
 from ..models import Project
 from ..services import project_service, task_service
 from ..services.prompt_service import render_prompt
@@ -15,6 +15,33 @@ from ..logging.execution_logger import ExecutionLogger  # v0.7.0
 
 logger = logging.getLogger(__name__)
 
+_SAVE_SUGGESTION_SQL = """
+    UPDATE projects
+    SET next_action_suggestion = ?,
+        suggestion_generated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+_CLEAR_SUGGESTION_SQL = """
+    UPDATE projects
+    SET next_action_suggestion = NULL,
+        suggestion_generated_at = NULL
+    WHERE id = ?
+"""
+
+_PROJECT_SUGGESTION_SQL = "SELECT next_action_suggestion FROM projects WHERE id = ?"
+
+# In-progress projects never analyzed, or analyzed over a week ago
+_PROJECTS_NEEDING_ANALYSIS_SQL = """
+    SELECT id
+    FROM projects
+    WHERE status = 'in_progress'
+      AND (next_action_suggestion IS NULL
+           OR suggestion_generated_at < datetime('now', '-7 days'))
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
 
 def analyze_project_for_next_action(project: Project) -> Optional[str]:
     """
@@ -83,12 +110,7 @@ def analyze_project_for_next_action(project: Project) -> Optional[str]:
 def save_project_suggestion(project_id: int, suggestion: str):
     """Save a next action suggestion to the project record."""
     with get_db() as conn:
-        conn.execute("""
-            UPDATE projects
-            SET next_action_suggestion = ?,
-                suggestion_generated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (suggestion, project_id))
+        conn.execute(_SAVE_SUGGESTION_SQL, (suggestion, project_id))
     
     logger.debug(f"Saved suggestion for project {project_id}")
 
@@ -96,15 +118,7 @@ def save_project_suggestion(project_id: int, suggestion: str):
 def get_projects_needing_analysis(limit: int = 5) -> List[Project]:
     """Get projects that haven't been analyzed yet or need re-analysis."""
     with get_db() as conn:
-        rows = conn.execute("""
-            SELECT id
-            FROM projects
-            WHERE status = 'in_progress'
-              AND (next_action_suggestion IS NULL
-                   OR suggestion_generated_at < datetime('now', '-7 days'))
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,)).fetchall()
+        rows = conn.execute(_PROJECTS_NEEDING_ANALYSIS_SQL, (limit,)).fetchall()
         
         return [project_service.get_project(row["id"]) for row in rows]
 
@@ -122,12 +136,8 @@ def analyze_and_save(project: Project) -> bool:
 
 def get_project_suggestion(project_id: int) -> Optional[str]:
     """Get the next action suggestion for a project."""
-    with get_db() as conn:
-        row = conn.execute("""
-            SELECT next_action_suggestion
-            FROM projects
-            WHERE id = ?
-        """, (project_id,)).fetchone()
+    with read_db() as conn:
+        row = conn.execute(_PROJECT_SUGGESTION_SQL, (project_id,)).fetchone()
         
         if row:
             return row["next_action_suggestion"]
@@ -137,9 +147,4 @@ def get_project_suggestion(project_id: int) -> Optional[str]:
 def clear_project_suggestion(project_id: int):
     """Clear the suggestion for a project (e.g., to re-analyze)."""
     with get_db() as conn:
-        conn.execute("""
-            UPDATE projects
-            SET next_action_suggestion = NULL,
-                suggestion_generated_at = NULL
-            WHERE id = ?
-        """, (project_id,))
+        conn.execute(_CLEAR_SUGGESTION_SQL, (project_id,))
@@ -43,6 +43,35 @@ class WorkItem:
     error_message: Optional[str]
 
 
+# Pending items whose dependency (if any) has completed
+_READY_ITEMS_SQL = """
+    SELECT q.*
+    FROM slow_work_queue q
+    WHERE q.status = 'pending'
+      AND (q.depends_on_id IS NULL 
+           OR EXISTS (
+               SELECT 1 FROM slow_work_queue dep 
+               WHERE dep.id = q.depends_on_id 
+               AND dep.status = 'completed'
+           ))
+"""
+
+
+def _row_to_item(row) -> WorkItem:
+    return WorkItem(
+        id=row["id"],
+        work_type=row["work_type"],
+        target_id=row["target_id"],
+        depends_on_id=row["depends_on_id"],
+        status=row["status"],
+        result=row["result"],
+        queued_at=row["queued_at"],
+        started_at=row["started_at"],
+        completed_at=row["completed_at"],
+        error_message=row["error_message"],
+    )
+
+
 class SlowWorkQueue:
     """
     Manages the slow work queue.
@@ -93,35 +122,29 @@ class SlowWorkQueue:
         - Ordered by queue time
         """
         with get_db() as conn:
-            row = conn.execute("""
-                SELECT q.*
-                FROM slow_work_queue q
-                WHERE q.status = 'pending'
-                  AND (q.depends_on_id IS NULL 
-                       OR EXISTS (
-                           SELECT 1 FROM slow_work_queue dep 
-                           WHERE dep.id = q.depends_on_id 
-                           AND dep.status = 'completed'
-                       ))
+            row = conn.execute(_READY_ITEMS_SQL + """
                 ORDER BY q.queued_at ASC
                 LIMIT 1
             """).fetchone()
             
             if row:
-                return WorkItem(
-                    id=row["id"],
-                    work_type=row["work_type"],
-                    target_id=row["target_id"],
-                    depends_on_id=row["depends_on_id"],
-                    status=row["status"],
-                    result=row["result"],
-                    queued_at=row["queued_at"],
-                    started_at=row["started_at"],
-                    completed_at=row["completed_at"],
-                    error_message=row["error_message"],
-                )
+                return _row_to_item(row)
             return None
     
+    @staticmethod
+    def get_next_items(work_type: str, limit: int) -> List[WorkItem]:
+        """
+        Get up to limit ready items of one work type (same rules as
+        get_next_item), so they can be processed as a batch.
+        """
+        with get_db() as conn:
+            rows = conn.execute(_READY_ITEMS_SQL + """
+                  AND q.work_type = ?
+                ORDER BY q.queued_at ASC
+                LIMIT ?
+            """, (work_type, limit)).fetchall()
+            return [_row_to_item(row) for row in rows]
+    
     @staticmethod
     def mark_processing(item_id: int):
         """Mark an item as being processed."""
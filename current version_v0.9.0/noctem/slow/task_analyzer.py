@@ -3,19 +3,161 @@
 Analyzes tasks to suggest what a computer/automation could help with.
 Uses prompt_service for editable/versioned prompts.
 """
+import hashlib
 import logging
+import re
 from typing import Optional
 from datetime import datetime
 
-from ..db import get_db
+from ..db import get_db, read_db
 from ..models import Task
-from ..services import task_service
 from ..services.prompt_service import render_prompt
 from .ollama import OllamaClient, llm_generate
 from ..logging.execution_logger import ExecutionLogger  # v0.7.0
 
 logger = logging.getLogger(__name__)
 
+# Full rows in one query. NULLS LAST (unlike a CASE expression) lets the planner
+# walk idx_tasks_needs_analysis in order, so LIMIT stops early with no sort.
+_TASKS_NEEDING_ANALYSIS_SQL = """
+    SELECT *
+    FROM tasks
+    WHERE status NOT IN ('done', 'canceled')
+      AND computer_help_suggestion IS NULL
+    ORDER BY due_date ASC NULLS LAST, importance DESC
+    LIMIT ?
+"""
+
+_SAVE_SUGGESTION_SQL = """
+    UPDATE tasks
+    SET computer_help_suggestion = ?,
+        suggestion_generated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+_CLEAR_SUGGESTION_SQL = """
+    UPDATE tasks
+    SET computer_help_suggestion = NULL,
+        suggestion_generated_at = NULL
+    WHERE id = ?
+"""
+
+_TASK_SUGGESTION_SQL = "SELECT computer_help_suggestion FROM tasks WHERE id = ?"
+
+# Cached suggestions older than this are regenerated
+SUGGESTION_CACHE_DAYS = 30
+
+_CACHED_SUGGESTION_SQL = """
+    SELECT suggestion FROM task_suggestion_cache
+    WHERE key = ? AND created_at >= datetime('now', ?)
+"""
+
+_CACHE_SUGGESTION_SQL = """
+    INSERT INTO task_suggestion_cache (key, suggestion) VALUES (?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        suggestion = excluded.suggestion,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+_UNCACHE_SUGGESTION_SQL = "DELETE FROM task_suggestion_cache WHERE key = ?"
+
+_PRUNE_CACHE_SQL = "DELETE FROM task_suggestion_cache WHERE created_at < datetime('now', ?)"
+
+# "1." / "2)" at the very start of a line in a batched reply; indented
+# markers belong to a nested list inside one answer
+_NUMBERED_ITEM_RE = re.compile(r"^(\d+)[.)]\s*", re.MULTILINE)
+
+
+def _task_fields(task: Task) -> dict:
+    """Prompt variables for a task (name, project, due_date, tags)."""
+    project_name = "No project"
+    if task.project_id:
+        from ..services import project_service
+        project = project_service.get_project(task.project_id)
+        if project:
+            project_name = project.name
+    
+    due_str = str(task.due_date) if task.due_date else "No due date"
+    if task.due_time:
+        due_str += f" at {task.due_time}"
+    
+    return {
+        "name": task.name,
+        "project": project_name,
+        "due_date": due_str,
+        "tags": ", ".join(task.tags) if task.tags else "None",
+    }
+
+
+def _batch_item(number: int, fields: dict) -> str:
+    """One numbered line of the task_analyzer_batch_user task list."""
+    return (
+        f"{number}. {fields['name']} (project: {fields['project']}; "
+        f"due: {fields['due_date']}; tags: {fields['tags']})"
+    )
+
+
+def _cache_key(system_prompt: Optional[str], user_prompt: Optional[str]) -> str:
+    """
+    Key for an LLM request. Hashing the rendered prompts (rather than task
+    fields) means prompt edits and project renames miss the cache.
+    """
+    text = f"{system_prompt}\0{user_prompt}"
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _batch_cache_key(system_prompt: Optional[str], fields: dict) -> str:
+    """
+    Key for a task answered in a batch: the batch prompt listing just that
+    task, so editing the batch template misses the cache too.
+    """
+    return _cache_key(
+        system_prompt,
+        render_prompt("task_analyzer_batch_user", {"task_list": _batch_item(1, fields)}),
+    )
+
+
+def _task_cache_keys(task: Task) -> tuple[str, str]:
+    """The single-task and batch cache keys for a task."""
+    system_prompt = render_prompt("task_analyzer_system")
+    fields = _task_fields(task)
+    return (
+        _cache_key(system_prompt, render_prompt("task_analyzer_user", fields)),
+        _batch_cache_key(system_prompt, fields),
+    )
+
+
+def _cached_suggestion(key: str) -> Optional[str]:
+    """A suggestion generated for the same prompts within SUGGESTION_CACHE_DAYS."""
+    with read_db() as conn:
+        row = conn.execute(
+            _CACHED_SUGGESTION_SQL, (key, f"-{SUGGESTION_CACHE_DAYS} days")
+        ).fetchone()
+    return row[0] if row else None
+
+
+def _cache_suggestions(suggestions: dict[str, str]):
+    """Remember suggestions (cache key -> suggestion) and drop expired ones."""
+    with get_db() as conn:
+        conn.executemany(_CACHE_SUGGESTION_SQL, suggestions.items())
+        conn.execute(_PRUNE_CACHE_SQL, (f"-{SUGGESTION_CACHE_DAYS} days",))
+
+
+def _split_numbered(reply: str, count: int) -> Optional[list[Optional[str]]]:
+    """
+    Split a numbered reply into one answer per item.
+    
+    Only unindented markers count, and they must run 1, 2, ... count exactly;
+    otherwise the answers can't be matched to items safely and None is
+    returned. Items left empty are None. Text before "1." is ignored.
+    """
+    pieces = _NUMBERED_ITEM_RE.split(reply)
+    # pieces = [preamble, number, text, number, text, ...]
+    numbers = [int(number) for number in pieces[1::2]]
+    if numbers != list(range(1, count + 1)):
+        return None
+    return [text.strip() or None for text in pieces[2::2]]
+
 
 def analyze_task_for_computer_help(task: Task) -> Optional[str]:
     """
@@ -32,44 +174,34 @@ def analyze_task_for_computer_help(task: Task) -> Optional[str]:
         trace.log_stage("input", input_data={"task_id": task.id, "task_name": task.name})
         trace.set_task_id(task.id)
         
-        # Get project name if task has a project
-        project_name = "No project"
-        project_id = None
         if task.project_id:
-            project_id = task.project_id
-            trace.set_thought_id(project_id)  # Link trace to project
-            from ..services import project_service
-            project = project_service.get_project(task.project_id)
-            if project:
-                project_name = project.name
-        
-        # Format tags
-        tags_str = ", ".join(task.tags) if task.tags else "None"
-        
-        # Format due date
-        due_str = str(task.due_date) if task.due_date else "No due date"
-        if task.due_time:
-            due_str += f" at {task.due_time}"
+            trace.set_thought_id(task.project_id)  # Link trace to project
+        fields = _task_fields(task)
         
         trace.log_stage("prepare", output_data={
-            "project_name": project_name,
-            "tags": tags_str,
-            "due_date": due_str,
+            "project_name": fields["project"],
+            "tags": fields["tags"],
+            "due_date": fields["due_date"],
         })
         
         # Use prompt service for editable prompts
         system_prompt = render_prompt("task_analyzer_system")
-        user_prompt = render_prompt("task_analyzer_user", {
-            "name": task.name,
-            "project": project_name,
-            "due_date": due_str,
-            "tags": tags_str,
-        })
+        user_prompt = render_prompt("task_analyzer_user", fields)
+        
+        key = _cache_key(system_prompt, user_prompt)
+        suggestion = _cached_suggestion(key)
+        if suggestion:
+            logger.info(f"Reused cached computer help suggestion for task {task.id}")
+            trace.complete(output_data={
+                "suggestion_length": len(suggestion), "success": True, "cached": True,
+            })
+            return suggestion
         
         trace.log_stage("generate", model_used="default")
         suggestion = llm_generate(user_prompt, system=system_prompt)
         
         if suggestion:
+            _cache_suggestions({key: suggestion})
             logger.info(f"Generated computer help suggestion for task {task.id}")
             trace.complete(output_data={"suggestion_length": len(suggestion), "success": True})
         else:
@@ -79,56 +211,128 @@ def analyze_task_for_computer_help(task: Task) -> Optional[str]:
         return suggestion
 
 
+def analyze_tasks_for_computer_help(tasks: list[Task]) -> list[Optional[str]]:
+    """
+    Analyze several tasks with one LLM request.
+    
+    The shared system prompt is sent once and the tasks are listed as a
+    numbered user prompt; the reply is split back into one suggestion per task.
+    If its numbering doesn't match the tasks, each is sent on its own instead.
+    
+    Args:
+        tasks: The tasks to analyze
+        
+    Returns:
+        Suggestions in the same order as tasks (None where the reply had none)
+    """
+    if len(tasks) <= 1:
+        return [analyze_task_for_computer_help(task) for task in tasks]
+    
+    # Tasks answered recently, alone or in a batch, skip the request
+    system_prompt = render_prompt("task_analyzer_system")
+    all_fields = [_task_fields(task) for task in tasks]
+    keys = [_batch_cache_key(system_prompt, fields) for fields in all_fields]
+    suggestions = [
+        _cached_suggestion(_cache_key(system_prompt, render_prompt("task_analyzer_user", fields)))
+        or _cached_suggestion(key)
+        for fields, key in zip(all_fields, keys)
+    ]
+    misses = [i for i, suggestion in enumerate(suggestions) if not suggestion]
+    if len(misses) <= 1:
+        for i in misses:
+            suggestions[i] = analyze_task_for_computer_help(tasks[i])
+        return suggestions
+    
+    with ExecutionLogger(component="slow", source="task_analysis") as trace:
+        trace.log_stage("input", input_data={"task_ids": [tasks[i].id for i in misses]})
+        
+        task_list = "\n".join(
+            _batch_item(n, all_fields[i]) for n, i in enumerate(misses, start=1)
+        )
+        user_prompt = render_prompt("task_analyzer_batch_user", {"task_list": task_list})
+        
+        trace.log_stage("generate", model_used="default")
+        reply = llm_generate(user_prompt, system=system_prompt)
+        
+        if not reply:
+            logger.warning(f"Failed to generate suggestions for {len(misses)} tasks")
+            trace.log_error("LLM generation returned empty/None")
+            return suggestions
+        
+        answers = _split_numbered(reply, len(misses))
+        if answers is not None:
+            fresh = {}
+            for i, answer in zip(misses, answers):
+                if answer:
+                    suggestions[i] = fresh[keys[i]] = answer
+            if fresh:
+                _cache_suggestions(fresh)
+            logger.info(f"Generated computer help suggestions for {len(fresh)}/{len(misses)} tasks")
+            trace.complete(output_data={"answered": len(fresh), "success": bool(fresh)})
+            return suggestions
+        
+        logger.warning(f"Reply didn't number {len(misses)} answers in order; asking per task")
+        trace.log_error("Batched reply could not be matched to tasks")
+    
+    for i in misses:
+        suggestions[i] = analyze_task_for_computer_help(tasks[i])
+    return suggestions
+
+
 def save_task_suggestion(task_id: int, suggestion: str):
     """Save a computer help suggestion to the task record."""
     with get_db() as conn:
-        conn.execute("""
-            UPDATE tasks
-            SET computer_help_suggestion = ?,
-                suggestion_generated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (suggestion, task_id))
+        conn.execute(_SAVE_SUGGESTION_SQL, (suggestion, task_id))
     
     logger.debug(f"Saved suggestion for task {task_id}")
 
 
+def save_task_suggestions(suggestions: dict[int, str]):
+    """Save several suggestions (task_id -> suggestion) in one transaction."""
+    with get_db() as conn:
+        conn.executemany(
+            _SAVE_SUGGESTION_SQL,
+            [(suggestion, task_id) for task_id, suggestion in suggestions.items()],
+        )
+    
+    logger.debug(f"Saved suggestions for {len(suggestions)} tasks")
+
+
 def get_tasks_needing_analysis(limit: int = 10) -> list:
     """Get tasks that haven't been analyzed yet."""
-    with get_db() as conn:
-        rows = conn.execute("""
-            SELECT id, name, project_id, due_date, due_time, tags
-            FROM tasks
-            WHERE status NOT IN ('done', 'canceled')
-              AND computer_help_suggestion IS NULL
-            ORDER BY 
-                CASE WHEN due_date IS NOT NULL THEN 0 ELSE 1 END,
-                due_date ASC,
-                importance DESC
-            LIMIT ?
-        """, (limit,)).fetchall()
+    with read_db() as conn:
+        rows = conn.execute(_TASKS_NEEDING_ANALYSIS_SQL, (limit,)).fetchall()
         
-        return [task_service.get_task(row["id"]) for row in rows]
+        return [Task.from_row(row) for row in rows]
+
+
+def analyze_and_save_batch(tasks: list[Task], batch_size: int = 8) -> list[bool]:
+    """
+    Analyze tasks batch_size at a time and save the suggestions.
+    
+    Returns:
+        Whether each task (in order) got a suggestion saved
+    """
+    results = []
+    for start in range(0, len(tasks), batch_size):
+        batch = tasks[start:start + batch_size]
+        suggestions = analyze_tasks_for_computer_help(batch)
+        found = {task.id: s for task, s in zip(batch, suggestions) if s}
+        if found:
+            save_task_suggestions(found)
+        results.extend(task.id in found for task in batch)
+    return results
 
 
 def analyze_and_save(task: Task) -> bool:
     """Analyze a task and save the suggestion. Returns True if successful."""
-    suggestion = analyze_task_for_computer_help(task)
-    
-    if suggestion:
-        save_task_suggestion(task.id, suggestion)
-        return True
-    
-    return False
+    return analyze_and_save_batch([task], batch_size=1)[0]
 
 
 def get_task_suggestion(task_id: int) -> Optional[str]:
     """Get the computer help suggestion for a task."""
-    with get_db() as conn:
-        row = conn.execute("""
-            SELECT computer_help_suggestion
-            FROM tasks
-            WHERE id = ?
-        """, (task_id,)).fetchone()
+    with read_db() as conn:
+        row = conn.execute(_TASK_SUGGESTION_SQL, (task_id,)).fetchone()
         
         if row:
             return row["computer_help_suggestion"]
@@ -136,11 +340,11 @@ def get_task_suggestion(task_id: int) -> Optional[str]:
 
 
 def clear_task_suggestion(task_id: int):
-    """Clear the suggestion for a task (e.g., to re-analyze)."""
+    """Clear the suggestion for a task (e.g., to re-analyze), including its cached copies."""
+    from ..services import task_service
+    task = task_service.get_task(task_id)
+    keys = _task_cache_keys(task) if task else ()
+    
     with get_db() as conn:
-        conn.execute("""
-            UPDATE tasks
-            SET computer_help_suggestion = NULL,
-                suggestion_generated_at = NULL
-            WHERE id = ?
-        """, (task_id,))
+        conn.execute(_CLEAR_SUGGESTION_SQL, (task_id,))
+        conn.executemany(_UNCACHE_SUGGESTION_SQL, [(key,) for key in keys])
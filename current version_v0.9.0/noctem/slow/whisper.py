@@ -4,6 +4,9 @@ Uses faster-whisper with CTranslate2 backend for efficient local inference.
 """
 import os
 import logging
+import tempfile
+import threading
+import wave
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -15,6 +18,13 @@ logger = logging.getLogger(__name__)
 DEFAULT_MODEL = "tiny"
 DEFAULT_DEVICE = "cpu"
 DEFAULT_COMPUTE_TYPE = "int8"  # Quantized for CPU efficiency
+DEFAULT_CPU_THREADS = os.cpu_count() or 4
+DEFAULT_NUM_WORKERS = 2  # Lets a transcription overlap with warmup/preload
+WARMUP_SAMPLE_RATE = 16000  # Whisper's native rate
+# Greedy decoding: journals are short, and each extra beam is a full decoder pass
+DEFAULT_BEAM_SIZE = 1
+ACCURATE_BEAM_SIZE = 5
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
 
 
 class WhisperService:
@@ -25,30 +35,38 @@ class WhisperService:
         model_size: str = DEFAULT_MODEL,
         device: str = DEFAULT_DEVICE,
         compute_type: str = DEFAULT_COMPUTE_TYPE,
+        beam_size: int = DEFAULT_BEAM_SIZE,
     ):
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
+        self.beam_size = beam_size
         self._model = None
+        self._load_lock = threading.Lock()
     
     def _ensure_model(self):
-        """Lazy-load the model on first use."""
+        """Lazy-load the model on first use (once, even if preload races a transcribe)."""
         if self._model is None:
-            from faster_whisper import WhisperModel
-            
-            logger.info(f"Loading Whisper model: {self.model_size} on {self.device}")
-            self._model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=self.compute_type,
-            )
-            logger.info("Whisper model loaded successfully")
+            with self._load_lock:
+                if self._model is None:
+                    from faster_whisper import WhisperModel
+                    
+                    logger.info(f"Loading Whisper model: {self.model_size} on {self.device}")
+                    self._model = WhisperModel(
+                        self.model_size,
+                        device=self.device,
+                        compute_type=self.compute_type,
+                        cpu_threads=DEFAULT_CPU_THREADS,
+                        num_workers=DEFAULT_NUM_WORKERS,
+                    )
+                    logger.info("Whisper model loaded successfully")
         return self._model
     
     def transcribe(
         self,
         audio_path: str,
         language: Optional[str] = None,
+        accurate: bool = False,
     ) -> Tuple[str, dict]:
         """
         Transcribe an audio file to text.
@@ -56,6 +74,7 @@ class WhisperService:
         Args:
             audio_path: Path to audio file (mp3, wav, ogg, etc.)
             language: Optional language code (e.g., 'en'). Auto-detected if None.
+            accurate: Use a wider beam search for on-demand high-fidelity jobs.
             
         Returns:
             Tuple of (transcription_text, metadata_dict)
@@ -64,30 +83,30 @@ class WhisperService:
         
         logger.info(f"Transcribing: {audio_path}")
         
+        beam_size = ACCURATE_BEAM_SIZE if accurate else self.beam_size
         segments, info = model.transcribe(
             audio_path,
             language=language,
-            beam_size=5,
+            beam_size=beam_size,
+            best_of=beam_size,
+            temperature=0.0,
+            condition_on_previous_text=False,
             vad_filter=True,  # Filter out silence
+            vad_parameters=VAD_PARAMETERS,
         )
         
-        # Collect all segments into full text
-        text_parts = []
-        for segment in segments:
-            text_parts.append(segment.text.strip())
+        # Segments decode lazily; join them as they arrive. Segment text keeps
+        # Whisper's leading space, and blank segments would leave double spaces.
+        full_text = " ".join(filter(None, (segment.text.strip() for segment in segments)))
         
-        full_text = " ".join(text_parts)
+        logger.info(f"Transcription complete: {len(full_text)} chars, {info.duration:.1f}s audio")
         
-        metadata = {
+        return full_text, {
             "language": info.language,
             "language_probability": info.language_probability,
             "duration": info.duration,
             "model": self.model_size,
         }
-        
-        logger.info(f"Transcription complete: {len(full_text)} chars, {info.duration:.1f}s audio")
-        
-        return full_text, metadata
     
     def is_ready(self) -> bool:
         """Check if the service can be initialized."""
@@ -97,13 +116,33 @@ class WhisperService:
         except ImportError:
             return False
     
+    def warmup(self):
+        """
+        Run one transcription of a second of silence so CTranslate2 picks its
+        CPU kernels and allocates buffers before the first real voice journal.
+        """
+        model = self._ensure_model()
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        try:
+            with os.fdopen(fd, "wb") as f, wave.open(f, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(WARMUP_SAMPLE_RATE)
+                wav.writeframes(b"\x00\x00" * WARMUP_SAMPLE_RATE)
+            segments, _ = model.transcribe(path, language="en", beam_size=1)
+            for _ in segments:  # Segments are lazy; decoding happens here
+                pass
+        finally:
+            os.unlink(path)
+    
     def preload(self) -> bool:
         """
-        Pre-download and cache the model.
+        Pre-download, load and warm up the model.
         Returns True if successful.
         """
         try:
             self._ensure_model()
+            self.warmup()
             return True
         except Exception as e:
             logger.error(f"Failed to preload Whisper model: {e}")
@@ -122,7 +161,11 @@ def get_whisper_service() -> WhisperService:
     return _whisper_service
 
 
-def transcribe_audio(audio_path: str, language: Optional[str] = None) -> Tuple[str, dict]:
+def transcribe_audio(
+    audio_path: str,
+    language: Optional[str] = None,
+    accurate: bool = False,
+) -> Tuple[str, dict]:
     """Convenience function to transcribe audio."""
     service = get_whisper_service()
-    return service.transcribe(audio_path, language)
+    return service.transcribe(audio_path, language, accurate=accurate)
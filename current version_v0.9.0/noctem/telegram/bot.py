@@ -2,6 +2,7 @@
 Telegram bot setup and initialization.
 """
 import logging
+import threading
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
@@ -11,6 +12,15 @@ from . import handlers
 logger = logging.getLogger(__name__)
 
 
+def _preload_whisper():
+    """Load and warm the Whisper model off the startup path, if it is installed."""
+    from ..slow.whisper import get_whisper_service
+    
+    service = get_whisper_service()
+    if service.is_ready():
+        threading.Thread(target=service.preload, name="whisper-preload", daemon=True).start()
+
+
 def create_bot() -> Application:
     """Create and configure the Telegram bot application."""
     token = Config.telegram_token()
@@ -48,6 +58,9 @@ def create_bot() -> Application:
     # Voice message handler for voice journals
     app.add_handler(MessageHandler(filters.VOICE, handlers.handle_voice))
     
+    # Keep the first voice journal from paying the model load
+    _preload_whisper()
+    
     logger.info("Telegram bot configured")
     return app
 
@@ -6,8 +6,12 @@ from typing import Optional
 from ..models import Task
 
 
-def format_task(task: Task, index: Optional[int] = None) -> str:
-    """Format a single task for display."""
+_DUE_DATE_FORMAT = "%b %d"
+_DUE_TIME_FORMAT = "%H:%M"
+
+
+def format_task(task: Task, index: Optional[int] = None, today: Optional[date] = None) -> str:
+    """Format a single task for display (pass today when formatting many)."""
     parts = []
     
     if index is not None:
@@ -19,13 +23,13 @@ def format_task(task: Task, index: Optional[int] = None) -> str:
     parts.append(task.name)
     
     if task.due_date:
-        if task.due_date == date.today():
+        if task.due_date == (today or date.today()):
             parts.append("(today)")
         else:
-            parts.append(f"(due {task.due_date.strftime('%b %d')})")
+            parts.append(f"(due {task.due_date.strftime(_DUE_DATE_FORMAT)})")
     
     if task.due_time:
-        parts.append(f"at {task.due_time.strftime('%H:%M')}")
+        parts.append(f"at {task.due_time.strftime(_DUE_TIME_FORMAT)}")
     
     return " ".join(parts)
 
@@ -35,16 +39,16 @@ def format_task_list(tasks: list[Task], title: str = "Tasks") -> str:
     if not tasks:
         return f"No {title.lower()}"
     
-    lines = [f"**{title}**"]
-    for i, task in enumerate(tasks, 1):
-        lines.append(format_task(task, i))
-    
-    return "\n".join(lines)
+    today = date.today()
+    return f"**{title}**\n" + "\n".join(
+        format_task(task, i, today=today) for i, task in enumerate(tasks, 1)
+    )
+
+
+# Backslash-escape table for Telegram Markdown special characters
+_MD_ESCAPE = str.maketrans({char: f'\\{char}' for char in '_*[]()~`>#+-=|{}.!'})
 
 
 def escape_markdown(text: str) -> str:
     """Escape special characters for Telegram Markdown."""
-    special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-    for char in special_chars:
-        text = text.replace(char, f'\\{char}')
-    return text
+    return text.translate(_MD_ESCAPE)
@@ -6,6 +6,7 @@ catching issues like missing packages, import errors, and configuration problems
 that could prevent the application from starting.
 """
 import pytest
+import sqlite3
 import sys
 import tempfile
 from pathlib import Path
@@ -173,6 +174,142 @@ class TestDatabaseInitialization:
         Config.set("test_list", [1, 2, 3])
         assert Config.get("test_list") == [1, 2, 3]
 
+    def test_get_db_reuses_pooled_connection(self):
+        from noctem.db import init_db, get_db
+        init_db()
+
+        with get_db() as first:
+            pass
+        with get_db() as second:
+            mode = second.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert first is second
+        assert mode == "wal"
+
+    def test_nested_get_db_failure_only_undoes_inner_block(self):
+        from noctem.db import init_db, get_db
+        init_db()
+
+        with get_db() as conn:
+            conn.execute("INSERT INTO config (key, value) VALUES ('outer', '1')")
+            with pytest.raises(RuntimeError):
+                with get_db() as inner:
+                    inner.execute("INSERT INTO config (key, value) VALUES ('inner', '1')")
+                    raise RuntimeError("boom")
+
+        with get_db() as conn:
+            keys = {row[0] for row in conn.execute("SELECT key FROM config")}
+        assert "outer" in keys
+        assert "inner" not in keys
+
+    def test_executescript_refused_in_nested_block(self):
+        from noctem.db import init_db, get_db
+        init_db()
+
+        with get_db() as outer:
+            outer.execute("INSERT INTO config (key, value) VALUES ('kept', '1')")
+            with pytest.raises(sqlite3.ProgrammingError):
+                with get_db() as inner:
+                    inner.executescript("SELECT 1;")
+            assert outer.in_transaction
+
+        with get_db() as conn:
+            assert conn.execute("SELECT value FROM config WHERE key = 'kept'").fetchone()
+
+    def test_immediate_block_takes_write_lock(self):
+        from noctem.db import init_db, get_db, get_connection
+        init_db()
+
+        other = get_connection()
+        other.execute("PRAGMA busy_timeout = 0")
+        try:
+            with get_db(immediate=True) as conn:
+                assert conn.in_transaction
+                with pytest.raises(sqlite3.OperationalError):
+                    other.execute("BEGIN IMMEDIATE")
+        finally:
+            other.close()
+
+    def test_read_db_uses_readonly_connection(self):
+        from noctem.db import init_db, get_db, read_db
+        init_db()
+
+        with get_db() as conn:
+            conn.execute("INSERT INTO config (key, value) VALUES ('seen', '1')")
+        with read_db() as reader:
+            row = reader.execute("SELECT value FROM config WHERE key = 'seen'").fetchone()
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("DELETE FROM config")
+        assert row["value"] == "1"
+
+        with get_db() as conn:
+            with read_db() as nested:
+                assert nested is conn
+
+    def test_partial_iter_rows_does_not_pin_read_snapshot(self):
+        import threading
+        from noctem.db import init_db, get_db, read_db, iter_rows
+        init_db()
+
+        with get_db() as conn:
+            conn.executemany(
+                "INSERT INTO config (key, value) VALUES (?, '1')",
+                [(f"iter{i}",) for i in range(3)],
+            )
+        rows = iter_rows("SELECT key FROM config WHERE key LIKE 'iter%'", batch_size=1)
+        assert next(rows)["key"].startswith("iter")
+
+        def commit_elsewhere():
+            with get_db() as conn:
+                conn.execute("INSERT INTO config (key, value) VALUES ('late', '1')")
+        writer = threading.Thread(target=commit_elsewhere)
+        writer.start()
+        writer.join()
+
+        with read_db() as reader:
+            row = reader.execute("SELECT value FROM config WHERE key = 'late'").fetchone()
+        assert row is not None
+        rows.close()
+
+    def test_iter_rows_reuses_pooled_iterator_connection(self):
+        from noctem import db
+        from noctem.db import init_db, get_db, iter_rows
+        init_db()
+
+        with get_db() as conn:
+            conn.executemany(
+                "INSERT INTO config (key, value) VALUES (?, '1')",
+                [(f"pool{i}",) for i in range(2)],
+            )
+        query = "SELECT key FROM config WHERE key LIKE 'pool%' ORDER BY key"
+        assert [row["key"] for row in iter_rows(query)] == ["pool0", "pool1"]
+        pooled = db._local.iterator[0]
+
+        # A second iterator opened mid-way gets its own connection
+        outer = iter_rows(query)
+        assert next(outer)["key"] == "pool0"
+        assert [row["key"] for row in iter_rows(query)] == ["pool0", "pool1"]
+        assert next(outer)["key"] == "pool1"
+        outer.close()
+
+        list(iter_rows(query))
+        assert db._local.iterator[0] is pooled
+
+    def test_pool_reopens_after_db_file_replaced(self):
+        from noctem import db
+        from noctem.db import init_db, get_db
+        init_db()
+
+        with get_db() as conn:
+            conn.execute("INSERT INTO config (key, value) VALUES ('stale', '1')")
+
+        db.DB_PATH.unlink()
+        init_db()
+
+        with get_db() as conn:
+            row = conn.execute("SELECT value FROM config WHERE key = 'stale'").fetchone()
+        assert row is None
+
 
 class TestFlaskApp:
     """Test Flask application creation and basic routes."""
@@ -3,6 +3,7 @@ Pytest configuration and fixtures for Noctem tests.
 """
 import pytest
 import os
+import shutil
 import sys
 import tempfile
 from pathlib import Path
@@ -10,68 +11,99 @@ from pathlib import Path
 # Ensure noctem package is importable
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Create a shared test database path for all tests
-_TEST_DB_PATH = Path(tempfile.gettempdir()) / "noctem_test.db"
+# Shared test database for all tests, set up in pytest_sessionstart
+_TEST_DB_PATH = None
 
 
-@pytest.fixture(scope="session", autouse=True)
-def init_test_database():
+def pytest_sessionstart(session):
     """
-    Initialize a shared test database for all tests.
-    This runs once per test session.
+    Create the shared test database once, before collection. It lives in a
+    private directory of its own, so concurrent runs never share the file.
     """
+    global _TEST_DB_PATH
     from noctem import db
     from noctem.db import init_db
     
-    # Remove old test DB if exists
-    if _TEST_DB_PATH.exists():
-        _TEST_DB_PATH.unlink()
-    
-    # Set the shared test DB path
+    _TEST_DB_PATH = Path(tempfile.mkdtemp(prefix="noctem-test-")) / "noctem_test.db"
     db.DB_PATH = _TEST_DB_PATH
-    
-    # Initialize with full schema including voice_journals
     init_db()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Remove the shared test database and its directory."""
+    from noctem import db
     
-    yield
-    
-    # Cleanup after all tests
-    if _TEST_DB_PATH.exists():
-        try:
-            _TEST_DB_PATH.unlink()
-        except Exception:
-            pass  # File might be locked
+    db.close_pooled_connections()
+    if _TEST_DB_PATH is not None:
+        shutil.rmtree(_TEST_DB_PATH.parent, ignore_errors=True)
 
 
-@pytest.fixture(autouse=True)
-def ensure_db_path():
+class _RollbackTest(Exception):
+    """Raised at teardown to unwind rollback_db's outer transaction."""
+
+
+@pytest.fixture
+def rollback_db():
     """
-    Ensure DB_PATH is set correctly for each test.
-    This handles tests that might override DB_PATH.
-    Also cleans up skills tables between tests for isolation.
+    Run a test inside one outer get_db() transaction and roll it back after,
+    so a module can build its schema once instead of per test. Nested get_db()
+    blocks in the code under test become savepoints of this transaction.
+    
+    Only for single-threaded tests on the pooled connection: other threads,
+    extra connections and executescript()/init_db() can't share the
+    uncommitted transaction. Action logging is switched to synchronous for
+    the same reason, so its rows are rolled back with everything else.
     """
-    from noctem import db
+    from noctem.config import Config
     from noctem.db import get_db
     
-    original_path = db.DB_PATH
-    db.DB_PATH = _TEST_DB_PATH
-    
-    # Clean up skills tables before each test for isolation
-    try:
-        with get_db() as conn:
-            conn.execute("DELETE FROM skill_executions")
-            conn.execute("DELETE FROM skills")
-    except Exception:
-        pass  # Tables might not exist yet
-    
-    # Clean up wiki tables before each test for isolation
     try:
-        with get_db() as conn:
-            conn.execute("DELETE FROM knowledge_chunks")
-            conn.execute("DELETE FROM sources")
-    except Exception:
-        pass  # Tables might not exist yet
+        # immediate: an explicit BEGIN, so nested savepoints don't start
+        # (and on RELEASE, commit) a transaction of their own
+        with get_db(immediate=True) as conn:
+            Config.set("action_log_sync", True)
+            yield conn
+            if not conn.in_transaction:
+                pytest.fail("test committed rollback_db's transaction")
+            raise _RollbackTest
+    except _RollbackTest:
+        pass
+    finally:
+        # The config row was rolled back; don't let the cached value outlive it
+        Config.clear_cache()
+
+
+@pytest.fixture(scope="module")
+def test_db_path(tmp_path_factory):
+    """
+    Database file for a module that rebuilds its own database per test.
+    Each module (and each xdist worker) gets its own directory, which
+    pytest cleans up with the rest of its temp dirs.
+    """
+    return tmp_path_factory.mktemp("noctem") / "test.db"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_db_path():
+    """
+    Point each module at the shared test database. Modules with their own
+    database file switch DB_PATH in their per-test setup instead.
+    """
+    from noctem import db
     
-    yield
+    db.DB_PATH = _TEST_DB_PATH
+
+
+@pytest.fixture(autouse=True)
+def clean_shared_tables():
+    """Empty the skills and wiki tables of the shared database before each test."""
+    from noctem import db
+    from noctem.db import get_db
     
-    db.DB_PATH = original_path
+    if db.DB_PATH != _TEST_DB_PATH:
+        return
+    with get_db() as conn:
+        conn.execute("DELETE FROM skill_executions")
+        conn.execute("DELETE FROM skills")
+        conn.execute("DELETE FROM knowledge_chunks")
+        conn.execute("DELETE FROM sources")
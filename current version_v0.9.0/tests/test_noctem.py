@@ -248,6 +248,146 @@ class TestProjectService:
         project_service.create_project("Find This Project")
         found = project_service.get_project_by_name("This Project")
         assert found is not None
+    
+    def test_get_project_by_name_substring_case_insensitive(self):
+        project = project_service.create_project("Kitchen Remodel 2031")
+        assert project_service.get_project_by_name("REMODEL 20").id == project.id
+    
+    def test_get_project_by_name_tracks_rename_and_delete(self):
+        project = project_service.create_project("Garden Shed 2031")
+        project_service.update_project(project.id, name="Workshop 2031")
+        assert project_service.get_project_by_name("Workshop 2031").id == project.id
+        assert project_service.get_project_by_name("Garden Shed 2031") is None
+        
+        project_service.delete_project(project.id)
+        assert project_service.get_project_by_name("Workshop 2031") is None
+    
+    def test_update_project_returns_stored_row(self):
+        project = project_service.create_project("Old Name")
+        updated = project_service.update_project(project.id, name="New Name", status="done")
+        assert updated.name == "New Name"
+        assert updated.status == "done"
+        assert updated == project_service.get_project(project.id)
+    
+    def test_update_missing_project(self):
+        assert project_service.update_project(99999, name="Ghost") is None
+
+
+class TestActionLog:
+    """Test batched action logging."""
+    
+    def test_queued_actions_visible_after_flush(self):
+        from noctem.services.base import log_action, get_action_logs
+        
+        for i in range(5):
+            assert log_action("batch_test", "task", i, {"n": i}) is None
+        
+        logs = get_action_logs(action_type="batch_test")
+        assert len(logs) >= 5
+        assert {log["entity_id"] for log in logs} >= set(range(5))
+    
+    def test_details_round_trip_and_empty_is_null(self):
+        import json
+        from noctem.services.base import log_action, get_action_logs
+        
+        log_action("details_test", "task", 1, {"name": "Café", 2: [1, 2]})
+        log_action("details_test", "task", 2, {})
+        
+        logs = {log["entity_id"]: log for log in get_action_logs(action_type="details_test")}
+        assert json.loads(logs[1]["details"]) == {"name": "Café", "2": [1, 2]}
+        assert logs[2]["details"] is None
+    
+    def test_unserializable_details_raise_in_caller(self):
+        from noctem.services.base import log_action, flush_action_log, _writer
+        
+        with pytest.raises(TypeError):
+            log_action("bad_details", "task", 1, {"when": object()})
+        flush_action_log()
+        assert _writer._thread.is_alive()
+    
+    def test_writer_survives_failed_batch(self):
+        from unittest.mock import patch
+        from noctem.services.base import log_action, get_action_logs, _writer
+        
+        with patch.object(_writer, "_write", side_effect=RuntimeError("boom")):
+            log_action("writer_crash", "task", 1)
+            _writer.flush()
+        assert _writer._thread.is_alive()
+        
+        log_action("writer_after_crash", "task", 2)
+        assert len(get_action_logs(action_type="writer_after_crash")) == 1
+    
+    def test_flush_restarts_dead_writer(self):
+        import threading
+        from noctem import db
+        from noctem.services.base import _action_row, get_action_logs, _writer
+        
+        # Entries left behind by a writer thread that is no longer running
+        _writer.flush()
+        _writer._thread = threading.Thread(target=lambda: None)
+        _writer._thread.start()
+        _writer._thread.join()
+        _writer._queue.put_nowait((db.DB_PATH, _action_row("writer_restart", "task", 3, None)))
+        
+        flusher = threading.Thread(target=_writer.flush, daemon=True)
+        flusher.start()
+        flusher.join(timeout=5)
+        assert not flusher.is_alive()
+        assert len(get_action_logs(action_type="writer_restart")) == 1
+    
+    def test_queued_actions_follow_their_database(self, tmp_path):
+        from noctem.services.base import log_action, flush_action_log, _writer
+        
+        shared = db.DB_PATH
+        other = tmp_path / "other.db"
+        gone = tmp_path / "gone.db"
+        try:
+            db.DB_PATH = other
+            init_db()
+            _writer.put((other, ("routed", "task", 1, None)))
+            _writer.put((gone, ("dropped", "task", 2, None)))
+            db.DB_PATH = shared
+            log_action("routed", "task", 3)
+            flush_action_log()
+        finally:
+            db.DB_PATH = shared
+        
+        conn = db.get_connection(other)
+        try:
+            routed = conn.execute(
+                "SELECT entity_id FROM action_log WHERE action_type = 'routed'"
+            ).fetchall()
+        finally:
+            conn.close()
+        assert [row[0] for row in routed] == [1]
+        assert not gone.exists()
+        with get_db() as conn:
+            assert conn.execute(
+                "SELECT entity_id FROM action_log WHERE action_type = 'routed'"
+            ).fetchone()[0] == 3
+    
+    def test_action_in_rolled_back_block_is_undone(self):
+        from noctem.services.base import log_action, get_action_logs
+        
+        with pytest.raises(RuntimeError):
+            with get_db():
+                assert log_action("rolled_back", "task", 1) is not None
+                raise RuntimeError("abort")
+        assert get_action_logs(action_type="rolled_back") == []
+    
+    def test_sync_mode_returns_id(self):
+        from noctem.config import Config
+        from noctem.services.base import log_action
+        
+        Config.set("action_log_sync", True)
+        try:
+            log_id = log_action("sync_test", "task", 1)
+        finally:
+            Config.set("action_log_sync", False)
+        
+        with get_db() as conn:
+            row = conn.execute("SELECT action_type FROM action_log WHERE id = ?", (log_id,)).fetchone()
+        assert row["action_type"] == "sync_test"
 
 
 class TestGoalService:
@@ -9,30 +9,19 @@ Tests cover:
 """
 import pytest
 import tempfile
-import os
 from pathlib import Path
 
-# Set up test database before imports
-TEST_DB = tempfile.mktemp(suffix='.db')
-os.environ['NOCTEM_DB_PATH'] = TEST_DB
-
 from noctem import db
 from noctem.db import init_db
 
-# Override DB path for testing
-db.DB_PATH = Path(TEST_DB)
-
 
 @pytest.fixture(autouse=True)
-def setup_db():
+def setup_db(test_db_path):
     """Set up fresh database for each test."""
-    db.DB_PATH = Path(TEST_DB)
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
+    db.DB_PATH = test_db_path
+    test_db_path.unlink(missing_ok=True)
     init_db()
     yield
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
 
 
 @pytest.fixture
@@ -7,22 +7,11 @@ Tests cover:
 - Scheduler integration
 """
 import pytest
-import tempfile
-import os
 from datetime import date, timedelta
-from pathlib import Path
 
-# Set up test database before imports
-TEST_DB = tempfile.mktemp(suffix='.db')
-os.environ['NOCTEM_DB_PATH'] = TEST_DB
-
-# Now import noctem modules
 from noctem import db
 from noctem.db import get_db, init_db
 
-# Override DB path for testing
-db.DB_PATH = Path(TEST_DB)
-
 from noctem.services import task_service, project_service
 from noctem.config import Config
 from noctem.butler.protocol import ButlerProtocol, get_butler_status, get_butler_status_message
@@ -38,17 +27,14 @@ from noctem.butler.clarifications import (
 
 
 @pytest.fixture(autouse=True)
-def setup_db():
+def setup_db(test_db_path):
     """Set up fresh database for each test."""
-    db.DB_PATH = Path(TEST_DB)
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
+    db.DB_PATH = test_db_path
+    test_db_path.unlink(missing_ok=True)
     init_db()
     ensure_clarification_table()
     Config.clear_cache()
     yield
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
 
 
 class TestButlerProtocol:
@@ -120,6 +106,28 @@ class TestButlerProtocol:
         result = ButlerProtocol.record_contact("update", "Should fail")
         assert result is None
     
+    def test_gate_requires_chat_id(self):
+        """gate should skip when no Telegram chat is configured."""
+        assert ButlerProtocol.gate("update") is None
+    
+    def test_gate_returns_chat_id_within_budget(self):
+        """gate should return the chat ID until the type limit is hit."""
+        Config.set("telegram_chat_id", "12345")
+        for i in range(3):
+            assert ButlerProtocol.gate("update") == "12345"
+            ButlerProtocol.record_contact("update", f"Update {i}")
+        
+        assert ButlerProtocol.gate("update") is None
+    
+    def test_gate_clarification_needs_pending_question(self):
+        """Clarification gate should only open when questions are pending."""
+        Config.set("telegram_chat_id", "12345")
+        assert ButlerProtocol.gate("clarification") is None
+        
+        task = task_service.create_task("Vague task")
+        ClarificationQueue.add_question(task.id, "What does this mean?")
+        assert ButlerProtocol.gate("clarification") == "12345"
+    
     def test_get_budget_status(self):
         """get_budget_status should return complete status dict."""
         ButlerProtocol.record_contact("update", "Test")
@@ -257,6 +265,18 @@ class TestClarificationQueue:
         assert qid is not None
         assert qid > 0
     
+    def test_add_question_keeps_outer_transaction(self, rollback_db):
+        """Adding a question inside an outer transaction must not commit it."""
+        task = task_service.create_task("Test task")
+        
+        qid = ClarificationQueue.add_question(task.id, "When is this due?")
+        
+        assert rollback_db.in_transaction
+        row = rollback_db.execute(
+            "SELECT question FROM clarification_queue WHERE id = ?", (qid,)
+        ).fetchone()
+        assert row[0] == "When is this due?"
+    
     def test_get_pending_questions(self):
         """Should retrieve pending questions."""
         task = task_service.create_task("Test task")
@@ -416,5 +436,281 @@ class TestButlerIntegration:
         assert ButlerProtocol.get_remaining_contacts() == initial - 1
 
 
+
+class TestSchedulerHelpers:
+    """Test cached time parsing and trigger construction for butler jobs."""
+    
+    def test_parse_hhmm(self):
+        """Valid times parse, invalid ones fall back to the default."""
+        from noctem.scheduler.jobs import _parse_hhmm
+        
+        assert _parse_hhmm("09:30") == (9, 30)
+        assert _parse_hhmm("nonsense") == (9, 0)
+        assert _parse_hhmm("nonsense", (7, 0)) == (7, 0)
+        assert _parse_hhmm(None, (7, 0)) == (7, 0)
+    
+    def test_cron_triggers_are_reused(self):
+        """Identical schedules should share one CronTrigger instance."""
+        from noctem.scheduler.jobs import _cron
+        
+        assert _cron(9, 0, "mon,wed,fri") is _cron(9, 0, "mon,wed,fri")
+        assert _cron(9, 0, "mon,wed,fri") is not _cron(9, 0, "tue,thu")
+    
+    def test_cron_triggers_are_jittered(self):
+        """Cron jobs should carry jitter so same-minute jobs don't fire together."""
+        from noctem.scheduler.jobs import _cron, CRON_JITTER_SECONDS
+        
+        assert _cron(9, 0).jitter == CRON_JITTER_SECONDS
+        assert _cron(9, 15, "tue,thu").jitter == CRON_JITTER_SECONDS
+    
+    def test_dow_csv_is_canonical(self):
+        """Equivalent day lists should produce the same cron day_of_week string."""
+        from noctem.scheduler.jobs import _dow_csv, _day_key
+        
+        assert _dow_csv(_day_key(["Friday", "monday", "Wednesday"])) == "mon,wed,fri"
+        assert _dow_csv(_day_key(["monday", "wednesday", "friday"])) is \
+            _dow_csv(_day_key(["friday", "wednesday", "monday"]))
+    
+    def test_create_scheduler_registers_butler_jobs(self):
+        """create_scheduler should register briefing and butler jobs."""
+        from noctem.scheduler.jobs import create_scheduler
+        
+        scheduler = create_scheduler()
+        job_ids = {job.id for job in scheduler.get_jobs()}
+        assert {"morning_briefing", "butler_update", "butler_clarification"} <= job_ids
+
+    
+    def test_send_retries_after_flood_control(self):
+        """_send should wait out a RetryAfter and then deliver."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+        from telegram.error import RetryAfter
+        from noctem.scheduler import jobs
+        
+        app = MagicMock()
+        app.bot.send_message = AsyncMock(side_effect=[RetryAfter(0), "ok"])
+        original = jobs._bot_app
+        jobs._bot_app = app
+        try:
+            assert asyncio.run(jobs._send("1", "hello")) == "ok"
+        finally:
+            jobs._bot_app = original
+        assert app.bot.send_message.await_count == 2
+    
+    def test_send_gives_up_after_retries(self):
+        """_send should re-raise once retries are exhausted."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from telegram.error import TimedOut
+        from noctem.scheduler import jobs
+        
+        app = MagicMock()
+        app.bot.send_message = AsyncMock(side_effect=TimedOut())
+        original = jobs._bot_app
+        jobs._bot_app = app
+        try:
+            with patch("noctem.scheduler.jobs.asyncio.sleep", AsyncMock()):
+                with pytest.raises(TimedOut):
+                    asyncio.run(jobs._send("1", "hello"))
+        finally:
+            jobs._bot_app = original
+        assert app.bot.send_message.await_count == jobs.SEND_RETRIES + 1
+    
+    def test_trigger_now_from_another_thread(self):
+        """trigger_now should run the job on the bot's loop from a plain thread."""
+        import asyncio
+        import threading
+        from unittest.mock import MagicMock, patch
+        from noctem.scheduler import jobs
+        
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        ran = []
+        
+        async def fake_job():
+            ran.append(threading.current_thread())
+        
+        try:
+            async def install():
+                jobs.set_bot_app(MagicMock())
+            asyncio.run_coroutine_threadsafe(install(), loop).result(timeout=5)
+            
+            with patch.dict(jobs._TRIGGERABLE_JOBS, {"briefing": fake_job}):
+                jobs.trigger_now("briefing").result(timeout=5)
+        finally:
+            jobs.set_bot_app(None)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+        
+        assert ran == [thread]
+        with pytest.raises(ValueError):
+            jobs.trigger_now("nonsense")
+
+
+class TestOutbox:
+    """Test batched outbound Telegram sends."""
+    
+    def _run_outbox(self, messages):
+        """Queue messages, let the outbox flush, and return the sends made."""
+        import asyncio
+        from noctem.butler.outbox import Outbox
+        
+        sent = []
+        
+        async def fake_send(chat_id, text, parse_mode=None):
+            sent.append((chat_id, text, parse_mode))
+        
+        async def run():
+            outbox = Outbox(fake_send, debounce=0.01)
+            for kwargs in messages:
+                await outbox.put(**kwargs)
+            await outbox.stop()
+        
+        asyncio.run(run())
+        return sent
+    
+    def test_coalesces_same_chat_and_mode(self):
+        """Messages for the same chat and parse mode go out as one send."""
+        from noctem.butler.outbox import SEPARATOR
+        
+        sent = self._run_outbox([
+            {"chat_id": "1", "text": "update", "parse_mode": "Markdown"},
+            {"chat_id": "1", "text": "question", "parse_mode": "Markdown"},
+            {"chat_id": "1", "text": "briefing"},
+        ])
+        
+        assert ("1", f"update{SEPARATOR}question", "Markdown") in sent
+        assert ("1", "briefing", None) in sent
+        assert len(sent) == 2
+    
+    def test_respects_message_length_limit(self):
+        """Merged messages must stay under Telegram's 4096-char limit."""
+        from noctem.butler.outbox import MAX_MESSAGE_LENGTH
+        
+        sent = self._run_outbox([
+            {"chat_id": "1", "text": "a" * 3000},
+            {"chat_id": "1", "text": "b" * 3000},
+        ])
+        
+        assert len(sent) == 2
+        assert all(len(text) <= MAX_MESSAGE_LENGTH for _, text, _ in sent)
+    
+    def test_on_sent_runs_only_after_success(self):
+        """Callbacks (e.g. recording a contact) fire only for delivered messages."""
+        import asyncio
+        from noctem.butler.outbox import Outbox
+        
+        delivered = []
+        
+        async def failing_send(chat_id, text, parse_mode=None):
+            raise RuntimeError("network down")
+        
+        async def run():
+            outbox = Outbox(failing_send, debounce=0.01)
+            await outbox.put("1", "update", on_sent=lambda: delivered.append("update"))
+            await outbox.stop()
+        
+        asyncio.run(run())
+        assert delivered == []
+    
+    def test_stop_lets_in_flight_send_finish(self):
+        """Stopping mid-send should finish the send and still record it."""
+        import asyncio
+        from noctem.butler.outbox import Outbox
+        
+        delivered = []
+        
+        async def run():
+            started = asyncio.Event()
+            
+            async def slow_send(chat_id, text, parse_mode=None):
+                started.set()
+                await asyncio.sleep(0.05)
+            
+            outbox = Outbox(slow_send, debounce=0)
+            await outbox.put("1", "update", on_sent=lambda: delivered.append("update"))
+            await started.wait()
+            await outbox.stop()
+        
+        asyncio.run(run())
+        assert delivered == ["update"]
+    
+    def test_stop_during_callback_still_records_chunk(self):
+        """Messages that went out get their callbacks even if stopped mid-callback."""
+        import asyncio
+        import time
+        from noctem.butler.outbox import Outbox
+        
+        delivered = []
+        
+        def slow_record():
+            time.sleep(0.05)
+            delivered.append("update")
+        
+        async def run():
+            sent = asyncio.Event()
+            
+            async def fake_send(chat_id, text, parse_mode=None):
+                sent.set()
+            
+            outbox = Outbox(fake_send, debounce=0.01)
+            await outbox.put("1", "update", on_sent=slow_record)
+            await outbox.put("1", "question", on_sent=lambda: delivered.append("question"))
+            await sent.wait()
+            await asyncio.sleep(0.01)
+            await outbox.stop()
+            return list(delivered)
+        
+        assert asyncio.run(run()) == ["update", "question"]
+    
+    def test_stop_while_rate_limited_keeps_rest_of_batch(self):
+        """Chunks still waiting on the rate limiter are sent by stop(), not dropped."""
+        import asyncio
+        from noctem.butler.outbox import Outbox, RateLimiter
+        
+        sent = []
+        
+        async def run():
+            first_sent = asyncio.Event()
+            
+            async def fake_send(chat_id, text, parse_mode=None):
+                sent.append(chat_id)
+                first_sent.set()
+            
+            outbox = Outbox(fake_send, debounce=0.01, limiter=RateLimiter(rate=1, period=0.1))
+            for chat_id in ("1", "2", "3"):
+                await outbox.put(chat_id, "update")
+            await first_sent.wait()
+            await asyncio.sleep(0.02)
+            await outbox.stop()
+        
+        asyncio.run(run())
+        assert sent == ["1", "2", "3"]
+    
+    def test_cancelled_send_does_not_drop_rest_of_batch(self):
+        """A send cancelled from below is logged, and the rest of the batch still goes out."""
+        import asyncio
+        from noctem.butler.outbox import Outbox
+        
+        sent = []
+        
+        async def flaky_send(chat_id, text, parse_mode=None):
+            if text == "first":
+                raise asyncio.CancelledError
+            sent.append(text)
+        
+        async def run():
+            outbox = Outbox(flaky_send, debounce=0.01)
+            await outbox.put("1", "first")
+            await outbox.put("2", "second")
+            await asyncio.sleep(0.05)
+            await outbox.stop()
+        
+        asyncio.run(run())
+        assert sent == ["second"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
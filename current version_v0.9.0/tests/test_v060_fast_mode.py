@@ -7,22 +7,10 @@ Tests cover:
 - Config defaults for butler/slow mode
 """
 import pytest
-import tempfile
-import os
 from datetime import date, datetime
-from pathlib import Path
-
-# Set up test database before imports
-TEST_DB = tempfile.mktemp(suffix='.db')
-os.environ['NOCTEM_DB_PATH'] = TEST_DB
-
-# Now import noctem modules
-from noctem import db
-from noctem.db import get_db, init_db
-
-# Override DB path for testing
-db.DB_PATH = Path(TEST_DB)
+from types import SimpleNamespace
 
+from noctem.db import get_db
 from noctem.models import Task, Project
 from noctem.services import task_service, project_service
 from noctem.services.message_logger import MessageLog, get_recent_logs
@@ -30,71 +18,44 @@ from noctem.config import Config, DEFAULTS
 
 
 @pytest.fixture(autouse=True)
-def setup_db():
-    """Set up fresh database for each test."""
-    db.DB_PATH = Path(TEST_DB)
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
-    init_db()
+def setup_db(rollback_db):
+    """Tests share the session database; rollback_db undoes their writes."""
     Config.clear_cache()
     yield
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
+
+
+@pytest.fixture(scope="module")
+def schema_meta(shared_db_path):
+    """Table columns and index names, read once for the schema tests."""
+    with get_db() as conn:
+        columns = {}
+        for table, column in conn.execute("""
+            SELECT m.name, p.name FROM sqlite_master m, pragma_table_info(m.name) p
+            WHERE m.type = 'table'
+        """):
+            columns.setdefault(table, set()).add(column)
+        indexes = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+    return SimpleNamespace(tables=set(columns), columns=columns, indexes=indexes)
 
 
 class TestV060Schema:
     """Test v0.6.0 database schema additions."""
     
-    def test_butler_contacts_table_exists(self):
-        """butler_contacts table should exist."""
-        with get_db() as conn:
-            result = conn.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='butler_contacts'
-            """).fetchone()
-            assert result is not None
-    
-    def test_butler_contacts_columns(self):
-        """butler_contacts should have correct columns."""
-        with get_db() as conn:
-            cursor = conn.execute("PRAGMA table_info(butler_contacts)")
-            columns = {row[1] for row in cursor.fetchall()}
-            expected = {'id', 'contact_type', 'message_content', 'week_number', 'year', 'sent_at'}
-            assert expected.issubset(columns)
-    
-    def test_slow_work_queue_table_exists(self):
-        """slow_work_queue table should exist."""
-        with get_db() as conn:
-            result = conn.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='slow_work_queue'
-            """).fetchone()
-            assert result is not None
-    
-    def test_slow_work_queue_columns(self):
-        """slow_work_queue should have correct columns."""
-        with get_db() as conn:
-            cursor = conn.execute("PRAGMA table_info(slow_work_queue)")
-            columns = {row[1] for row in cursor.fetchall()}
-            expected = {'id', 'work_type', 'target_id', 'depends_on_id', 'status', 
-                       'result', 'queued_at', 'started_at', 'completed_at', 'error_message'}
-            assert expected.issubset(columns)
-    
-    def test_tasks_has_suggestion_columns(self):
-        """tasks table should have computer_help_suggestion column."""
-        with get_db() as conn:
-            cursor = conn.execute("PRAGMA table_info(tasks)")
-            columns = {row[1] for row in cursor.fetchall()}
-            assert 'computer_help_suggestion' in columns
-            assert 'suggestion_generated_at' in columns
-    
-    def test_projects_has_suggestion_columns(self):
-        """projects table should have next_action_suggestion column."""
-        with get_db() as conn:
-            cursor = conn.execute("PRAGMA table_info(projects)")
-            columns = {row[1] for row in cursor.fetchall()}
-            assert 'next_action_suggestion' in columns
-            assert 'suggestion_generated_at' in columns
+    @pytest.mark.parametrize("table,expected", [
+        ("butler_contacts", {'id', 'contact_type', 'message_content', 'week_number',
+                             'year', 'sent_at'}),
+        ("slow_work_queue", {'id', 'work_type', 'target_id', 'depends_on_id', 'status',
+                             'result', 'queued_at', 'started_at', 'completed_at',
+                             'error_message'}),
+        ("tasks", {'computer_help_suggestion', 'suggestion_generated_at'}),
+        ("projects", {'next_action_suggestion', 'suggestion_generated_at'}),
+    ])
+    def test_table_has_columns(self, schema_meta, table, expected):
+        """v0.6.0 tables should exist with their new columns."""
+        assert table in schema_meta.tables
+        assert expected.issubset(schema_meta.columns[table])
     
     def test_can_insert_butler_contact(self):
         """Should be able to insert butler contact records."""
@@ -121,6 +82,16 @@ class TestV060Schema:
             row = conn.execute("SELECT * FROM slow_work_queue WHERE id = 1").fetchone()
             assert row['work_type'] == 'task_computer_help'
             assert row['status'] == 'pending'
+    
+    def test_action_log_written_in_test_transaction(self, rollback_db):
+        """Logged actions go through rollback_db's transaction, not the writer thread."""
+        task = task_service.create_task("Logged task")
+        
+        count = rollback_db.execute(
+            "SELECT COUNT(*) FROM action_log WHERE entity_type = 'task' AND entity_id = ?",
+            (task.id,),
+        ).fetchone()[0]
+        assert count >= 1
 
 
 class TestV060Config:
@@ -436,23 +407,10 @@ class TestTaskSuggestions:
 class TestIndexes:
     """Test that required indexes exist."""
     
-    def test_butler_contacts_week_index(self):
-        """Index on butler_contacts(year, week_number) should exist."""
-        with get_db() as conn:
-            result = conn.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='index' AND name='idx_butler_contacts_week'
-            """).fetchone()
-            assert result is not None
-    
-    def test_slow_work_status_index(self):
-        """Index on slow_work_queue(status, queued_at) should exist."""
-        with get_db() as conn:
-            result = conn.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='index' AND name='idx_slow_work_status'
-            """).fetchone()
-            assert result is not None
+    @pytest.mark.parametrize("index", ["idx_butler_contacts_week", "idx_slow_work_status"])
+    def test_index_exists(self, schema_meta, index):
+        """butler_contacts(year, week_number) and slow_work_queue(status, queued_at) indexes."""
+        assert index in schema_meta.indexes
 
 
 if __name__ == "__main__":
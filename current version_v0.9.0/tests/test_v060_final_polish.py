@@ -10,6 +10,18 @@ import pytest
 from datetime import date, datetime, timedelta
 
 
+@pytest.fixture(scope="module")
+def seeded_prompts(shared_db_path):
+    """
+    Seed the default prompts once for every test in the module. Tests that
+    change a default compare against the version they read first, so they
+    don't need a fresh seed each time.
+    """
+    from noctem.services.prompt_service import seed_default_prompts
+    
+    return seed_default_prompts()
+
+
 class TestPromptService:
     """Tests for the prompt management service."""
     
@@ -25,6 +37,63 @@ class TestPromptService:
         names = [p.name for p in prompts]
         assert "task_analyzer_system" in names or result["skipped"] > 0
     
+    def test_seed_recreates_only_missing_defaults(self):
+        """Seeding fills in a deleted default and leaves the rest alone."""
+        from noctem.services.prompt_service import (
+            seed_default_prompts, delete_prompt_template, get_prompt, DEFAULT_PROMPTS
+        )
+        
+        seed_default_prompts()
+        delete_prompt_template("task_analyzer_user")
+        
+        result = seed_default_prompts()
+        assert result == {"created": 1, "skipped": len(DEFAULT_PROMPTS) - 1}
+        
+        prompt = get_prompt("task_analyzer_user")
+        assert prompt.version == 1
+        assert prompt.variables == DEFAULT_PROMPTS["task_analyzer_user"]["variables"]
+    
+    def test_delete_prompt_template_removes_versions(self):
+        """Deleting a template drops its versions; a second delete is a no-op."""
+        from noctem.db import get_db
+        from noctem.services.prompt_service import (
+            create_prompt_template, update_prompt, delete_prompt_template
+        )
+        
+        template = create_prompt_template("delete_cascade_test", "one")
+        update_prompt("delete_cascade_test", "two")
+        
+        assert delete_prompt_template("delete_cascade_test") is True
+        assert delete_prompt_template("delete_cascade_test") is False
+        with get_db() as conn:
+            left = conn.execute(
+                "SELECT COUNT(*) FROM prompt_versions WHERE template_id = ?", (template.id,)
+            ).fetchone()[0]
+        assert left == 0
+    
+    def test_prompt_version_from_tuple_matches_from_row(self, seeded_prompts):
+        """The tuple fast path builds the same object as from_row."""
+        from noctem.db import get_db
+        from noctem.models import PromptVersion
+        from noctem.services.prompt_service import get_prompt
+        
+        prompt = get_prompt("task_analyzer_user")
+        with get_db() as conn:
+            row = conn.execute("SELECT * FROM prompt_versions WHERE id = ?", (prompt.id,)).fetchone()
+        
+        assert PromptVersion.from_row(row) == prompt
+        assert PromptVersion.from_tuple(tuple(row)) == prompt
+        assert isinstance(prompt.created_at, datetime)
+    
+    def test_seeded_defaults_skip_write_transaction(self, seeded_prompts):
+        """Misses on already-seeded defaults shouldn't take the write lock."""
+        from unittest.mock import patch
+        from noctem.services.prompt_service import get_prompt
+        
+        with patch("noctem.services.prompt_service.get_db") as get_db:
+            assert get_prompt("task_analyzer_system", version=999) is None
+        get_db.assert_not_called()
+    
     def test_get_prompt_auto_seeds(self):
         """Test that getting a prompt auto-seeds if not found."""
         from noctem.services.prompt_service import get_prompt
@@ -34,11 +103,9 @@ class TestPromptService:
         assert prompt.prompt_text is not None
         assert len(prompt.prompt_text) > 10
     
-    def test_render_prompt_with_variables(self):
+    def test_render_prompt_with_variables(self, seeded_prompts):
         """Test rendering a prompt with variable substitution."""
-        from noctem.services.prompt_service import render_prompt, seed_default_prompts
-        
-        seed_default_prompts()
+        from noctem.services.prompt_service import render_prompt
         
         rendered = render_prompt("task_analyzer_user", {
             "name": "Buy groceries",
@@ -51,14 +118,12 @@ class TestPromptService:
         assert "Buy groceries" in rendered
         assert "Home" in rendered
     
-    def test_update_prompt_creates_version(self):
+    def test_update_prompt_creates_version(self, seeded_prompts):
         """Test that updating a prompt creates a new version."""
         from noctem.services.prompt_service import (
-            get_prompt, update_prompt, seed_default_prompts
+            get_prompt, update_prompt
         )
         
-        seed_default_prompts()
-        
         original = get_prompt("task_analyzer_system")
         original_version = original.version
         
@@ -72,13 +137,41 @@ class TestPromptService:
         assert new_version.version == original_version + 1
         assert new_version.prompt_text == "New prompt text for testing."
     
-    def test_get_prompt_history(self):
-        """Test retrieving prompt version history."""
+    def test_get_prompt_specific_and_missing_version(self):
+        """Explicit versions resolve; unknown versions/names return None."""
         from noctem.services.prompt_service import (
-            get_prompt_history, update_prompt, seed_default_prompts
+            get_prompt, create_prompt_template, update_prompt
         )
         
-        seed_default_prompts()
+        create_prompt_template("get_prompt_join_test", "first {{x}}")
+        update_prompt("get_prompt_join_test", "second {{x}}")
+        
+        assert get_prompt("get_prompt_join_test").prompt_text == "second {{x}}"
+        assert get_prompt("get_prompt_join_test", version=1).prompt_text == "first {{x}}"
+        assert get_prompt("get_prompt_join_test", version=99) is None
+        assert get_prompt("no_such_prompt") is None
+    
+    def test_writes_return_stored_rows(self):
+        """create/update return the rows as stored, not partial objects."""
+        from noctem.services.prompt_service import (
+            get_prompt, create_prompt_template, update_prompt
+        )
+        
+        template = create_prompt_template("stored_rows_test", "v1 {{a}}", description="d")
+        assert template.id is not None
+        assert template.current_version == 1
+        assert template.created_at is not None
+        
+        version = update_prompt("stored_rows_test", "v2 {{b}}", created_by="user")
+        assert version == get_prompt("stored_rows_test")
+        assert version.variables == ["b"]
+        assert version.created_at is not None
+    
+    def test_get_prompt_history(self, seeded_prompts):
+        """Test retrieving prompt version history."""
+        from noctem.services.prompt_service import (
+            get_prompt_history, update_prompt
+        )
         
         # Create a few versions
         update_prompt("task_analyzer_system", "Version 2", created_by="test")
@@ -88,13 +181,43 @@ class TestPromptService:
         assert len(history) >= 3
         assert history[0].version > history[1].version  # Newest first
     
-    def test_rollback_prompt(self):
-        """Test rolling back to a previous version."""
+    def test_variables_stored_as_compact_json(self):
+        """Variables round-trip; prompts without placeholders store []."""
+        from noctem.db import get_db
+        from noctem.services.prompt_service import create_prompt_template, update_prompt
+        
+        create_prompt_template("variables_json_test", "no placeholders")
+        version = update_prompt("variables_json_test", "{{a}} and {{b}}")
+        assert version.variables == ["a", "b"]
+        
+        with get_db() as conn:
+            stored = [row[0] for row in conn.execute(
+                """SELECT v.variables FROM prompt_versions v
+                   JOIN prompt_templates t ON t.id = v.template_id
+                   WHERE t.name = 'variables_json_test' ORDER BY v.version"""
+            )]
+        assert stored == ["[]", '["a","b"]']
+    
+    def test_iter_prompt_history_is_lazy(self):
+        """Iterating history yields newest first and can stop early."""
+        from itertools import islice
         from noctem.services.prompt_service import (
-            get_prompt, rollback_prompt, update_prompt, seed_default_prompts
+            iter_prompt_history, create_prompt_template, update_prompt
         )
         
-        seed_default_prompts()
+        create_prompt_template("history_iter_test", "one")
+        update_prompt("history_iter_test", "two")
+        update_prompt("history_iter_test", "three")
+        
+        newest = [v.prompt_text for v in islice(iter_prompt_history("history_iter_test"), 2)]
+        assert newest == ["three", "two"]
+        assert list(iter_prompt_history("no_such_prompt")) == []
+    
+    def test_rollback_prompt(self, seeded_prompts):
+        """Test rolling back to a previous version."""
+        from noctem.services.prompt_service import (
+            get_prompt, rollback_prompt, update_prompt
+        )
         
         original = get_prompt("task_analyzer_system")
         original_text = original.prompt_text
@@ -109,6 +232,79 @@ class TestPromptService:
         assert rolled_back is not None
         assert rolled_back.prompt_text == original_text
     
+    def test_update_prompt_description_optional(self):
+        """A new description is stored; omitting it keeps the old one."""
+        from noctem.services.prompt_service import (
+            create_prompt_template, update_prompt, get_prompt_template
+        )
+        
+        create_prompt_template("description_update_test", "one", description="first")
+        update_prompt("description_update_test", "two")
+        assert get_prompt_template("description_update_test").description == "first"
+        
+        update_prompt("description_update_test", "three", description="second")
+        template = get_prompt_template("description_update_test")
+        assert template.description == "second"
+        assert template.current_version == 3
+    
+    def test_get_prompt_template_cache(self):
+        """Cached metadata follows writes and can't be altered by callers."""
+        from unittest.mock import patch
+        from noctem.services.prompt_service import (
+            create_prompt_template, update_prompt, rollback_prompt, get_prompt_template
+        )
+        
+        create_prompt_template("template_cache_test", "one")
+        first = get_prompt_template("template_cache_test")
+        first.description = "mutated"
+        
+        with patch("noctem.services.prompt_service.read_db") as read_db:
+            again = get_prompt_template("template_cache_test")
+        read_db.assert_not_called()
+        assert again.description is None
+        
+        update_prompt("template_cache_test", "two")
+        assert get_prompt_template("template_cache_test").current_version == 2
+        rollback_prompt("template_cache_test", to_version=1)
+        assert get_prompt_template("template_cache_test").current_version == 3
+    
+    def test_get_prompt_with_context(self):
+        """Context bundles template, current version and history count."""
+        from noctem.services.prompt_service import (
+            get_prompt_with_context, create_prompt_template, update_prompt, get_prompt
+        )
+        
+        assert get_prompt_with_context("no_such_prompt") is None
+        
+        create_prompt_template("context_test", "one {{a}}", description="ctx")
+        update_prompt("context_test", "two {{b}}")
+        
+        ctx = get_prompt_with_context("context_test")
+        assert ctx["template"].name == "context_test"
+        assert ctx["template"].description == "ctx"
+        assert ctx["template"].current_version == 2
+        assert ctx["current_version"] == get_prompt("context_test")
+        assert ctx["history_count"] == 2
+        assert ctx["variables"] == ["b"]
+    
+    def test_rollback_prompt_missing_version(self):
+        """Rolling back to a version that doesn't exist changes nothing."""
+        from noctem.services.prompt_service import (
+            get_prompt, rollback_prompt, create_prompt_template, update_prompt
+        )
+        
+        create_prompt_template("rollback_missing_test", "one")
+        update_prompt("rollback_missing_test", "two")
+        
+        assert rollback_prompt("rollback_missing_test", to_version=7) is None
+        assert rollback_prompt("no_such_prompt", to_version=1) is None
+        assert get_prompt("rollback_missing_test").version == 2
+        
+        rolled_back = rollback_prompt("rollback_missing_test", to_version=1)
+        assert rolled_back.version == 3
+        assert rolled_back.created_by == "rollback_from_v1"
+        assert get_prompt("rollback_missing_test") == rolled_back
+    
     def test_extract_variables(self):
         """Test extracting variables from prompt text."""
         from noctem.services.prompt_service import extract_variables
@@ -120,6 +316,73 @@ class TestPromptService:
         assert "project" in variables
         assert "date" in variables
         assert len(variables) == 3
+    
+    def test_render_leaves_unknown_variables(self):
+        """Rendering substitutes known variables and leaves others intact."""
+        from noctem.services.prompt_service import _compile_template, _render_pieces
+        
+        pieces = _compile_template("{{a}} and {{b}}, {{a}} again")
+        assert _compile_template("{{a}} and {{b}}, {{a}} again") is pieces
+        assert pieces.names == ("a", "b", "a")
+        assert pieces.placeholders == ("{{a}}", "{{b}}", "{{a}}")
+        assert _render_pieces(pieces, {"a": 1}) == "1 and {{b}}, 1 again"
+        assert _render_pieces(pieces, {"a": None, "b": "x"}) == " and x,  again"
+        
+        plain = _compile_template("No variables here")
+        assert _render_pieces(plain, {"a": 1}) is plain.literals[0]
+    
+    def test_render_prompt_repeats_skip_database(self, seeded_prompts, monkeypatch):
+        """Per-task renders are served from the caches once warmed."""
+        from noctem.services import prompt_service
+        
+        system = prompt_service.render_prompt("task_analyzer_system")
+        prompt_service.render_prompt("task_analyzer_user", {"name": "warm"})
+        
+        def no_db(*args, **kwargs):
+            raise AssertionError("render hit the database")
+        monkeypatch.setattr(prompt_service, "read_db", no_db)
+        monkeypatch.setattr(prompt_service, "get_db", no_db)
+        
+        assert prompt_service.render_prompt("task_analyzer_system") == system
+        assert prompt_service.render_prompt(
+            "task_analyzer_user", {"name": "Buy milk"}
+        ).startswith("Task: Buy milk")
+    
+    def test_render_prompt_follows_updates(self, seeded_prompts):
+        """Cached renders should pick up new and rolled-back versions."""
+        from noctem.services.prompt_service import (
+            render_prompt, update_prompt, rollback_prompt, get_prompt
+        )
+        
+        original = get_prompt("task_analyzer_user")
+        assert "Buy milk" in render_prompt("task_analyzer_user", {"name": "Buy milk"})
+        
+        update_prompt("task_analyzer_user", "Do {{name}} now", created_by="test")
+        assert render_prompt("task_analyzer_user", {"name": "it"}) == "Do it now"
+        
+        rollback_prompt("task_analyzer_user", to_version=original.version)
+        assert render_prompt("task_analyzer_user", {"name": "it"}).startswith("Task: it")
+    
+    def test_render_prompt_after_delete_and_recreate(self):
+        """A re-created template must not render the deleted template's text."""
+        from noctem.services.prompt_service import (
+            render_prompt, create_prompt_template, delete_prompt_template
+        )
+        
+        create_prompt_template("cache_test", "First {{x}}")
+        assert render_prompt("cache_test", {"x": 1}) == "First 1"
+        
+        delete_prompt_template("cache_test")
+        assert render_prompt("cache_test") is None
+        create_prompt_template("cache_test", "Second {{x}}")
+        assert render_prompt("cache_test", {"x": 2}) == "Second 2"
+    
+    def test_default_prompt_variables_derived(self):
+        """Default prompt variable lists come from their text."""
+        from noctem.services.prompt_service import DEFAULT_PROMPTS
+        
+        assert DEFAULT_PROMPTS["task_analyzer_user"]["variables"] == ["name", "project", "due_date", "tags"]
+        assert DEFAULT_PROMPTS["task_analyzer_system"]["variables"] == []
 
 
 class TestConversationService:
@@ -4,23 +4,12 @@ Tests for v0.6.0 Phase 4: Integration & Polish.
 Tests the new commands, status endpoints, and integration features.
 """
 import pytest
-import tempfile
-import os
 from datetime import date, datetime
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Set up test database before imports
-TEST_DB = tempfile.mktemp(suffix='.db')
-os.environ['NOCTEM_DB_PATH'] = TEST_DB
-
-# Now import noctem modules
 from noctem import db
 from noctem.db import init_db, get_db
 
-# Override DB path for testing
-db.DB_PATH = Path(TEST_DB)
-
 from noctem.config import Config
 from noctem.services import task_service, project_service
 from noctem.models import Task, Project
@@ -31,16 +20,13 @@ from noctem.models import Task, Project
 # ============================================================================
 
 @pytest.fixture(autouse=True)
-def setup_test_db():
+def setup_test_db(test_db_path):
     """Set up fresh database for each test."""
-    db.DB_PATH = Path(TEST_DB)
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
+    db.DB_PATH = test_db_path
+    test_db_path.unlink(missing_ok=True)
     init_db()
     Config.clear_cache()
     yield
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
 
 
 # ============================================================================
@@ -379,8 +365,8 @@ class TestProcessQueueOnce:
         SlowWorkQueue.queue_task_analysis(task.id)
         
         # Mock the actual analysis to avoid needing Ollama
-        with patch('noctem.slow.loop.analyze_task') as mock_analyze:
-            mock_analyze.return_value = True
+        with patch('noctem.slow.loop.analyze_tasks') as mock_analyze:
+            mock_analyze.return_value = [True]
             
             loop = SlowModeLoop()
             count = loop.process_queue_once(max_items=5)
@@ -10,30 +10,20 @@ Tests cover:
 Note: LLM tests are mocked since Ollama may not be available.
 """
 import pytest
-import tempfile
-import os
 from datetime import date, datetime, timedelta
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Set up test database before imports
-TEST_DB = tempfile.mktemp(suffix='.db')
-os.environ['NOCTEM_DB_PATH'] = TEST_DB
-
-# Now import noctem modules
 from noctem import db
 from noctem.db import get_db, init_db
 
-# Override DB path for testing
-db.DB_PATH = Path(TEST_DB)
-
 from noctem.services import task_service, project_service
 from noctem.config import Config
 from noctem.slow.ollama import OllamaClient, GracefulDegradation, llm_available, llm_generate
 from noctem.slow.queue import SlowWorkQueue, WorkType, WorkStatus
 from noctem.slow.task_analyzer import (
-    analyze_task_for_computer_help, save_task_suggestion,
-    get_tasks_needing_analysis, get_task_suggestion, clear_task_suggestion
+    analyze_task_for_computer_help, analyze_tasks_for_computer_help, save_task_suggestion,
+    get_tasks_needing_analysis, get_task_suggestion, clear_task_suggestion,
+    analyze_and_save, analyze_and_save_batch, _split_numbered
 )
 from noctem.slow.project_analyzer import (
     analyze_project_for_next_action, save_project_suggestion,
@@ -46,16 +36,13 @@ from noctem.slow.loop import (
 
 
 @pytest.fixture(autouse=True)
-def setup_db():
+def setup_db(test_db_path):
     """Set up fresh database for each test."""
-    db.DB_PATH = Path(TEST_DB)
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
+    db.DB_PATH = test_db_path
+    test_db_path.unlink(missing_ok=True)
     init_db()
     Config.clear_cache()
     yield
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
 
 
 class TestOllamaClient:
@@ -255,6 +242,17 @@ class TestSlowWorkQueue:
         item = SlowWorkQueue.get_next_item()
         assert item is not None
         assert item.work_type == WorkType.PROJECT_NEXT_ACTION.value
+    
+    def test_get_next_items_by_type(self):
+        """get_next_items returns ready items of one type, oldest first."""
+        tasks = [task_service.create_task(f"Task {i}") for i in range(3)]
+        project = project_service.create_project("Test project")
+        ids = [SlowWorkQueue.queue_task_analysis(t.id) for t in tasks]
+        SlowWorkQueue.queue_project_analysis(project.id)
+        
+        items = SlowWorkQueue.get_next_items(WorkType.TASK_COMPUTER_HELP.value, 2)
+        
+        assert [item.id for item in items] == ids[:2]
 
 
 class TestTaskAnalyzer:
@@ -274,6 +272,26 @@ class TestTaskAnalyzer:
         assert task1.id in task_ids
         assert task2.id not in task_ids
     
+    def test_tasks_needing_analysis_order(self):
+        """Dated tasks come first by due date, then undated by importance."""
+        undated_low = task_service.create_task("Undated low", importance=0.2)
+        undated_high = task_service.create_task("Undated high", importance=0.9)
+        later = task_service.create_task("Later", due_date=date(2030, 1, 2))
+        sooner = task_service.create_task("Sooner", due_date=date(2030, 1, 1))
+        
+        task_ids = [t.id for t in get_tasks_needing_analysis(limit=100)]
+        
+        ours = [i for i in task_ids if i in {undated_low.id, undated_high.id, later.id, sooner.id}]
+        assert ours == [sooner.id, later.id, undated_high.id, undated_low.id]
+    
+    def test_tasks_needing_analysis_use_reader_connection(self):
+        """The lookup is a pure read and shouldn't touch the writer connection."""
+        task_service.create_task("Needs analysis")
+        db.close_pooled_connections()
+        
+        assert get_tasks_needing_analysis()
+        assert db._local.entry is None
+    
     def test_save_task_suggestion(self):
         """save_task_suggestion should store the suggestion."""
         task = task_service.create_task("Test task")
@@ -303,6 +321,147 @@ class TestTaskAnalyzer:
         
         assert result == "Test suggestion"
         assert mock_llm.called
+    
+    def test_split_numbered_reply(self):
+        """Numbered replies split into one answer per task."""
+        reply = "Sure!\n1. Set a reminder\n  over two lines\n2)\n3. Draft a template"
+        
+        assert _split_numbered(reply, 3) == [
+            "Set a reminder\n  over two lines", None, "Draft a template"
+        ]
+    
+    def test_split_numbered_reply_keeps_nested_lists(self):
+        """Indented sub-items stay inside their task's answer."""
+        reply = "1. Set reminders for:\n   1. the form\n   2. the photo\n2. Draft an email template"
+        
+        assert _split_numbered(reply, 2) == [
+            "Set reminders for:\n   1. the form\n   2. the photo", "Draft an email template"
+        ]
+    
+    @pytest.mark.parametrize("reply", [
+        "1. One\n3. Three",
+        "2. Two\n1. One",
+        "1. One\n2. Two\n3. Extra",
+        "1. Steps:\n1. first\n2. second\n2. Two",
+    ])
+    def test_split_numbered_reply_rejects_misaligned(self, reply):
+        """Skipped, reordered, extra or restarted numbers can't be matched up."""
+        assert _split_numbered(reply, 2) is None
+    
+    @patch('noctem.slow.task_analyzer.llm_generate')
+    def test_analyze_batch_uses_one_request(self, mock_llm):
+        """A batch of tasks shares one LLM call and one save."""
+        mock_llm.return_value = "1. Remind you\n2.\n3. Find recipes"
+        tasks = [task_service.create_task(name) for name in ("Call mom", "Think", "Cook")]
+        
+        results = analyze_and_save_batch(tasks)
+        
+        assert mock_llm.call_count == 1
+        prompt = mock_llm.call_args.args[0]
+        assert "1. Call mom" in prompt and "3. Cook" in prompt
+        assert results == [True, False, True]
+        assert get_task_suggestion(tasks[0].id) == "Remind you"
+        assert get_task_suggestion(tasks[1].id) is None
+        assert get_task_suggestion(tasks[2].id) == "Find recipes"
+    
+    @patch('noctem.slow.task_analyzer.llm_generate')
+    def test_misaligned_batch_reply_falls_back_per_task(self, mock_llm):
+        """A reply that can't be matched to tasks is discarded, not saved."""
+        mock_llm.side_effect = ["1. Remind you\n3. Find recipes", "Remind you", "Find recipes"]
+        tasks = [task_service.create_task(name) for name in ("Call mom", "Cook")]
+        
+        results = analyze_and_save_batch(tasks)
+        
+        assert mock_llm.call_count == 3
+        assert results == [True, True]
+        assert get_task_suggestion(tasks[1].id) == "Find recipes"
+    
+    @patch('noctem.slow.task_analyzer.llm_generate')
+    def test_analyze_and_save_single_task(self, mock_llm):
+        """A single task keeps the per-task prompt."""
+        mock_llm.return_value = "Set a reminder"
+        task = task_service.create_task("Buy groceries")
+        
+        assert analyze_and_save(task) is True
+        assert mock_llm.call_args.args[0].startswith("Task: Buy groceries")
+        assert get_task_suggestion(task.id) == "Set a reminder"
+    
+    @patch('noctem.slow.task_analyzer.llm_generate')
+    def test_unchanged_task_reuses_cached_suggestion(self, mock_llm):
+        """Identical prompts skip the LLM until the task changes or is cleared."""
+        mock_llm.return_value = "Set a reminder"
+        task = task_service.create_task("Renew passport")
+        twin = task_service.create_task("Renew passport")
+        
+        assert analyze_task_for_computer_help(task) == "Set a reminder"
+        assert analyze_task_for_computer_help(twin) == "Set a reminder"
+        assert mock_llm.call_count == 1
+        
+        task.name = "Renew passport online"
+        analyze_task_for_computer_help(task)
+        assert mock_llm.call_count == 2
+        
+        clear_task_suggestion(twin.id)
+        analyze_task_for_computer_help(twin)
+        assert mock_llm.call_count == 3
+    
+    @patch('noctem.slow.task_analyzer.llm_generate')
+    def test_batch_only_sends_uncached_tasks(self, mock_llm):
+        """Cached tasks are answered locally; the rest share one request."""
+        mock_llm.return_value = "Cached answer"
+        cached = task_service.create_task("Water plants")
+        analyze_task_for_computer_help(cached)
+        
+        mock_llm.reset_mock()
+        mock_llm.return_value = "1. Book online\n2. Use a list"
+        tasks = [cached] + [task_service.create_task(name) for name in ("Book dentist", "Shop")]
+        
+        results = analyze_and_save_batch(tasks)
+        
+        assert results == [True, True, True]
+        assert mock_llm.call_count == 1
+        prompt = mock_llm.call_args.args[0]
+        assert "Water plants" not in prompt
+        assert "1. Book dentist" in prompt and "2. Shop" in prompt
+        assert get_task_suggestion(cached.id) == "Cached answer"
+        assert get_task_suggestion(tasks[2].id) == "Use a list"
+    
+    @patch('noctem.slow.task_analyzer.llm_generate')
+    def test_batch_answers_keyed_by_batch_prompt(self, mock_llm):
+        """Editing the batch template misses answers cached from batches."""
+        from noctem.services.prompt_service import get_prompt, update_prompt
+        
+        mock_llm.return_value = "1. Book online\n2. Use a list"
+        tasks = [task_service.create_task(name) for name in ("Book dentist", "Shop")]
+        analyze_tasks_for_computer_help(tasks)
+        analyze_tasks_for_computer_help(tasks)
+        assert mock_llm.call_count == 1
+        
+        template = get_prompt("task_analyzer_batch_user").prompt_text
+        update_prompt("task_analyzer_batch_user", "Answer briefly.\n" + template)
+        assert analyze_tasks_for_computer_help(tasks) == ["Book online", "Use a list"]
+        assert mock_llm.call_count == 2
+        
+        clear_task_suggestion(tasks[0].id)
+        mock_llm.return_value = "Fresh answer"
+        assert analyze_tasks_for_computer_help(tasks) == ["Fresh answer", "Use a list"]
+        assert mock_llm.call_count == 3
+    
+    @patch('noctem.slow.task_analyzer.llm_generate')
+    def test_saving_suggestions_prunes_expired_cache(self, mock_llm):
+        """Cache rows older than SUGGESTION_CACHE_DAYS are deleted on save."""
+        with get_db() as conn:
+            conn.execute("""
+                INSERT INTO task_suggestion_cache (key, suggestion, created_at)
+                VALUES ('stale', 'old', datetime('now', '-31 days'))
+            """)
+        mock_llm.return_value = "Set a reminder"
+        
+        analyze_task_for_computer_help(task_service.create_task("Renew passport"))
+        
+        with get_db() as conn:
+            keys = [row[0] for row in conn.execute("SELECT key FROM task_suggestion_cache")]
+        assert len(keys) == 1 and keys != ["stale"]
 
 
 class TestProjectAnalyzer:
@@ -429,6 +588,24 @@ class TestSlowModeIntegration:
         # Now project should be available
         second = SlowWorkQueue.get_next_item()
         assert second.work_type == WorkType.PROJECT_NEXT_ACTION.value
+    
+    def test_loop_analyzes_queued_tasks_together(self):
+        """Queued task analyses are claimed and analyzed as one batch."""
+        tasks = [task_service.create_task(f"Task {i}") for i in range(3)]
+        item_ids = [SlowWorkQueue.queue_task_analysis(t.id) for t in tasks]
+        
+        with patch('noctem.slow.loop.analyze_tasks') as mock_analyze:
+            mock_analyze.return_value = [True, False, True]
+            assert SlowModeLoop()._process_one_item() is True
+        
+        assert mock_analyze.call_count == 1
+        assert [t.id for t in mock_analyze.call_args.args[0]] == [t.id for t in tasks]
+        with get_db() as conn:
+            statuses = [
+                conn.execute("SELECT status FROM slow_work_queue WHERE id = ?", (i,)).fetchone()[0]
+                for i in item_ids
+            ]
+        assert statuses == ["completed", "failed", "completed"]
 
 
 if __name__ == "__main__":
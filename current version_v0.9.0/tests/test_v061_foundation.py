@@ -8,34 +8,21 @@ Tests cover:
 - Maintenance scanner (insights, reports)
 """
 import pytest
-import tempfile
-import os
+import sqlite3
 from datetime import datetime, timedelta
-from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-# Set up test database before imports
-TEST_DB = tempfile.mktemp(suffix='.db')
-os.environ['NOCTEM_DB_PATH'] = TEST_DB
-
-# Now import noctem modules
 from noctem import db
 from noctem.db import get_db, init_db
 
-# Override DB path for testing
-db.DB_PATH = Path(TEST_DB)
-
 
 @pytest.fixture(autouse=True)
-def setup_db():
+def setup_db(test_db_path):
     """Set up fresh database for each test."""
-    db.DB_PATH = Path(TEST_DB)
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
+    db.DB_PATH = test_db_path
+    test_db_path.unlink(missing_ok=True)
     init_db()
     yield
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
 
 
 # =============================================================================
@@ -602,6 +589,157 @@ class TestDatabaseSchema:
         
         assert result is not None
         assert result[0] == 1
+    
+    def test_pending_insights_query_uses_index(self):
+        """Pending-insight listing should be an index range scan, not a sort."""
+        with get_db() as conn:
+            plan = " ".join(row[3] for row in conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT * FROM maintenance_insights
+                WHERE status = 'pending'
+                ORDER BY priority DESC, created_at DESC
+                LIMIT 10
+            """))
+        
+        assert "idx_insights_status_prio_created" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_insight_queries_avoid_table_sorts(self):
+        """Insight listings and the summary should be served by indexes."""
+        from noctem.services.insight_service import _ALL_INSIGHTS_SQL
+        
+        with get_db() as conn:
+            def plan(sql, params=()):
+                return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+            
+            assert "TEMP B-TREE" not in plan(_ALL_INSIGHTS_SQL[False], (10,))
+            assert "TEMP B-TREE" not in plan(_ALL_INSIGHTS_SQL[True], ("pending", 10))
+            summary_plan = plan("""
+                SELECT priority, COUNT(*) FROM maintenance_insights
+                WHERE status = 'pending' GROUP BY priority
+            """)
+        assert "COVERING INDEX idx_insights_status_prio_created" in summary_plan
+    
+    def test_prompt_lookups_use_indexes(self):
+        """get_prompt and history lookups should be index searches, not scans."""
+        from noctem.services.prompt_service import _GET_PROMPT_SQL, _PROMPT_HISTORY_SQL
+        
+        with get_db() as conn:
+            def plan(sql, params):
+                return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+            
+            get_plan = plan(_GET_PROMPT_SQL, (None, "x"))
+            history_plan = plan(_PROMPT_HISTORY_SQL, ("x",))
+            template_id = conn.execute(
+                "INSERT INTO prompt_templates (name) VALUES ('index_test_prompt')"
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO prompt_versions (template_id, version, prompt_text) VALUES (?, 1, 'a')",
+                (template_id,)
+            )
+            with pytest.raises(sqlite3.IntegrityError, match="UNIQUE"):
+                conn.execute(
+                    "INSERT INTO prompt_versions (template_id, version, prompt_text) VALUES (?, 1, 'b')",
+                    (template_id,)
+                )
+            conn.rollback()
+        
+        assert "SEARCH t USING INDEX" in get_plan
+        assert "idx_prompt_versions_tpl_ver" in get_plan
+        assert "SCAN" not in get_plan
+        assert "idx_prompt_versions_tpl_ver" in history_plan
+        assert "TEMP B-TREE" not in history_plan
+    
+    def test_projects_suggestion_index_exists(self):
+        """Partial index for projects with suggestions should be created."""
+        with get_db() as conn:
+            result = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_projects_suggestion'"
+            ).fetchone()
+        assert result is not None
+    
+    def test_pattern_detection_queries_use_indexes(self):
+        """Pattern detection windows should be index range searches."""
+        with get_db() as conn:
+            def plan(where):
+                sql = f"EXPLAIN QUERY PLAN SELECT raw_text FROM thoughts WHERE {where} AND created_at >= datetime('now', '-30 days')"
+                return " ".join(row[3] for row in conn.execute(sql))
+            
+            ambiguous_plan = plan("kind = 'ambiguous'")
+            summon_plan = plan("summon_mode = 1")
+        assert "idx_thoughts_kind_created (kind=? AND created_at>?)" in ambiguous_plan
+        assert "idx_thoughts_summon_created (created_at>?)" in summon_plan
+    
+    def test_pattern_aggregates_use_covering_indexes(self):
+        """Clarification and model-performance aggregates never read the tables."""
+        with get_db() as conn:
+            def plan(sql):
+                return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+            
+            clarification_plan = plan("""
+                SELECT ambiguity_reason, COUNT(*),
+                       COUNT(CASE WHEN status = 'clarified' THEN 1 END),
+                       AVG(julianday(processed_at) - julianday(created_at))
+                FROM thoughts
+                WHERE kind = 'ambiguous' AND created_at >= datetime('now', '-30 days')
+                GROUP BY ambiguity_reason
+            """)
+            model_plan = plan("""
+                SELECT model_used, component, COUNT(*), AVG(duration_ms), AVG(confidence),
+                       SUM(CASE WHEN error IS NOT NULL THEN 1 ELSE 0 END)
+                FROM execution_logs
+                WHERE timestamp >= datetime('now', '-7 days') AND model_used IS NOT NULL
+                GROUP BY model_used, component
+            """)
+        assert "COVERING INDEX idx_thoughts_kind_created (kind=? AND created_at>?)" in clarification_plan
+        assert "COVERING INDEX idx_execution_logs_model_perf (timestamp>?)" in model_plan
+    
+    def test_detected_pattern_lookups_touch_one_btree(self):
+        """Natural-key lookups are index-only; by-id updates use the rowid."""
+        from noctem.slow.pattern_detection import _PATTERN_ID_SQL
+        
+        with get_db() as conn:
+            key_plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN " + _PATTERN_ID_SQL, ("ambiguity", "phrase:x")
+            ))
+            id_plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN UPDATE detected_patterns SET status = 'dismissed' WHERE id = ?", (1,)
+            ))
+        assert "COVERING INDEX" in key_plan
+        assert "INTEGER PRIMARY KEY" in id_plan
+    
+    def test_promotable_patterns_need_no_sort(self):
+        """The promotable-pattern ranking streams from idx_patterns_status."""
+        from noctem.slow.pattern_detection import _PROMOTABLE_PATTERNS_SQL
+        
+        with get_db() as conn:
+            plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN " + _PROMOTABLE_PATTERNS_SQL, (5, 0.6, 10)
+            ))
+        assert "idx_patterns_status" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_tasks_needing_analysis_use_partial_index(self):
+        """Only unfinished, unanalyzed tasks are scanned, already in order."""
+        from noctem.slow.task_analyzer import _TASKS_NEEDING_ANALYSIS_SQL
+        
+        with get_db() as conn:
+            plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN " + _TASKS_NEEDING_ANALYSIS_SQL, (5,)
+            ))
+        assert "idx_tasks_needs_analysis" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_narrow_covering_index_is_rebuilt(self):
+        """An older index under a covering index's name is widened on migration."""
+        from noctem.db import COVERING_INDEXES, _ensure_covering_indexes
+        
+        with get_db() as conn:
+            conn.execute("DROP INDEX idx_thoughts_kind_created")
+            conn.execute("CREATE INDEX idx_thoughts_kind_created ON thoughts(kind, created_at)")
+            _ensure_covering_indexes(conn)
+            columns = tuple(row[2] for row in conn.execute("PRAGMA index_info(idx_thoughts_kind_created)"))
+        assert columns == COVERING_INDEXES["idx_thoughts_kind_created"][1]
 
 
 # =============================================================================
@@ -631,7 +769,17 @@ class TestNewDataclasses:
         assert log.trace_id == "test-trace"
         assert log.confidence == 0.9
         assert log.input_data == {"key": "value"}
-    
+        # from_row skips __init__, so compare against a normally built instance
+        assert log == ExecutionLog(
+            id=log.id,
+            trace_id="test-trace",
+            timestamp=log.timestamp,
+            stage="test",
+            component="fast",
+            input_data={"key": "value"},
+            confidence=0.9,
+        )
+
     def test_model_info_from_row(self):
         """ModelInfo should parse from database row."""
         from noctem.models import ModelInfo
@@ -671,6 +819,29 @@ class TestNewDataclasses:
         assert insight.priority == 4
         assert insight.details == {"info": "data"}
 
+    def test_maintenance_insight_details_json_cached(self):
+        """details_json should be reused until details is reassigned."""
+        from noctem.models import MaintenanceInsight
+
+        insight = MaintenanceInsight(title="Cached", details={"a": 1})
+        first = insight.details_json()
+        assert first == '{"a": 1}'
+        assert insight.details_json() is first
+
+        insight.details = {"b": 2}
+        assert insight.details_json() == '{"b": 2}'
+
+        insight.details = {}
+        assert insight.details_json() is None
+
+    def test_list_models_are_slotted(self):
+        """Models built in bulk by list endpoints shouldn't carry a per-instance dict."""
+        from noctem.models import MaintenanceInsight, LearnedRule, Project
+
+        for obj in (MaintenanceInsight(), LearnedRule(), Project()):
+            assert not hasattr(obj, "__dict__")
+        assert MaintenanceInsight(title="x") == MaintenanceInsight(title="x")
+
 
 # =============================================================================
 # CONFIG TESTS
@@ -3,35 +3,22 @@ Tests for Noctem v0.7.0 Self-Improvement Engine.
 
 Covers pattern detection, log review, improvement engine, and integration.
 """
+import json
 import pytest
-import tempfile
-import os
 from datetime import datetime, timedelta
-from pathlib import Path
 
-# Set up test database before imports
-TEST_DB = tempfile.mktemp(suffix='.db')
-os.environ['NOCTEM_DB_PATH'] = TEST_DB
-
-# Now import noctem modules
 from noctem import db
 from noctem.db import get_db, init_db
 from noctem.models import Thought, DetectedPattern, MaintenanceInsight, LearnedRule
 
-# Override DB path for testing
-db.DB_PATH = Path(TEST_DB)
-
 
 @pytest.fixture(autouse=True)
-def setup_db():
+def setup_db(test_db_path):
     """Set up fresh database for each test."""
-    db.DB_PATH = Path(TEST_DB)
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
+    db.DB_PATH = test_db_path
+    test_db_path.unlink(missing_ok=True)
     init_db()
     yield
-    if Path(TEST_DB).exists():
-        Path(TEST_DB).unlink()
 
 
 # =============================================================================
@@ -62,6 +49,40 @@ class TestPatternDetection:
         assert len(work_on_patterns) > 0
         assert work_on_patterns[0]["occurrence_count"] >= MIN_OCCURRENCES
     
+    def test_recurring_ambiguities_keep_three_examples(self):
+        """Counts cover every occurrence; only the first three examples are kept."""
+        from noctem.slow.pattern_detection import detect_recurring_ambiguities
+        
+        with get_db() as conn:
+            for i in range(7):
+                conn.execute("""
+                    INSERT INTO thoughts (source, raw_text, kind, ambiguity_reason, confidence, status)
+                    VALUES ('cli', ?, 'ambiguous', 'timing', 0.3, 'pending')
+                """, (f"Call Mom about thing{i}",))
+        
+        patterns = {p["pattern_key"]: p for p in detect_recurring_ambiguities(days=30)}
+        call_mom = patterns["phrase:call mom"]
+        assert call_mom["occurrence_count"] == 7
+        assert call_mom["ambiguity_reason"] == "timing"
+        assert call_mom["confidence"] == 1.0
+        assert call_mom["example_texts"] == [f"call mom about thing{i}" for i in range(3)]
+        assert "phrase:about thing0" not in patterns
+    
+    def test_recurring_ambiguities_lowercase_non_ascii(self):
+        """Non-ASCII capitals fold the same way str.lower() folds them."""
+        from noctem.slow.pattern_detection import detect_recurring_ambiguities
+        
+        with get_db() as conn:
+            for text in ["ÉCRIRE Le rapport", "écrire le rapport", "Écrire LE RAPPORT"] * 2:
+                conn.execute("""
+                    INSERT INTO thoughts (source, raw_text, kind, ambiguity_reason, confidence, status)
+                    VALUES ('cli', ?, 'ambiguous', 'scope', 0.3, 'pending')
+                """, (text,))
+        
+        patterns = {p["pattern_key"]: p for p in detect_recurring_ambiguities(days=30)}
+        assert patterns["phrase:écrire le"]["occurrence_count"] == 6
+        assert patterns["phrase:écrire le"]["example_texts"] == ["écrire le rapport"] * 3
+    
     def test_detect_extraction_failures(self):
         """Should detect time word extraction failures."""
         from noctem.slow.pattern_detection import detect_extraction_failures, MIN_OCCURRENCES
@@ -90,6 +111,22 @@ class TestPatternDetection:
         assert len(later_patterns) > 0
         assert later_patterns[0]["occurrence_count"] >= MIN_OCCURRENCES
     
+    def test_extraction_failures_match_whole_words(self):
+        """Time words count once per thought and only as whole words."""
+        from noctem.slow.pattern_detection import detect_extraction_failures
+        
+        with get_db() as conn:
+            for i in range(5):
+                conn.execute("""
+                    INSERT INTO thoughts (source, raw_text, kind, confidence, status)
+                    VALUES ('cli', ?, 'actionable', 0.5, 'processed')
+                """, (f"Tonight, maybe tonight: item {i} sooner",))
+        
+        patterns = {p["pattern_key"]: p for p in detect_extraction_failures(days=30)}
+        assert patterns["time_word:tonight"]["occurrence_count"] == 5
+        assert len(patterns["time_word:tonight"]["example_texts"]) == 3
+        assert "time_word:soon" not in patterns
+    
     def test_detect_user_corrections(self):
         """Should detect patterns in user corrections."""
         from noctem.slow.pattern_detection import detect_user_corrections, MIN_OCCURRENCES
@@ -143,6 +180,171 @@ class TestPatternDetection:
         # Should only include high occurrence pattern
         assert len(promotable) == 1
         assert promotable[0].pattern_key == "high_occurrence"
+    
+    def test_window_cutoff_matches_sqlite_timestamps(self):
+        """The Python cutoff compares like SQLite's own datetime('now', '-N days')."""
+        from noctem.slow.pattern_detection import _cutoff
+        
+        with get_db() as conn:
+            sqlite_cutoff = conn.execute("SELECT datetime('now', '-30 days')").fetchone()[0]
+        cutoff = _cutoff(30)
+        assert len(cutoff) == len(sqlite_cutoff)
+        assert abs(datetime.fromisoformat(cutoff) - datetime.fromisoformat(sqlite_cutoff)) <= timedelta(seconds=1)
+    
+    def test_detect_clarification_patterns_buckets(self):
+        """Ignored and quickly-answered clarification types become patterns; others don't."""
+        from noctem.slow.pattern_detection import detect_clarification_patterns
+        
+        with get_db() as conn:
+            def add(reason, count, status, hours=None):
+                for _ in range(count):
+                    conn.execute("""
+                        INSERT INTO thoughts (source, raw_text, kind, ambiguity_reason, status, processed_at)
+                        VALUES ('cli', 'x', 'ambiguous', ?, ?, datetime('now', ? || ' hours'))
+                    """, (reason, status, hours))
+            add("scope", 6, "pending")                  # 0% resolved
+            add("timing", 5, "clarified", hours=1)      # 100% resolved in ~1h
+            add("intent", 3, "clarified", hours=1)      # 50% resolved
+            add("intent", 3, "pending")
+            add("rare", 2, "pending")                   # below MIN_OCCURRENCES
+        
+        patterns = {p["pattern_key"]: p for p in detect_clarification_patterns(days=30)}
+        assert set(patterns) == {"clarification:low_response_scope", "clarification:effective_timing"}
+        assert patterns["clarification:low_response_scope"]["resolution_rate"] == 0.0
+        assert patterns["clarification:effective_timing"]["occurrence_count"] == 5
+        assert patterns["clarification:effective_timing"]["resolution_rate"] == 1.0
+    
+    def test_detect_model_performance_picks_best_and_worst(self):
+        """A >10% error-rate gap between a component's best and worst model is a pattern."""
+        from noctem.slow.pattern_detection import detect_model_performance_patterns
+        
+        with get_db() as conn:
+            def log(model, component, errors, confidence=0.8):
+                for i in range(10):
+                    conn.execute("""
+                        INSERT INTO execution_logs (trace_id, component, model_used, confidence, error)
+                        VALUES ('t', ?, ?, ?, ?)
+                    """, (component, model, confidence, "boom" if i < errors else None))
+            log("a", "fast", 0)
+            log("b", "fast", 3)
+            log("c", "fast", 3)     # ties with b: the later model is the worst
+            log("a", "slow", 1)
+            log("b", "slow", 0)     # only a 10% gap: not a pattern
+            log("d", "butler", 0)   # single model: nothing to compare
+        
+        patterns = detect_model_performance_patterns(days=7)
+        assert [p["pattern_key"] for p in patterns] == ["model_perf:fast:a_better"]
+        details = patterns[0]["details"]
+        assert (details["better_model"], details["worse_model"]) == ("a", "c")
+        assert details["error_rate_diff"] == 0.3
+        assert patterns[0]["occurrence_count"] == 20
+    
+    def test_read_only_helpers_use_reader_connection(self):
+        """Detectors (including streamed ones) and promotable-pattern lookups read on the query_only connection."""
+        from noctem.slow.pattern_detection import (
+            detect_recurring_ambiguities, detect_user_corrections, get_promotable_patterns
+        )
+        
+        db.close_pooled_connections()
+        detect_recurring_ambiguities(days=30)  # streams via iter_rows
+        detect_user_corrections(days=30)
+        get_promotable_patterns()
+        
+        assert db._local.entry is None
+        assert db._local.reader[0].execute("PRAGMA query_only").fetchone()[0] == 1
+    
+    def test_run_all_pattern_detection_threads_only_outside_transactions(self):
+        """Detectors run on worker threads, but inline inside a get_db() block."""
+        import threading
+        from unittest.mock import patch
+        from noctem.slow import pattern_detection
+        
+        threads = []
+        def detect(days):
+            threads.append(threading.current_thread())
+            return []
+        
+        names = [
+            "detect_recurring_ambiguities", "detect_extraction_failures",
+            "detect_user_corrections", "detect_clarification_patterns",
+            "detect_model_performance_patterns",
+        ]
+        with patch.multiple(pattern_detection, **{name: detect for name in names}):
+            results = pattern_detection.run_all_pattern_detection(days=30)
+            assert threading.current_thread() not in threads
+            
+            threads.clear()
+            with get_db():
+                pattern_detection.run_all_pattern_detection(days=30)
+            assert threads == [threading.current_thread()] * len(names)
+        
+        assert list(results) == [
+            "ambiguities", "extraction_failures", "user_corrections",
+            "clarifications", "model_performance",
+        ]
+    
+    def test_bulk_save_accumulates_like_single_save(self):
+        """Bulk saves should insert new patterns and add to existing counts."""
+        from noctem.slow.pattern_detection import save_detected_patterns, save_detected_pattern
+        
+        existing_id = save_detected_pattern("test", "existing", 4, 0.5, {"old": True})
+        
+        saved = save_detected_patterns({"test": [
+            {"pattern_key": "existing", "occurrence_count": 3, "confidence": 0.9},
+            {"pattern_key": "new", "occurrence_count": 5},
+        ]})
+        
+        with get_db() as conn:
+            rows = {
+                row["pattern_key"]: row
+                for row in conn.execute(
+                    "SELECT * FROM detected_patterns WHERE pattern_type = 'test'"
+                )
+            }
+        
+        assert saved == 2
+        assert rows["existing"]["occurrence_count"] == 7
+        assert rows["existing"]["confidence"] == 0.9
+        assert json.loads(rows["existing"]["context"])["pattern_key"] == "existing"
+        assert rows["new"]["occurrence_count"] == 5
+        assert rows["new"]["confidence"] == 0.8
+        assert rows["existing"]["id"] == existing_id
+    
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_save_detected_pattern_returns_id_on_update(self, returning):
+        """Re-saving a pattern returns its existing id and adds to its count."""
+        from unittest.mock import patch
+        from noctem.slow import pattern_detection
+        
+        with patch.object(pattern_detection, "SUPPORTS_RETURNING", returning):
+            first = pattern_detection.save_detected_pattern("test", "p", 2, 0.5, {})
+            other = pattern_detection.save_detected_pattern("test", "q", 1, 0.5, {})
+            again = pattern_detection.save_detected_pattern("test", "p", 3, 0.5, {})
+        
+        with get_db() as conn:
+            count = conn.execute("SELECT occurrence_count FROM detected_patterns WHERE id = ?", (first,)).fetchone()[0]
+        assert again == first != other
+        assert count == 5
+    
+    def test_update_pattern_statuses_in_bulk(self):
+        """Status updates for many patterns apply together; wrappers still work."""
+        from noctem.slow import pattern_detection
+        
+        ids = [
+            pattern_detection.save_detected_pattern("test", key, 1, 0.5, {})
+            for key in ("a", "b", "c", "d")
+        ]
+        pattern_detection.update_pattern_statuses(
+            [(ids[0], "dismissed"), (ids[1], "promoted_to_insight")]
+        )
+        pattern_detection.mark_pattern_promoted(ids[2])
+        pattern_detection.dismiss_pattern(ids[3])
+        
+        with get_db() as conn:
+            statuses = dict(conn.execute("SELECT id, status FROM detected_patterns").fetchall())
+        assert [statuses[i] for i in ids] == [
+            "dismissed", "promoted_to_insight", "promoted_to_insight", "dismissed"
+        ]
 
 
 # =============================================================================
@@ -180,6 +382,86 @@ class TestLogReview:
         # Should trigger review
         assert should_run_log_review() == True
     
+    def test_should_run_log_review_by_age(self):
+        """A recent quiet review waits; a week-old one triggers."""
+        from noctem.slow import log_review
+        
+        with get_db() as conn:
+            conn.execute("""
+                INSERT INTO maintenance_insights (insight_type, source, title, details, priority, status, created_at)
+                VALUES ('pattern', 'log_review', 'Test', '{}', 3, 'pending', datetime('now', '-2 days'))
+            """)
+        assert log_review.should_run_log_review() == False
+        
+        with get_db() as conn:
+            conn.execute("UPDATE maintenance_insights SET created_at = datetime('now', '-8 days')")
+        log_review._status_cache.clear()
+        assert log_review.should_run_log_review() == True
+    
+    def test_log_review_status_is_cached_until_review(self):
+        """Status polls reuse a cached answer; a review clears it."""
+        from unittest.mock import patch
+        from noctem.slow import log_review
+        
+        status = log_review.get_log_review_status()
+        assert status["should_run_now"] is True
+        status["pending_insights"] = 99
+        
+        with patch.object(log_review, "get_db") as mock_db:
+            assert log_review.should_run_log_review() is True
+            assert log_review.get_log_review_status()["pending_insights"] == 0
+        mock_db.assert_not_called()
+        
+        log_review.run_log_review(days=30)
+        assert log_review._status_cache == {}
+    
+    def test_promotable_count_shared_across_checks(self):
+        """Status, should-run and recommendations load promotable patterns once."""
+        from unittest.mock import patch
+        from noctem.slow import log_review
+        
+        with get_db() as conn:
+            conn.execute("""
+                INSERT INTO maintenance_insights (insight_type, source, title, details, priority, status, created_at)
+                VALUES ('pattern', 'log_review', 'Test', '{}', 3, 'pending', datetime('now', '-1 day'))
+            """)
+        
+        with patch.object(log_review, "get_promotable_patterns", return_value=[]) as mock_get:
+            log_review.get_log_review_status()
+            log_review.get_log_review_recommendations()
+        assert mock_get.call_count == 1
+    
+    def test_recommendations_match_trace_analyzer(self):
+        """Recommendations flag the problems the trace analyzer and pattern lookups report."""
+        from noctem.logging import trace_analyzer
+        from noctem.slow import log_review
+        from noctem.slow.pattern_detection import save_detected_pattern, MIN_OCCURRENCES, MIN_CONFIDENCE
+        
+        with get_db() as conn:
+            for i in range(10):
+                conn.execute("""
+                    INSERT INTO execution_logs (trace_id, confidence, error)
+                    VALUES (?, 0.4, ?)
+                """, (f"t{i}", "boom" if i < 2 else None))
+            for i in range(12):
+                conn.execute("""
+                    INSERT INTO thoughts (source, raw_text, kind, status)
+                    VALUES ('cli', ?, 'ambiguous', ?)
+                """, (f"thought {i}", "clarified" if i == 0 else "pending"))
+        for i in range(6):
+            save_detected_pattern("ambiguities", f"phrase:{i}", MIN_OCCURRENCES, MIN_CONFIDENCE, {})
+        
+        stats = trace_analyzer.get_execution_stats(hours=24)
+        clarifications = trace_analyzer.get_clarification_outcomes(days=7)
+        recommendations = log_review.get_log_review_recommendations()
+        
+        assert len(recommendations) == 4
+        assert f"{stats['error_rate']:.1f}%" in recommendations[0]
+        assert f"{stats['avg_confidence']:.2f}" in recommendations[1]
+        assert f"{clarifications['clarifications_pending']} clarifications pending" in recommendations[2]
+        assert f"{clarifications['resolution_rate']:.1f}%" in recommendations[2]
+        assert recommendations[3].startswith("💡 6 patterns")
+    
     def test_log_review_creates_insights(self):
         """End-to-end: log review should create insights from patterns."""
         from noctem.slow.log_review import run_log_review
@@ -204,6 +486,40 @@ class TestLogReview:
         # Should have created insights (max 3)
         assert summary["patterns_promoted"] <= 3
         assert len(summary["insights_created"]) <= 3
+    
+    def test_log_review_failure_only_undoes_that_pattern(self):
+        """A pattern that fails mid-promotion leaves no orphan insight behind."""
+        from unittest.mock import patch
+        from noctem.slow import pattern_detection
+        from noctem.slow.log_review import run_log_review
+        from noctem.slow.pattern_detection import save_detected_pattern, MIN_OCCURRENCES, MIN_CONFIDENCE
+        
+        for i in range(2):
+            save_detected_pattern(
+                pattern_type="ambiguities",
+                pattern_key=f"phrase:savepoint {i}",
+                occurrence_count=MIN_OCCURRENCES + 5 - i,
+                confidence=MIN_CONFIDENCE + 0.2,
+                context={"ambiguity_reason": "scope", "example_texts": []}
+            )
+        
+        calls = []
+        def flaky_mark(pattern_id):
+            calls.append(pattern_id)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            pattern_detection.mark_pattern_promoted(pattern_id)
+        
+        with patch("noctem.slow.log_review.mark_pattern_promoted", side_effect=flaky_mark):
+            summary = run_log_review(days=30)
+        
+        with get_db() as conn:
+            insight_ids = [row[0] for row in conn.execute("SELECT id FROM maintenance_insights")]
+            statuses = dict(conn.execute("SELECT id, status FROM detected_patterns").fetchall())
+        assert summary["insights_created"] == insight_ids
+        assert len(insight_ids) == 1
+        assert statuses[calls[0]] == "pending"
+        assert statuses[calls[1]] == "promoted_to_insight"
 
 
 # =============================================================================
@@ -243,6 +559,46 @@ class TestImprovementEngine:
         assert insight.insight_type == "pattern"
         assert insight.priority >= 3
     
+    def test_generate_insight_dispatches_by_pattern_type(self):
+        """Each known pattern type gets its own insight; unknown types get none."""
+        from noctem.slow.improvement_engine import generate_insight_from_pattern
+        
+        extraction = DetectedPattern(
+            id=1, pattern_type="extraction_failures", pattern_key="time_word:tonight",
+            occurrence_count=5, context={"example_texts": []},
+        )
+        insight = generate_insight_from_pattern(extraction)
+        assert insight.insight_type == "recommendation"
+        assert insight.details["suggested_mapping"] == "today 8pm"
+        
+        unknown = DetectedPattern(id=2, pattern_type="nonsense", pattern_key="x", context={})
+        assert generate_insight_from_pattern(unknown) is None
+        with get_db() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM maintenance_insights").fetchone()[0] == 1
+    
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_saves_return_row_ids(self, returning):
+        """Insight and rule saves return the stored ids, with or without RETURNING."""
+        from unittest.mock import patch
+        from noctem.slow import improvement_engine
+        
+        insight = MaintenanceInsight(
+            insight_type="pattern", source="log_review", title="t", details={"examples": ["é"]}
+        )
+        rule = LearnedRule(rule_type="ambiguity_flag", rule_key="phrase:x", rule_value={"phrase": "x"})
+        with patch.object(improvement_engine, "SUPPORTS_RETURNING", returning):
+            insight_id = improvement_engine._save_insight(insight)
+            rule_id = improvement_engine._save_learned_rule(rule)
+        
+        with get_db() as conn:
+            insight_row = conn.execute("SELECT id, details FROM maintenance_insights").fetchone()
+            rule_row = conn.execute("SELECT id, rule_value FROM learned_rules").fetchone()
+        assert insight_row["id"] == insight_id
+        assert rule_row["id"] == rule_id
+        # Stored as JSON text whichever encoder is installed
+        assert json.loads(insight_row["details"]) == {"examples": ["é"]}
+        assert json.loads(rule_row["rule_value"]) == {"phrase": "x"}
+    
     def test_apply_insight_creates_learned_rule(self):
         """Accepting insight should create learned rule."""
         from noctem.services.insight_service import accept_insight, get_rule_stats
@@ -263,6 +619,49 @@ class TestImprovementEngine:
         # Should have created learned rule
         stats = get_rule_stats()
         assert stats["total"] >= 1
+    
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_apply_insight_resolves_and_creates_rule(self, returning):
+        """Applying marks the insight actioned and writes its rule; unknown ids fail."""
+        from unittest.mock import patch
+        from noctem.slow import improvement_engine
+        
+        insight_id = improvement_engine._save_insight(MaintenanceInsight(
+            insight_type="recommendation", source="log_review", title="t",
+            details={"proposed_action": "time_mapping:tonight", "suggested_mapping": "today 8pm"},
+        ))
+        
+        with patch.object(improvement_engine, "SUPPORTS_RETURNING", returning):
+            assert improvement_engine.apply_insight(insight_id) is True
+            assert improvement_engine.apply_insight(insight_id + 1) is False
+        
+        with get_db() as conn:
+            status = conn.execute("SELECT status FROM maintenance_insights").fetchone()[0]
+            rule = conn.execute("SELECT rule_key, rule_value FROM learned_rules").fetchone()
+        assert status == "actioned"
+        assert rule["rule_key"] == "time_word:tonight"
+        assert json.loads(rule["rule_value"])["default_mapping"] == "today 8pm"
+    
+    def test_resolve_insights_and_record_rule_use(self):
+        """Dismissing resolves an insight; applying a rule bumps its counters."""
+        from noctem.slow.improvement_engine import (
+            _save_insight, _save_learned_rule, dismiss_insight, record_rule_application,
+        )
+        
+        insight_id = _save_insight(MaintenanceInsight(insight_type="pattern", source="log_review", title="t"))
+        rule_id = _save_learned_rule(LearnedRule(rule_type="ambiguity_flag", rule_key="phrase:x", rule_value={}))
+        
+        assert dismiss_insight(insight_id) is True
+        record_rule_application(rule_id)
+        record_rule_application(rule_id)
+        
+        with get_db() as conn:
+            insight = conn.execute("SELECT status, resolved_at FROM maintenance_insights").fetchone()
+            rule = conn.execute("SELECT applied_count, last_applied FROM learned_rules").fetchone()
+        assert insight["status"] == "dismissed"
+        assert insight["resolved_at"] is not None
+        assert rule["applied_count"] == 2
+        assert rule["last_applied"] is not None
 
 
 # =============================================================================
@@ -350,6 +749,30 @@ class TestInsightService:
         assert insights[1].priority == 3
         assert insights[2].priority == 1
     
+    def test_iter_pending_insights_early_exit_keeps_writes(self):
+        """Stopping iteration early must not roll back writes made meanwhile."""
+        from noctem.services.insight_service import iter_pending_insights, dismiss_insight
+        
+        with get_db() as conn:
+            for priority in [3, 5, 1]:
+                conn.execute("""
+                    INSERT INTO maintenance_insights 
+                    (insight_type, source, title, details, priority, status)
+                    VALUES ('pattern', 'test', ?, '{}', ?, 'pending')
+                """, (f"Priority {priority}", priority))
+        
+        insights = iter_pending_insights(limit=10)
+        top = next(insights)
+        assert top.priority == 5
+        dismiss_insight(top.id)
+        del insights
+        
+        with get_db() as conn:
+            status = conn.execute(
+                "SELECT status FROM maintenance_insights WHERE id = ?", (top.id,)
+            ).fetchone()[0]
+        assert status == "dismissed"
+    
     def test_insight_summary(self):
         """Should provide summary statistics."""
         from noctem.services.insight_service import get_insight_summary
@@ -370,6 +793,66 @@ class TestInsightService:
         assert summary["pending"] == 2
         assert summary["by_status"]["actioned"] == 1
         assert summary["by_status"]["dismissed"] == 1
+        assert summary["by_priority"] == {3: 2}
+        assert summary["by_source"] == {"test": 4}
+    
+    def test_rule_stats(self):
+        """Should report totals, per-type counts and most-applied rules."""
+        from noctem.services.insight_service import get_rule_stats
+        
+        with get_db() as conn:
+            for key, rule_type, enabled, applied in [
+                ("a", "ambiguity_flag", 1, 2),
+                ("b", "ambiguity_flag", 1, 7),
+                ("c", "time_expression", 1, 0),
+                ("d", "time_expression", 0, 9),
+            ]:
+                conn.execute("""
+                    INSERT INTO learned_rules
+                    (rule_type, rule_key, rule_value, enabled, applied_count)
+                    VALUES (?, ?, '{}', ?, ?)
+                """, (rule_type, key, enabled, applied))
+        
+        stats = get_rule_stats()
+        
+        assert stats["total"] == 4
+        assert stats["enabled"] == 3
+        assert stats["disabled"] == 1
+        assert stats["by_type"] == {"ambiguity_flag": 2, "time_expression": 1}
+        assert [r["rule_key"] for r in stats["most_applied"]] == ["b", "a"]
+    
+    def test_rule_enable_disable_delete(self):
+        """Rule toggles should report missing rules and tolerate no-ops."""
+        from noctem.services.insight_service import enable_rule, disable_rule, delete_rule
+        
+        with get_db() as conn:
+            rule_id = conn.execute("""
+                INSERT INTO learned_rules (rule_type, rule_key, rule_value, enabled)
+                VALUES ('ambiguity_flag', 'x', '{}', 1)
+            """).lastrowid
+        
+        assert enable_rule(rule_id) is True  # already enabled
+        assert disable_rule(rule_id) is True
+        with get_db() as conn:
+            enabled = conn.execute(
+                "SELECT enabled FROM learned_rules WHERE id = ?", (rule_id,)
+            ).fetchone()[0]
+        assert enabled == 0
+        
+        assert delete_rule(rule_id) is True
+        assert delete_rule(rule_id) is False
+        assert enable_rule(rule_id) is False
+    
+    def test_rule_stats_empty(self):
+        """Should return zeroed stats when no rules exist."""
+        from noctem.services.insight_service import get_rule_stats
+        
+        stats = get_rule_stats()
+        
+        assert stats["total"] == 0
+        assert stats["enabled"] == 0
+        assert stats["by_type"] == {}
+        assert stats["most_applied"] == []
 
 
 if __name__ == "__main__":
@@ -101,6 +101,71 @@ class TestWhisperService:
         svc2 = get_whisper_service()
         
         assert svc1 is svc2
+    
+    def test_model_loaded_once_with_cpu_settings(self, monkeypatch):
+        """Test the model is built once with pinned CPU threads and workers."""
+        import sys
+        import types
+        from noctem.slow import whisper
+        
+        fake_module = types.ModuleType("faster_whisper")
+        fake_module.WhisperModel = MagicMock()
+        monkeypatch.setitem(sys.modules, "faster_whisper", fake_module)
+        
+        service = whisper.WhisperService()
+        model = service._ensure_model()
+        assert service._ensure_model() is model
+        
+        fake_module.WhisperModel.assert_called_once_with(
+            whisper.DEFAULT_MODEL,
+            device=whisper.DEFAULT_DEVICE,
+            compute_type="int8",
+            cpu_threads=whisper.DEFAULT_CPU_THREADS,
+            num_workers=whisper.DEFAULT_NUM_WORKERS,
+        )
+    
+    def test_preload_warms_up_on_silence(self):
+        """Test preload runs one transcription of a valid one-second WAV."""
+        import wave
+        from noctem.slow.whisper import WhisperService, WARMUP_SAMPLE_RATE
+        
+        seen = {}
+        
+        def fake_transcribe(path, **kwargs):
+            with wave.open(path, "rb") as wav:
+                seen["frames"] = wav.getnframes()
+                seen["rate"] = wav.getframerate()
+            seen["path"] = path
+            return iter([]), Mock()
+        
+        service = WhisperService()
+        service._model = Mock(transcribe=Mock(side_effect=fake_transcribe))
+        
+        assert service.preload() is True
+        assert service._model.transcribe.call_count == 1
+        assert seen["rate"] == WARMUP_SAMPLE_RATE
+        assert seen["frames"] == WARMUP_SAMPLE_RATE
+        assert not os.path.exists(seen["path"])
+    
+    @pytest.mark.parametrize("accurate,beam_size", [(False, 1), (True, 5)])
+    def test_transcribe_beam_size(self, accurate, beam_size):
+        """Test transcription decodes greedily unless accuracy is requested."""
+        from noctem.slow.whisper import WhisperService
+        
+        segments = [Mock(text=" hello "), Mock(text="  "), Mock(text="world ")]
+        info = Mock(language="en", language_probability=0.9, duration=2.0)
+        service = WhisperService()
+        service._model = Mock(transcribe=Mock(return_value=(iter(segments), info)))
+        
+        text, metadata = service.transcribe("clip.ogg", accurate=accurate)
+        
+        assert text == "hello world"
+        assert metadata["duration"] == 2.0
+        kwargs = service._model.transcribe.call_args.kwargs
+        assert kwargs["beam_size"] == beam_size
+        assert kwargs["best_of"] == beam_size
+        assert kwargs["temperature"] == 0.0
+        assert kwargs["condition_on_previous_text"] is False
 
 
 class TestVoiceJournalImports: